@@ -1,13 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Count
 from django.utils.translation import ugettext, ugettext_lazy as _
 from accounts.models import CustomUser
 from accounts.forms import CustomUserCreationForm, CustomUserChangeForm
-from projects.models import Project
+from base.paginator import EstimatedCountMixin
 
 
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(EstimatedCountMixin, UserAdmin):
     form = CustomUserChangeForm
     add_form = CustomUserCreationForm
     fieldsets = (
@@ -29,8 +30,13 @@ class CustomUserAdmin(UserAdmin):
     search_fields = ('name', 'email', 'phone', 'school')
     ordering = ('id',)
 
+    def get_queryset(self, request):
+        return super(CustomUserAdmin, self).get_queryset(request).annotate(
+            project_count=Count('project'))
+
     def projects(self, obj):
-        return Project.objects.filter(manager=obj).count()
+        return obj.project_count
+    projects.admin_order_field = 'project_count'
 
 
 admin.site.register(CustomUser, CustomUserAdmin)
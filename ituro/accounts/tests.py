@@ -1,3 +1,58 @@
+from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from accounts.models import CustomUser
+from projects.models import Project
 
-# Create your tests here.
+
+class AdminChangelistTestCase(TestCase):
+    def setUp(self):
+        CustomUser.objects.create_superuser(
+            email="admin@ituro.org", password="admin", name="Admin",
+            phone="05414760273", school="ITU")
+        self.client.login(username="admin@ituro.org", password="admin")
+
+    def add_users(self, start, count):
+        for index in range(start, start + count):
+            user = CustomUser.objects.create_user(
+                email="user{}@ituro.org".format(index), password="user",
+                name="User {}".format(index), phone="0541", school="ITU")
+            Project.objects.create(
+                manager=user, category="maze", name="Robot {}".format(index))
+
+    def changelist_queries(self, name):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_fixed_queries(self):
+        """Testing changelist queries do not grow with the rows"""
+        self.add_users(0, 2)
+        names = ("admin:accounts_customuser_changelist",
+                 "admin:projects_project_changelist")
+        # the first request loads the competition state into the cache
+        self.changelist_queries(names[0])
+        queries = [self.changelist_queries(name) for name in names]
+        self.add_users(2, 5)
+        self.assertEqual(
+            [self.changelist_queries(name) for name in names], queries)
+
+        response = self.client.get(reverse(names[0]))
+        self.assertContains(response, '<td class="field-projects">1</td>')
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1)
+    def test_estimated_counts(self):
+        """Testing large tables are counted from the table statistics"""
+        self.add_users(0, 2)
+        connection.cursor().execute("ANALYZE")
+        self.add_users(2, 5)
+
+        url = reverse("admin:accounts_customuser_changelist")
+        response = self.client.get(url)
+        self.assertEqual(response.context["cl"].result_count, 3)
+        response = self.client.get(url, {"q": "user"})
+        self.assertEqual(
+            (response.context["cl"].result_count,
+             response.context["cl"].full_result_count), (7, 3))
@@ -11,6 +11,7 @@ from django.http import HttpResponseRedirect
 from django.utils.translation import ugettext_lazy as _
 from accounts.models import CustomUser
 from accounts.forms import RegistrationForm
+from base.mail import queue_mail
 
 
 def custom_login(request, *args, **kwargs):
@@ -43,8 +44,9 @@ class RegisterView(FormView):
             "subject": _("ITURO Registration"),
             "message": render_to_string("accounts/email/register.txt"),
             "from_email": settings.EMAIL_HOST_USER,
+            "recipient_list": [user.email],
         }
-        user.email_user(**email_options)
+        queue_mail(**email_options)
         messages.success(self.request, _(
             "You have created your user account successfully."))
         return super(RegisterView, self).form_valid(form)
@@ -1,3 +1,46 @@
+from django import forms
+from django.conf import settings
 from django.contrib import admin
+from base.models import OutgoingEmail, CompetitionState
 
-# Register your models here.
+
+class CompetitionStateForm(forms.ModelForm):
+    class Meta:
+        model = CompetitionState
+        fields = \
+            CompetitionState.FLAG_FIELDS + CompetitionState.CATEGORY_FIELDS
+
+    def __init__(self, *args, **kwargs):
+        super(CompetitionStateForm, self).__init__(*args, **kwargs)
+        for name in CompetitionState.CATEGORY_FIELDS:
+            self.fields[name] = forms.MultipleChoiceField(
+                label=self.fields[name].label, required=False,
+                choices=settings.ALL_CATEGORIES,
+                widget=forms.CheckboxSelectMultiple,
+                initial=getattr(self.instance, name).split(","))
+
+    def clean(self):
+        cleaned_data = super(CompetitionStateForm, self).clean()
+        for name in CompetitionState.CATEGORY_FIELDS:
+            cleaned_data[name] = ",".join(cleaned_data.get(name) or [])
+        return cleaned_data
+
+
+class CompetitionStateAdmin(admin.ModelAdmin):
+    form = CompetitionStateForm
+    list_display = (
+        "__str__", "project_orders", "project_results", "updated_at")
+
+    def has_add_permission(self, request):
+        return not CompetitionState.objects.exists()
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "to", "subject", "is_sent", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("is_sent",)
+    search_fields = ("to", "subject")
+
+
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
+admin.site.register(CompetitionState, CompetitionStateAdmin)
@@ -1,23 +1,25 @@
-from django.conf import settings
+from base.state import competition_state
 
 
 def categories(request):
+    state = competition_state()
     return {
-        "CREATE_CATEGORIES": settings.CREATE_CATEGORIES,
-        "UPDATE_CATEGORIES": settings.UPDATE_CATEGORIES,
-        "CONFIRM_CATEGORIES": settings.CONFIRM_CATEGORIES,
-        "ORDER_CATEGORIES": settings.ORDER_CATEGORIES,
-        "RESULT_CATEGORIES": settings.RESULT_CATEGORIES,
+        "CREATE_CATEGORIES": state.CREATE_CATEGORIES,
+        "UPDATE_CATEGORIES": state.UPDATE_CATEGORIES,
+        "CONFIRM_CATEGORIES": state.CONFIRM_CATEGORIES,
+        "ORDER_CATEGORIES": state.ORDER_CATEGORIES,
+        "RESULT_CATEGORIES": state.RESULT_CATEGORIES,
     }
 
 
 def permissions(request):
+    state = competition_state()
     return {
-        "USER_REGISTER": settings.USER_REGISTER,
-        "USER_UPDATE": settings.USER_UPDATE,
-        "PROJECT_CREATE": settings.PROJECT_CREATE,
-        "PROJECT_UPDATE": settings.PROJECT_UPDATE,
-        "PROJECT_CONFIRM": settings.PROJECT_CONFIRM,
-        "PROJECT_ORDERS": settings.PROJECT_ORDERS,
-        "PROJECT_RESULTS": settings.PROJECT_RESULTS,
+        "USER_REGISTER": state.USER_REGISTER,
+        "USER_UPDATE": state.USER_UPDATE,
+        "PROJECT_CREATE": state.PROJECT_CREATE,
+        "PROJECT_UPDATE": state.PROJECT_UPDATE,
+        "PROJECT_CONFIRM": state.PROJECT_CONFIRM,
+        "PROJECT_ORDERS": state.PROJECT_ORDERS,
+        "PROJECT_RESULTS": state.PROJECT_RESULTS,
     }
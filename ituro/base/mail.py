@@ -0,0 +1,86 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import get_connection, EmailMessage
+from django.utils import timezone
+from django.utils.encoding import force_text
+from base.models import OutgoingEmail
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """
+    Stores the email in the outbox instead of sending it, the
+    sendqueuedmail command delivers it later. Returns queued row count.
+    """
+    return queue_mass_mail(((subject, message, from_email, recipient_list),))
+
+
+def queue_mass_mail(datatuple):
+    """
+    Like send_mass_mail, queues every (subject, message, from_email,
+    recipient_list) tuple with a single insert.
+    """
+    emails = [
+        OutgoingEmail(
+            to=recipient, subject=force_text(subject),
+            message=force_text(message), from_email=from_email or "")
+        for subject, message, from_email, recipient_list in datatuple
+        for recipient in recipient_list]
+    OutgoingEmail.objects.bulk_create(emails)
+    return len(emails)
+
+
+def retry_delay(attempts):
+    base = getattr(settings, "MAIL_QUEUE_RETRY_DELAY", 60)
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def send_queued_mail(batch_size=50, max_attempts=None):
+    """
+    Sends one batch of due emails over a single connection. Failed
+    emails are retried with exponential backoff until max_attempts.
+    Returns (sent, failed) counts.
+    """
+    if max_attempts is None:
+        max_attempts = getattr(settings, "MAIL_QUEUE_MAX_ATTEMPTS", 5)
+    now = timezone.now()
+    emails = list(OutgoingEmail.objects.filter(
+        is_sent=False, attempts__lt=max_attempts,
+        next_attempt_at__lte=now)[:batch_size])
+    if not emails:
+        return 0, 0
+
+    sent = []
+    failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+        for email in emails:
+            try:
+                EmailMessage(
+                    email.subject, email.message,
+                    email.from_email or None, [email.to],
+                    connection=connection).send()
+            except Exception as e:
+                failed += 1
+                mark_failed(email, e, now)
+            else:
+                sent.append(email.pk)
+    except Exception as e:
+        # connection could not be opened, the whole batch is retried
+        for email in emails:
+            if not email.pk in sent:
+                failed += 1
+                mark_failed(email, e, now)
+    finally:
+        connection.close()
+
+    OutgoingEmail.objects.filter(pk__in=sent).update(
+        is_sent=True, sent_at=now, last_error="")
+    return len(sent), failed
+
+
+def mark_failed(email, error, now):
+    email.attempts += 1
+    email.last_error = force_text(error)
+    email.next_attempt_at = now + retry_delay(email.attempts)
+    email.save(update_fields=["attempts", "last_error", "next_attempt_at"])
@@ -0,0 +1,61 @@
+import time
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.template import RequestContext
+from django.template.loader import get_template
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from optparse import make_option
+
+
+DEFAULT_LOADERS = (
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+)
+
+CACHED_LOADERS = (
+    ("django.template.loaders.cached.Loader", DEFAULT_LOADERS),
+)
+
+PAGES = (
+    ("results/result_list.html", "/results/maze/"),
+    ("orders/race_order_list.html", "/orders/maze/"),
+    ("orders/sumo_group_list.html", "/orders/micro_sumo/groups/"),
+)
+
+
+class Command(BaseCommand):
+    help = ('Measures the render time of the results and orders pages '
+            'with the default and the cached template loaders.')
+    option_list = BaseCommand.option_list + (
+        make_option('--requests', type='int', dest='requests', default=200,
+                    help='Renders per page and loader.'),
+    )
+
+    def render(self, template_name, path, count):
+        request = RequestFactory().get(path)
+        request.user = AnonymousUser()
+        start = time.time()
+        for index in range(count):
+            # a new context and template lookup for every request
+            get_template(template_name).render(RequestContext(
+                request, {"object_list": [], "category": "Maze"}))
+        return (time.time() - start) * 1000.0 / count
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        if count < 1:
+            raise CommandError('Request count must be positive.')
+
+        for template_name, path in PAGES:
+            timings = []
+            for loaders in (DEFAULT_LOADERS, CACHED_LOADERS):
+                with override_settings(
+                        TEMPLATE_LOADERS=loaders, TEMPLATE_DEBUG=False):
+                    # the first render fills the cache like the warmup does
+                    self.render(template_name, path, 1)
+                    timings.append(self.render(template_name, path, count))
+            self.stdout.write(
+                '{}: {:.2f} ms default, {:.2f} ms cached, {:.1f}x'.format(
+                    template_name, timings[0], timings[1],
+                    timings[0] / timings[1]))
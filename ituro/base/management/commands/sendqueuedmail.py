@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from optparse import make_option
+from base.mail import send_queued_mail
+
+
+class Command(BaseCommand):
+    help = 'Sends queued emails from the outbox.'
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', type='int', dest='batch_size',
+                    default=50, help='Emails sent per connection.'),
+        make_option('--loop', action='store_true', dest='loop',
+                    default=False, help='Keep polling the outbox.'),
+        make_option('--interval', type='int', dest='interval', default=5,
+                    help='Seconds to sleep when the outbox is empty.'),
+    )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('Batch size must be positive.')
+
+        while True:
+            sent, failed = send_queued_mail(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    '{} emails sent, {} failed.'.format(sent, failed))
+            if not options['loop']:
+                break
+            if sent + failed < options['batch_size']:
+                time.sleep(options['interval'])
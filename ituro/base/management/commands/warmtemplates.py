@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+from base.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Compiles every template of the project.'
+
+    def handle(self, *args, **options):
+        count, errors = warm_templates()
+        for name, error in errors:
+            self.stderr.write(u"{}: {}".format(name, error))
+        if errors:
+            raise CommandError('%d templates have errors.' % len(errors))
+        self.stdout.write('{} templates compiled.'.format(count))
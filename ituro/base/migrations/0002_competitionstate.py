@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompetitionState',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('user_register', models.BooleanField(default=True, verbose_name='User registration')),
+                ('user_update', models.BooleanField(default=True, verbose_name='User update')),
+                ('project_create', models.BooleanField(default=True, verbose_name='Project creation')),
+                ('project_update', models.BooleanField(default=True, verbose_name='Project update')),
+                ('project_confirm', models.BooleanField(default=True, verbose_name='Project confirmation')),
+                ('project_orders', models.BooleanField(default=True, verbose_name='Race orders')),
+                ('project_results', models.BooleanField(default=True, verbose_name='Results')),
+                ('sumo_group_orders', models.BooleanField(default=False, verbose_name='Sumo group orders')),
+                ('sumo_stage_orders', models.BooleanField(default=False, verbose_name='Sumo stage orders')),
+                ('sumo_final_orders', models.BooleanField(default=False, verbose_name='Sumo final orders')),
+                ('sumo_group_results', models.BooleanField(default=False, verbose_name='Sumo group results')),
+                ('sumo_stage_results', models.BooleanField(default=False, verbose_name='Sumo stage results')),
+                ('sumo_final_results', models.BooleanField(default=False, verbose_name='Sumo final results')),
+                ('create_categories', models.CharField(max_length=255, verbose_name='Create categories', blank=True)),
+                ('update_categories', models.CharField(max_length=255, verbose_name='Update categories', blank=True)),
+                ('confirm_categories', models.CharField(max_length=255, verbose_name='Confirm categories', blank=True)),
+                ('order_categories', models.CharField(max_length=255, verbose_name='Order categories', blank=True)),
+                ('result_categories', models.CharField(max_length=255, verbose_name='Result categories', blank=True)),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='Version', editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Competition State',
+                'verbose_name_plural': 'Competition State',
+            },
+            bases=(models.Model,),
+        ),
+    ]
@@ -1,3 +1,173 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+from django.utils.translation import ugettext_lazy as _
 
-# Create your models here.
+
+class VersionConflict(Exception):
+    def __init__(self, current):
+        super(VersionConflict, self).__init__(
+            "{} was changed by someone else.".format(current))
+        self.current = current
+
+
+class VersionedModel(models.Model):
+    """
+    Rows which are edited from several screens at once. Every save of an
+    existing row bumps the version, and a versioned save checks it with
+    UPDATE ... WHERE version = x, so a save based on an old copy fails
+    instead of silently overwriting. Bulk writers bump it themselves with
+    F("version") + 1.
+    """
+    version = models.PositiveIntegerField(
+        verbose_name=_("Version"), default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and not kwargs.get("force_insert"):
+            self.version += 1
+        super(VersionedModel, self).save(*args, **kwargs)
+
+    def save_versioned(self, version):
+        """
+        Saves the object if its row is still at the given version, raises
+        VersionConflict with the current row otherwise. Raises DoesNotExist
+        if the row was deleted in the meantime.
+        """
+        model = type(self)
+        with transaction.atomic():
+            updated = model._base_manager.filter(
+                pk=self.pk, version=version).update(version=version + 1)
+            if not updated:
+                raise VersionConflict(model.objects.get(pk=self.pk))
+            self.version = version
+            self.save()
+        return self
+
+
+@python_2_unicode_compatible
+class CompetitionState(models.Model):
+    """
+    Phase switches of the competition, a single row edited from the
+    admin. The initial values come from the settings of the same names.
+    Read it through base.state.competition_state(), which keeps a copy
+    in memory until the version changes.
+    """
+    FLAG_FIELDS = (
+        "user_register", "user_update", "project_create", "project_update",
+        "project_confirm", "project_orders", "project_results",
+        "sumo_group_orders", "sumo_stage_orders", "sumo_final_orders",
+        "sumo_group_results", "sumo_stage_results", "sumo_final_results")
+    CATEGORY_FIELDS = (
+        "create_categories", "update_categories", "confirm_categories",
+        "order_categories", "result_categories")
+
+    user_register = models.BooleanField(
+        verbose_name=_("User registration"), default=True)
+    user_update = models.BooleanField(
+        verbose_name=_("User update"), default=True)
+    project_create = models.BooleanField(
+        verbose_name=_("Project creation"), default=True)
+    project_update = models.BooleanField(
+        verbose_name=_("Project update"), default=True)
+    project_confirm = models.BooleanField(
+        verbose_name=_("Project confirmation"), default=True)
+    project_orders = models.BooleanField(
+        verbose_name=_("Race orders"), default=True)
+    project_results = models.BooleanField(
+        verbose_name=_("Results"), default=True)
+    sumo_group_orders = models.BooleanField(
+        verbose_name=_("Sumo group orders"), default=False)
+    sumo_stage_orders = models.BooleanField(
+        verbose_name=_("Sumo stage orders"), default=False)
+    sumo_final_orders = models.BooleanField(
+        verbose_name=_("Sumo final orders"), default=False)
+    sumo_group_results = models.BooleanField(
+        verbose_name=_("Sumo group results"), default=False)
+    sumo_stage_results = models.BooleanField(
+        verbose_name=_("Sumo stage results"), default=False)
+    sumo_final_results = models.BooleanField(
+        verbose_name=_("Sumo final results"), default=False)
+    # comma separated category slugs
+    create_categories = models.CharField(
+        verbose_name=_("Create categories"), max_length=255, blank=True)
+    update_categories = models.CharField(
+        verbose_name=_("Update categories"), max_length=255, blank=True)
+    confirm_categories = models.CharField(
+        verbose_name=_("Confirm categories"), max_length=255, blank=True)
+    order_categories = models.CharField(
+        verbose_name=_("Order categories"), max_length=255, blank=True)
+    result_categories = models.CharField(
+        verbose_name=_("Result categories"), max_length=255, blank=True)
+    version = models.PositiveIntegerField(
+        verbose_name=_("Version"), default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Competition State")
+        verbose_name_plural = _("Competition State")
+
+    def __str__(self):
+        return u"Competition state v{}".format(self.version)
+
+    def save(self, *args, **kwargs):
+        self.pk = 1
+        current = CompetitionState.objects.filter(pk=1).values_list(
+            "version", flat=True).first() or 0
+        self.version = max(self.version, current) + 1
+        super(CompetitionState, self).save(*args, **kwargs)
+
+    def get_categories(self, name):
+        """The categories of a field as (slug, name) pairs."""
+        slugs = getattr(self, name).split(",")
+        return tuple((slug, display) for slug, display
+                     in settings.ALL_CATEGORIES if slug in slugs)
+
+    @classmethod
+    def load(cls):
+        """The state row, created from the settings on first use."""
+        defaults = dict(
+            (name, getattr(settings, name.upper()))
+            for name in cls.FLAG_FIELDS)
+        defaults.update(
+            (name, ",".join(slug for slug, display in getattr(
+                settings, name.upper())))
+            for name in cls.CATEGORY_FIELDS)
+        return cls.objects.get_or_create(pk=1, defaults=defaults)[0]
+
+    @classmethod
+    def invalidate(cls):
+        """Makes every process reload the state, after a related change."""
+        cls.load()
+        cls.objects.filter(pk=1).update(version=F("version") + 1)
+
+
+@python_2_unicode_compatible
+class OutgoingEmail(models.Model):
+    to = models.EmailField(verbose_name=_("To"))
+    subject = models.CharField(verbose_name=_("Subject"), max_length=255)
+    message = models.TextField(verbose_name=_("Message"))
+    from_email = models.CharField(
+        verbose_name=_("From"), max_length=254, blank=True)
+    is_sent = models.BooleanField(verbose_name=_("Is sent?"), default=False)
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name=_("Attempts"), default=0)
+    last_error = models.TextField(verbose_name=_("Last Error"), blank=True)
+    next_attempt_at = models.DateTimeField(
+        verbose_name=_("Next Attempt"), default=timezone.now)
+    sent_at = models.DateTimeField(
+        verbose_name=_("Sent At"), null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Outgoing Email")
+        verbose_name_plural = _("Outgoing Emails")
+        ordering = ["next_attempt_at"]
+        index_together = (("is_sent", "next_attempt_at"),)
+
+    def __str__(self):
+        return u"{} to {}".format(self.subject, self.to)
@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.contrib.admin.views.main import ChangeList, SEARCH_VAR
+from django.core.paginator import Paginator
+from django.db import connections, DatabaseError
+from django.utils.functional import cached_property
+
+
+def estimated_count(queryset):
+    """
+    Row count of the whole table of the queryset from the statistics of
+    the database, or None if the database does not keep one.
+    """
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    cursor = connection.cursor()
+    if connection.vendor == "postgresql":
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE relname = %s", [table])
+    elif connection.vendor == "sqlite":
+        # sqlite_stat1 exists once ANALYZE has run
+        try:
+            cursor.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+        except DatabaseError:
+            return None
+    else:
+        return None
+    row = cursor.fetchone()
+    return int(str(row[0]).split()[0]) if row else None
+
+
+def large_table_count(queryset):
+    """
+    Estimated row count of an unfiltered queryset of a table larger than
+    ADMIN_ESTIMATED_COUNT_THRESHOLD rows, None if it should be counted.
+    """
+    if queryset.query.where:
+        return None
+    estimate = estimated_count(queryset)
+    if estimate is not None and estimate >= getattr(
+            settings, "ADMIN_ESTIMATED_COUNT_THRESHOLD", 10000):
+        return estimate
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin paginator which reads the row count of large tables from the
+    database statistics instead of counting them. Filtered changelists
+    and small tables are still counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = None
+        if hasattr(self.object_list, "query"):
+            estimate = large_table_count(self.object_list)
+        if estimate is not None:
+            return estimate
+        return super(EstimatedCountPaginator, self).count
+
+
+class FixedCount(object):
+    def __init__(self, count):
+        self._count = count
+
+    def count(self):
+        return self._count
+
+
+class EstimatedCountChangeList(ChangeList):
+    """
+    Changelist which takes the unfiltered total shown next to search and
+    filter results from the table statistics as well.
+    """
+
+    def get_results(self, request):
+        root_queryset = self.root_queryset
+        if self.get_filters_params() or self.params.get(SEARCH_VAR):
+            estimate = large_table_count(root_queryset)
+            if estimate is not None:
+                self.root_queryset = FixedCount(estimate)
+        try:
+            super(EstimatedCountChangeList, self).get_results(request)
+        finally:
+            self.root_queryset = root_queryset
+
+
+class EstimatedCountMixin(object):
+    """
+    ModelAdmin mixin for large tables. Every changelist page costs a
+    fixed number of queries, however many rows the table has.
+    """
+    paginator = EstimatedCountPaginator
+
+    def get_changelist(self, request, **kwargs):
+        return EstimatedCountChangeList
@@ -0,0 +1,66 @@
+import time
+from django.conf import settings
+from base.models import CompetitionState
+from orders.models import LineFollowerStage
+
+
+class StateSnapshot(object):
+    """
+    Read-only copy of the competition state. Switches and categories
+    have the names of the settings they replace, ORDER_STAGES and
+    RESULT_STAGES are the orders of the line follower stages whose
+    orders or results are available.
+    """
+
+    def __init__(self, state, stages):
+        self.version = state.version
+        for name in CompetitionState.FLAG_FIELDS:
+            setattr(self, name.upper(), getattr(state, name))
+        for name in CompetitionState.CATEGORY_FIELDS:
+            setattr(self, name.upper(), state.get_categories(name))
+        self.ORDER_STAGES = frozenset(
+            order for order, orders, results in stages if orders)
+        self.RESULT_STAGES = frozenset(
+            order for order, orders, results in stages if results)
+
+
+_snapshot = {"state": None, "checked_at": 0}
+
+
+def current_version():
+    """
+    Version of the state from its row. The row is read instead of a
+    cache key, so a change reaches every worker and process even with
+    a per-process cache.
+    """
+    return CompetitionState.objects.filter(pk=1).values_list(
+        "version", flat=True).first()
+
+
+def load_state():
+    return StateSnapshot(
+        CompetitionState.load(), LineFollowerStage.objects.values_list(
+            "order", "orders_available", "results_available"))
+
+
+def competition_state():
+    """
+    The competition state from memory. The version of the row is
+    compared at most once every COMPETITION_STATE_CHECK_SECONDS and the
+    state is loaded again only if it changed, so most reads cost no
+    queries.
+    """
+    snapshot = _snapshot["state"]
+    now = time.time()
+    if snapshot is not None and now - _snapshot["checked_at"] < getattr(
+            settings, "COMPETITION_STATE_CHECK_SECONDS", 1):
+        return snapshot
+
+    if snapshot is None or snapshot.version != current_version():
+        snapshot = load_state()
+    _snapshot.update(state=snapshot, checked_at=now)
+    return snapshot
+
+
+def reset_state():
+    _snapshot.update(state=None, checked_at=0)
@@ -1,3 +1,131 @@
+from datetime import timedelta
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.urlresolvers import reverse
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+from base.models import OutgoingEmail, CompetitionState
+from base.state import competition_state, reset_state
+from orders.models import LineFollowerStage
+from base.mail import queue_mail, send_queued_mail
+from base.warmup import warm_templates
 
-# Create your tests here.
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise IOError("Mail server is unreachable")
+
+
+class OutgoingEmailTestCase(TestCase):
+    def test_queue_and_send(self):
+        "Testing queued emails are sent in one batch"
+
+        queue_mail("Subject", "Message", "ituro@example.com",
+                   ["a@example.com", "b@example.com"])
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(send_queued_mail(), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, ["a@example.com"])
+        self.assertEqual(
+            OutgoingEmail.objects.filter(is_sent=True).count(), 2)
+        self.assertEqual(send_queued_mail(), (0, 0))
+
+    @override_settings(
+        EMAIL_BACKEND="base.tests.FailingEmailBackend",
+        MAIL_QUEUE_RETRY_DELAY=60)
+    def test_failed_email_backoff(self):
+        "Testing failed emails are retried later with a growing delay"
+
+        queue_mail("Subject", "Message", "", ["a@example.com"])
+        self.assertEqual(send_queued_mail(), (0, 1))
+
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("unreachable", email.last_error)
+        self.assertTrue(
+            email.next_attempt_at > timezone.now() + timedelta(seconds=50))
+        self.assertEqual(send_queued_mail(), (0, 0))
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        send_queued_mail()
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.attempts, 2)
+        self.assertTrue(
+            email.next_attempt_at > timezone.now() + timedelta(seconds=110))
+
+    def test_max_attempts(self):
+        "Testing emails are given up after the maximum attempt count"
+
+        queue_mail("Subject", "Message", "", ["a@example.com"])
+        OutgoingEmail.objects.update(attempts=5)
+        self.assertEqual(send_queued_mail(max_attempts=5), (0, 0))
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class CompetitionStateTestCase(TestCase):
+    def setUp(self):
+        reset_state()
+
+    def tearDown(self):
+        reset_state()
+
+    def test_cached_reads(self):
+        "Testing state reads are served from memory"
+
+        state = competition_state()
+        self.assertTrue(state.PROJECT_RESULTS)
+        self.assertIn(("maze", "Maze"), state.RESULT_CATEGORIES)
+        with self.assertNumQueries(0):
+            for index in range(10):
+                competition_state()
+
+    @override_settings(COMPETITION_STATE_CHECK_SECONDS=0)
+    def test_phase_switch(self):
+        "Testing phase switches take effect without a restart"
+
+        url = reverse("result_list", args=["maze"])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        state = CompetitionState.load()
+        state.project_results = False
+        state.save()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        state.project_results = True
+        state.result_categories = "line_follower"
+        state.save()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        # a switch saved by another process, which shares no cache
+        CompetitionState.objects.update(
+            result_categories="maze", version=F("version") + 1)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        url = reverse("line_follower_result_list", args=[1])
+        self.assertEqual(self.client.get(url).status_code, 403)
+        LineFollowerStage.objects.create(order=1, results_available=True)
+        self.assertEqual(competition_state().RESULT_STAGES, set([1]))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+CACHED_LOADERS = (
+    ("django.template.loaders.cached.Loader", (
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader")),
+)
+
+
+class TemplateWarmupTestCase(TestCase):
+    @override_settings(TEMPLATE_LOADERS=CACHED_LOADERS)
+    def test_warm_templates(self):
+        """Testing every project template compiles into the cache."""
+        from django.template import loader
+        count, errors = warm_templates()
+        self.assertEqual(errors, [])
+        self.assertTrue(count > 0)
+        self.assertEqual(
+            len(loader.template_source_loaders[0].template_cache), count)
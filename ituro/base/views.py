@@ -1,3 +1,61 @@
-from django.shortcuts import render
+from django import forms
+from django.contrib import messages
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.utils.translation import ugettext_lazy as _
+from base.models import VersionConflict
 
-# Create your views here.
+
+class VersionedUpdateMixin(object):
+    """
+    UpdateView mixin for VersionedModel rows. The version of the row is
+    posted back with the form and the row is saved only if it is still
+    the same. Otherwise a merge screen shows both values, and submitting
+    it again applies the user's values over the current row. A row deleted
+    while the form was open is a 404.
+    """
+    success_message = _("Result updated.")
+    conflict_template_name = "referee/result_conflict.html"
+
+    def get_form(self, form_class):
+        form = super(VersionedUpdateMixin, self).get_form(form_class)
+        form.fields["version"] = forms.IntegerField(
+            widget=forms.HiddenInput, initial=self.object.version)
+        return form
+
+    def get_success_message(self):
+        return self.success_message
+
+    def save_object(self, obj, version):
+        return obj.save_versioned(version)
+
+    def form_valid(self, form):
+        try:
+            self.object = self.save_object(
+                form.save(commit=False), form.cleaned_data["version"])
+        except VersionConflict as conflict:
+            return self.form_conflict(form, conflict.current)
+        except ObjectDoesNotExist:
+            raise Http404(_(
+                "This entry was deleted while you were editing it."))
+
+        messages.success(self.request, self.get_success_message())
+        return HttpResponseRedirect(self.get_success_url())
+
+    def form_conflict(self, form, current):
+        changes = [
+            (form[name].label, form.cleaned_data[name], getattr(current, name))
+            for name in form.fields
+            if name != "version" and
+            form.cleaned_data[name] != getattr(current, name)]
+        data = form.data.copy()
+        data["version"] = current.version
+        form.data = data
+
+        self.object = current
+        messages.warning(self.request, _(
+            "Someone else updated this entry while you were editing it."))
+        return TemplateResponse(
+            self.request, self.conflict_template_name,
+            self.get_context_data(form=form, changes=changes))
@@ -0,0 +1,37 @@
+import os
+from django.conf import settings
+from django.template import TemplateSyntaxError
+from django.template.loader import get_template
+
+
+TEMPLATE_EXTENSIONS = (".html", ".txt")
+
+
+def template_names(directories=None):
+    """Names of the templates under the given or the project directories."""
+    for directory in directories or settings.TEMPLATE_DIRS:
+        for root, dirs, files in os.walk(directory):
+            for name in files:
+                if name.endswith(TEMPLATE_EXTENSIONS):
+                    yield os.path.relpath(
+                        os.path.join(root, name), directory).replace(
+                            os.sep, "/")
+
+
+def warm_templates(directories=None):
+    """
+    Compiles every template of the project. With the cached loader the
+    compiled templates are kept for the life of the worker. Returns the
+    number of compiled templates and the (name, error) pairs of the
+    broken ones.
+    """
+    count = 0
+    errors = []
+    for name in sorted(set(template_names(directories))):
+        try:
+            get_template(name)
+        except TemplateSyntaxError as e:
+            errors.append((name, e))
+        else:
+            count += 1
+    return count, errors
@@ -0,0 +1,29 @@
+"""
+Production settings for ituro project.
+
+Templates are compiled once per worker by the cached loader, and every
+template under TEMPLATE_DIRS is compiled when the worker boots so the
+first requests do not pay for it.
+"""
+from ituro.settings import *
+
+DEBUG = False
+
+TEMPLATE_DEBUG = False
+
+ALLOWED_HOSTS = ["yarisma.ituro.org"]
+
+TEMPLATE_LOADERS = (
+    ("django.template.loaders.cached.Loader", (
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    )),
+)
+
+TEMPLATE_WARMUP = True
+
+# Import local settings
+try:
+    from local_settings import *
+except ImportError:
+    pass
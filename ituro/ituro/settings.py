@@ -126,6 +126,8 @@ TEMPLATE_CONTEXT_PROCESSORS =(
 AUTH_USER_MODEL = "accounts.CustomUser"
 TEMPLATE_DIRS = [os.path.join(BASE_DIR, 'templates')]
 EMAIL_USE_TLS = True
+MAIL_QUEUE_RETRY_DELAY = 60
+MAIL_QUEUE_MAX_ATTEMPTS = 5
 MAX_FILE_SIZE = 1000000
 LOGIN_REDIRECT_URL = "/"
 CAPTCHA_CHALLENGE_FUNCT = 'captcha.helpers.math_challenge'
@@ -150,6 +152,11 @@ CONFIRM_CATEGORIES = tuple(ALL_CATEGORIES)
 ORDER_CATEGORIES = tuple(ALL_CATEGORIES)
 RESULT_CATEGORIES = tuple(ALL_CATEGORIES)
 
+# Initial values of the competition state, which is edited from the admin
+# afterwards. Processes check its version every
+# COMPETITION_STATE_CHECK_SECONDS.
+COMPETITION_STATE_CHECK_SECONDS = 1
+
 USER_REGISTER = True
 USER_UPDATE = True
 PROJECT_CREATE = True
@@ -158,6 +165,21 @@ PROJECT_CONFIRM = True
 PROJECT_ORDERS = True
 PROJECT_RESULTS = True
 
+RACE_ATTEMPT_SECONDS = 120
+RACE_TURNAROUND_SECONDS = 60
+RACE_MAX_TURNAROUND_SECONDS = 300
+RACE_STATISTICS_TIMEOUT = 60
+RACE_ATTEMPT_LIMIT = 3
+
+# Largest number of neighbours on each side in a rank lookup
+RESULT_RANK_WINDOW = 10
+RESULT_PAGE_SIZE = 50
+
+# Admin changelists of tables larger than this read the total row count
+# from the database statistics instead of counting the rows; filtered
+# results are still counted
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+
 SUMO_GROUP_RESULTS = False
 SUMO_STAGE_RESULTS = False
 SUMO_FINAL_RESULTS= False
@@ -165,6 +187,21 @@ SUMO_GROUP_ORDERS = False
 SUMO_STAGE_ORDERS = False
 SUMO_FINAL_ORDERS= False
 
+# Robots qualifying from the groups to the first stage: the first
+# SUMO_QUALIFY_PER_GROUP of every group plus the best
+# SUMO_QUALIFY_BEST_COUNT robots placed SUMO_QUALIFY_BEST_POSITION.
+SUMO_QUALIFY_PER_GROUP = 2
+SUMO_QUALIFY_BEST_POSITION = 3
+SUMO_QUALIFY_BEST_COUNT = 0
+
+# Score of the rival in the matches of a robot which did not attend
+SUMO_FORFEIT_SCORE = 2
+
+# Group matches are played on SUMO_RING_COUNT rings at the same time and
+# a robot sits out at least SUMO_REST_SLOTS time slots between matches.
+SUMO_RING_COUNT = 2
+SUMO_REST_SLOTS = 1
+
 # Import local settings
 try:
     from local_settings import *
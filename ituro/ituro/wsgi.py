@@ -12,3 +12,9 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ituro.settings")
 
 from django.core.wsgi import get_wsgi_application
 application = get_wsgi_application()
+
+# Compile the templates while the worker boots, see production_settings
+from django.conf import settings
+if getattr(settings, "TEMPLATE_WARMUP", False):
+    from base.warmup import warm_templates
+    warm_templates()
@@ -10,7 +10,7 @@ from django.utils.translation import ugettext_lazy as _
 from orders.models import *
 from results.models import LineFollowerResult, FireFighterResult, \
     BasketballResult, StairClimbingResult, MazeResult, ColorSelectingResult, \
-    SelfBalancingResult, ScenarioResult, InnovativeJuryResult
+    SelfBalancingResult, ScenarioResult, InnovativeJuryResult, ResultRank
 
 
 RESULTS_DICT = {
@@ -45,7 +45,7 @@ class LCDResultListView(TemplateView):
         context['category'] = dict(
             settings.ALL_CATEGORIES)[self.kwargs.get('slug')]
         result_model = RESULTS_DICT[self.kwargs.get('slug')]
-        context['results'] = result_model.objects.filter(is_best=True)[:5]
+        context['results'] = ResultRank.objects.top(self.kwargs.get('slug'))
 
         orders = []
         for order in RaceOrder.objects.filter(
@@ -88,8 +88,7 @@ class LCDLineFollowerResultListView(TemplateView):
         stage = LineFollowerStage.objects.filter(
             order=self.kwargs.get("order"))[0]
         context['stage'] = stage
-        context['results'] = LineFollowerResult.objects.filter(
-            stage__order=self.kwargs.get("order"), is_best=True)[:5]
+        context['results'] = ResultRank.objects.top("line_follower", stage)
 
         orders = []
         for order in LineFollowerRaceOrder.objects.filter(stage=stage):
@@ -3,17 +3,21 @@ from orders.models import LineFollowerStage, LineFollowerRaceOrder, RaceOrder
 
 
 class RaceOrderAdmin(admin.ModelAdmin):
-    list_display = ('order', 'project')
+    list_display = ('order', 'track', 'project')
+    list_filter = ('track',)
+    list_select_related = ('project',)
 
 
 class LineFollowerStageAdmin(admin.ModelAdmin):
     list_display = (
         'order', 'is_current', 'is_final', 'orders_available',
-        'results_available')
+        'results_available', 'cut_ratio')
 
 
 class LineFollowerRaceOrderAdmin(admin.ModelAdmin):
-    list_display = ('order', 'project', 'stage')
+    list_display = ('order', 'track', 'project', 'stage')
+    list_filter = ('stage', 'track')
+    list_select_related = ('project', 'stage')
 
 
 admin.site.register(RaceOrder, RaceOrderAdmin)
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from orders.models import RaceOrder, LineFollowerStage, LineFollowerRaceOrder
+from orders.scheduling import average_durations, assign_tracks
+from projects.summary import refresh_orders
+from results.views import RESULTS_DICT
+
+
+class Command(BaseCommand):
+    args = '<category> <track count> [stage]'
+    help = 'Splits race orders of a category across parallel tracks.'
+
+    def handle(self, *args, **options):
+        try:
+            category = args[0]
+            track_count = int(args[1])
+        except (IndexError, ValueError):
+            raise CommandError('Please specify a category and track count.')
+
+        if not category in dict(settings.ALL_CATEGORIES).keys():
+            raise CommandError('Category %s does not exist.' % category)
+        elif category in ('micro_sumo', 'innovative'):
+            raise CommandError('Category %s has no race orders.' % category)
+        if track_count < 1:
+            raise CommandError('Track count must be positive.')
+
+        result_model = RESULTS_DICT[category]
+        if category == 'line_follower':
+            try:
+                stage = LineFollowerStage.objects.get(order=int(args[2]))
+            except (IndexError, ValueError):
+                raise CommandError('Please specify a valid stage.')
+            except LineFollowerStage.DoesNotExist:
+                raise CommandError('Stage #%s does not exist.' % args[2])
+            orders = LineFollowerRaceOrder.objects.filter(stage=stage)
+        else:
+            orders = RaceOrder.objects.filter(project__category=category)
+
+        durations = average_durations(
+            result_model, project__in=orders.values("project"))
+        for track, count in sorted(
+                assign_tracks(orders, track_count, durations).items()):
+            self.stdout.write('Track #{}: {} robots'.format(track, count))
+        refresh_orders(orders)
@@ -1,21 +1,21 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
-from orders.models import RaceOrder, LineFollowerRaceOrder
+from orders.models import LineFollowerRaceOrder, LineFollowerStage
 
 
 class Command(BaseCommand):
-    args = '<day>'
-    help = 'Deletes line follower race orders of the specified day.'
+    args = '<stage>'
+    help = 'Deletes line follower race orders of the specified stage.'
 
     def handle(self, *args, **options):
         try:
-            day = int(args[0])
-        except IndexError:
-            raise CommandError('Please specify a day.')
+            stage = LineFollowerStage.objects.get(order=int(args[0]))
+        except (IndexError, ValueError):
+            raise CommandError('Please specify a valid stage.')
+        except LineFollowerStage.DoesNotExist:
+            raise CommandError('Stage #%s does not exist.' % args[0])
 
-        if day < 1 or day > 2:
-            raise CommandError('Day interval is 1 <= day <= 2.')
-
-        LineFollowerRaceOrder.objects.filter(stage__order=day).delete()
+        LineFollowerRaceOrder.objects.filter(stage=stage).delete()
         self.stdout.write(
-            "Line follower race orders day #{} deleted.".format(day))
+            "Line follower race orders of stage #{} deleted.".format(
+                stage.order))
@@ -1,25 +1,22 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
-from optparse import make_option
-from projects.models import Project
 from orders.models import LineFollowerRaceOrder, LineFollowerStage
-from random import shuffle
 
 
 class Command(BaseCommand):
-    args = '<day>'
+    args = '<stage>'
     help = 'Prints race orders of line follower category.'
 
     def handle(self, *args, **options):
         try:
-            day = int(args[0])
-        except:
-            raise CommandError('Please specify a valid day.')
+            stage = LineFollowerStage.objects.get(order=int(args[0]))
+        except (IndexError, ValueError):
+            raise CommandError('Please specify a valid stage.')
+        except LineFollowerStage.DoesNotExist:
+            raise CommandError('Stage #%s does not exist.' % args[0])
 
-        if day < 1 or day > 2:
-            raise CommandError('Day interval is 1 <= day <= 2.')
-
-        self.stdout.write("Line Follower Day #{} Orders".format(day))
-        for order in LineFollowerRaceOrder.objects.filter(stage__order=day):
+        self.stdout.write("Line Follower Stage #{} Orders".format(stage.order))
+        for order in LineFollowerRaceOrder.objects.filter(
+                stage=stage).select_related("project__manager"):
             self.stdout.write(u"{}. {} by {}".format(
                 order.order, order.project, order.project.manager))
@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from optparse import make_option
+from orders.notifications import notify_upcoming_robots
+
+
+class Command(BaseCommand):
+    help = 'Notifies managers whose robots are near their race order.'
+    option_list = BaseCommand.option_list + (
+        make_option('--distance', type='int', dest='distance', default=5,
+                    help='Notify robots at most this many turns away.'),
+        make_option('--loop', action='store_true', dest='loop',
+                    default=False, help='Keep watching race orders.'),
+        make_option('--interval', type='int', dest='interval', default=30,
+                    help='Seconds between checks.'),
+    )
+
+    def handle(self, *args, **options):
+        if options['distance'] < 0:
+            raise CommandError('Distance can not be negative.')
+
+        while True:
+            count = notify_upcoming_robots(options['distance'])
+            if count:
+                self.stdout.write('{} notifications queued.'.format(count))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
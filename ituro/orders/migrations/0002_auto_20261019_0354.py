@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linefollowerraceorder',
+            name='is_notified',
+            field=models.BooleanField(default=False, verbose_name='Is manager notified?'),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='raceorder',
+            name='is_notified',
+            field=models.BooleanField(default=False, verbose_name='Is manager notified?'),
+            preserve_default=True,
+        ),
+    ]
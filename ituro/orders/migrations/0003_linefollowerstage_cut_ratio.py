@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.core.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_auto_20261019_0354'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linefollowerstage',
+            name='cut_ratio',
+            field=models.FloatField(default=0.4, help_text='Ratio of robots qualifying for the next stage.', verbose_name='Qualifying Ratio', validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(1.0)]),
+            preserve_default=True,
+        ),
+    ]
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_linefollowerstage_cut_ratio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linefollowerraceorder',
+            name='track',
+            field=models.PositiveSmallIntegerField(default=1, verbose_name='Track'),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='raceorder',
+            name='track',
+            field=models.PositiveSmallIntegerField(default=1, verbose_name='Track'),
+            preserve_default=True,
+        ),
+    ]
@@ -1,7 +1,11 @@
 from django.db import models
+from django.dispatch import receiver
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
+from base.models import CompetitionState
 from projects.models import Project
+from projects.summary import update_summaries
 
 
 @python_2_unicode_compatible
@@ -15,6 +19,10 @@ class LineFollowerStage(models.Model):
         verbose_name=_("Race Orders Availability"), default=False)
     results_available = models.BooleanField(
         verbose_name=_("Race Results Availability"), default=False)
+    cut_ratio = models.FloatField(
+        verbose_name=_("Qualifying Ratio"), default=0.4,
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
+        help_text=_("Ratio of robots qualifying for the next stage."))
 
     class Meta:
         verbose_name = _("Line Follower Stage")
@@ -25,9 +33,20 @@ class LineFollowerStage(models.Model):
         return "Stage #{}".format(self.order)
 
 
+@receiver([models.signals.post_save, models.signals.post_delete],
+          sender=LineFollowerStage)
+def stage_invalidate_state(sender, instance, raw=False, *args, **kwargs):
+    if not raw:
+        CompetitionState.invalidate()
+
+
 @python_2_unicode_compatible
 class BaseOrder(models.Model):
     order = models.PositiveSmallIntegerField(verbose_name=_("Race Order"))
+    track = models.PositiveSmallIntegerField(
+        verbose_name=_("Track"), default=1)
+    is_notified = models.BooleanField(
+        verbose_name=_("Is manager notified?"), default=False)
 
     class Meta:
         abstract = True
@@ -55,3 +74,17 @@ class RaceOrder(BaseOrder):
         verbose_name = _("Race Order")
         verbose_name_plural = _("Race Orders")
         ordering = ["order"]
+
+
+@receiver(models.signals.post_save)
+def order_save_summary(sender, instance, raw=False, *args, **kwargs):
+    if issubclass(sender, BaseOrder) and not raw:
+        update_summaries({instance.project_id: dict(
+            race_order=instance.order, track=instance.track)})
+
+
+@receiver(models.signals.post_delete)
+def order_delete_summary(sender, instance, *args, **kwargs):
+    if issubclass(sender, BaseOrder):
+        update_summaries({instance.project_id: dict(
+            race_order=None, track=None)}, create=False)
@@ -0,0 +1,75 @@
+from itertools import groupby
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.translation import ugettext as _
+from base.mail import queue_mass_mail
+from base.state import competition_state
+from orders.models import RaceOrder, LineFollowerStage, LineFollowerRaceOrder
+from results.views import RESULTS_DICT
+
+
+def upcoming_orders(orders, finished_ids, distance):
+    """
+    Returns (order, distance) pairs for the orders at most `distance`
+    robots behind the first order without a result.
+    """
+    upcoming = []
+    current = None
+    for index, order in enumerate(orders):
+        if current is None and not order.project_id in finished_ids:
+            current = index
+        if current is not None:
+            if index - current > distance:
+                break
+            if not order.is_notified:
+                upcoming.append((order, index - current))
+    return upcoming
+
+
+def notify_orders(orders, finished_ids, distance, category):
+    upcoming = []
+    for track, track_orders in groupby(orders, lambda order: order.track):
+        upcoming.extend(upcoming_orders(track_orders, finished_ids, distance))
+    if not upcoming:
+        return 0
+
+    datatuple = [(
+        _("ITURO: Your turn is near"),
+        render_to_string("orders/email/turn_near.txt", {
+            "order": order, "distance": away, "category": category}),
+        getattr(settings, "EMAIL_HOST_USER", None),
+        [order.project.manager.email]) for order, away in upcoming]
+    queue_mass_mail(datatuple)
+    type(upcoming[0][0]).objects.filter(
+        pk__in=[order.pk for order, away in upcoming]).update(
+            is_notified=True)
+    return len(upcoming)
+
+
+def notify_upcoming_robots(distance):
+    """
+    Queues a notification email for every manager whose robot is near
+    its turn on its track, in every category with race orders. Each manager is
+    notified once per race order. Returns queued email count.
+    """
+    categories = dict(settings.ALL_CATEGORIES)
+    count = 0
+    for category, display in competition_state().ORDER_CATEGORIES:
+        if category in ("line_follower", "micro_sumo", "innovative"):
+            continue
+        finished_ids = set(RESULTS_DICT[category].objects.filter(
+            project__category=category).values_list("project", flat=True))
+        orders = RaceOrder.objects.filter(
+            project__category=category).select_related(
+                "project__manager").order_by("track", "order")
+        count += notify_orders(orders, finished_ids, distance, display)
+
+    for stage in LineFollowerStage.objects.filter(is_current=True):
+        finished_ids = set(RESULTS_DICT["line_follower"].objects.filter(
+            stage=stage).values_list("project", flat=True))
+        orders = LineFollowerRaceOrder.objects.filter(
+            stage=stage).select_related(
+                "project__manager").order_by("track", "order")
+        count += notify_orders(
+            orders, finished_ids, distance, categories["line_follower"])
+    return count
@@ -0,0 +1,56 @@
+from math import ceil
+from random import shuffle
+from django.db import transaction
+from django.db.models import Min
+from projects.models import Project
+from orders.models import LineFollowerStage, LineFollowerRaceOrder
+from results.models import LineFollowerResult
+
+
+def previous_stage(stage):
+    return LineFollowerStage.objects.filter(
+        order__lt=stage.order).order_by("-order").first()
+
+
+def ranked_projects(stage):
+    """
+    Ids of the projects of the stage ordered by their best not
+    disqualified result, computed with a single grouped query.
+    """
+    ranking = LineFollowerResult.objects.filter(
+        stage=stage, disqualification=False).values("project").annotate(
+            best_score=Min("score")).order_by("best_score", "project")
+    return [row["project"] for row in ranking]
+
+
+def qualified_projects(stage):
+    """Ids of the projects of the stage qualifying for the next one."""
+    ranked = ranked_projects(stage)
+    return ranked[:int(ceil(len(ranked) * stage.cut_ratio))]
+
+
+def stage_projects(stage):
+    """
+    The first stage is open to every confirmed line follower, the
+    following ones to the qualifiers of the previous stage.
+    """
+    previous = previous_stage(stage)
+    if previous is None:
+        return list(Project.objects.filter(
+            category="line_follower", is_confirmed=True).values_list(
+                "id", flat=True))
+    return qualified_projects(previous)
+
+
+@transaction.atomic
+def generate_stage_orders(stage):
+    """
+    Writes the shuffled race orders of the stage in one insert and
+    returns their count.
+    """
+    project_ids = stage_projects(stage)
+    shuffle(project_ids)
+    LineFollowerRaceOrder.objects.bulk_create([
+        LineFollowerRaceOrder(project_id=project_id, stage=stage, order=order)
+        for order, project_id in enumerate(project_ids, start=1)])
+    return len(project_ids)
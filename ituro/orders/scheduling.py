@@ -0,0 +1,166 @@
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min, Sum
+from django.utils import timezone
+
+
+def average_durations(result_model, **filters):
+    """
+    Mean attempt duration in seconds of every project, computed with a
+    single grouped query over the given result model.
+    """
+    rows = result_model.objects.filter(**filters).values("project").annotate(
+        avg_duration=Avg("duration_ms"))
+    return dict(
+        (row["project"], row["avg_duration"] / 1000.0) for row in rows)
+
+
+def attempt_statistics(result_model, **filters):
+    """
+    Attempt count, best score and last attempt time of every project as
+    {project id: row}, computed with two grouped queries. Disqualified
+    attempts are counted but never the best score.
+    """
+    best = Max if "-score" in result_model._meta.ordering else Min
+    results = result_model.objects.filter(**filters)
+    rows = dict((row["project"], row) for row in results.values(
+        "project").annotate(attempt_count=Count("id"),
+                            last_attempt=Max("created_at")).order_by())
+    for row in rows.values():
+        row["best_score"] = None
+    for project_id, score in results.filter(
+            disqualification=False).values_list("project").annotate(
+                best_score=best("score")).order_by():
+        rows[project_id]["best_score"] = score
+    return rows
+
+
+def full_projects(result_model, limit, **filters):
+    """Projects which used all of their attempts, as a subquery."""
+    return result_model.objects.filter(**filters).values("project").annotate(
+        attempt_count=Count("id")).filter(
+            attempt_count__gte=limit).order_by().values("project")
+
+
+def split_tracks(orders, track_count, durations):
+    """
+    Assigns every order to one of the tracks while keeping the race
+    order: each robot goes to the track which becomes free first, so the
+    projected finish times of the tracks stay balanced. Robots without a
+    duration estimate count as an average robot.
+    """
+    default = sum(durations.values()) / len(durations) if durations else 1.0
+    loads = [(0.0, track) for track in range(1, track_count + 1)]
+    assignment = {}
+    for order in orders:
+        load, track = heapq.heappop(loads)
+        assignment[order.pk] = track
+        heapq.heappush(loads, (
+            load + durations.get(order.project_id, default), track))
+    return assignment
+
+
+@transaction.atomic
+def assign_tracks(orders, track_count, durations):
+    """
+    Writes the track of every order with one update per track and
+    returns the robot count of each track.
+    """
+    tracks = defaultdict(list)
+    for pk, track in split_tracks(orders, track_count, durations).items():
+        tracks[track].append(pk)
+    for track, pks in tracks.items():
+        orders.model.objects.filter(pk__in=pks).update(track=track)
+    return dict((track, len(pks)) for track, pks in tracks.items())
+
+
+def track_map(orders):
+    """Track of every robot of the race orders as {project id: track}."""
+    return dict((order.project_id, order.track) for order in orders)
+
+
+def race_statistics_key(result_model, stage=None):
+    return "race_statistics:{}:{}".format(
+        result_model._meta.model_name, stage or "")
+
+
+def race_statistics(result_model, stage=None, tracks=None):
+    """
+    Seconds a robot is expected to occupy a track: mean attempt count
+    per robot times mean attempt duration plus referee turnaround. The
+    turnaround is measured from the spacing of the attempts on each
+    track, with tracks as {project id: track}, and capped so breaks do
+    not count. Cached until a result of the model changes.
+    """
+    key = race_statistics_key(result_model, stage)
+    statistics = cache.get(key)
+    if statistics is not None:
+        return statistics
+
+    queryset = result_model.objects.all()
+    if stage is not None:
+        queryset = queryset.filter(stage=stage)
+    rows = list(queryset.values("project").annotate(
+        attempt_count=Count("id"), total_duration=Sum("duration_ms"),
+        first=Min("created_at"), last=Max("created_at")).order_by())
+
+    # first attempt, last attempt and attempt count of every track
+    spans = {}
+    for row in rows:
+        track = (tracks or {}).get(row["project"])
+        first, last, count = spans.get(
+            track, (row["first"], row["last"], 0))
+        spans[track] = (min(first, row["first"]), max(last, row["last"]),
+                        count + row["attempt_count"])
+
+    count = sum(row["attempt_count"] for row in rows)
+    turnaround = getattr(settings, "RACE_TURNAROUND_SECONDS", 60)
+    if count:
+        duration = sum(row["total_duration"] for row in rows) / 1000.0 / count
+        attempts = float(count) / len(rows)
+    else:
+        duration = getattr(settings, "RACE_ATTEMPT_SECONDS", 120)
+        attempts = 1.0
+    gaps = sum(count - 1 for first, last, count in spans.values())
+    if gaps:
+        cycle = sum((last - first).total_seconds()
+                    for first, last, count in spans.values()) / gaps
+        turnaround = min(max(cycle - duration, 0), getattr(
+            settings, "RACE_MAX_TURNAROUND_SECONDS", 300))
+
+    statistics = {
+        "duration": duration,
+        "turnaround": turnaround,
+        "attempts": attempts,
+        "slot": attempts * (duration + turnaround),
+    }
+    cache.set(key, statistics,
+              getattr(settings, "RACE_STATISTICS_TIMEOUT", 60))
+    return statistics
+
+
+def invalidate_race_statistics(result_model, stage=None):
+    cache.delete_many([
+        race_statistics_key(result_model),
+        race_statistics_key(result_model, stage)])
+
+
+def estimate_start_times(orders, finished_ids, slot, now=None):
+    """
+    Sets the expected start time of every order of the queue as `eta`.
+    Robots with results get None, the others start `slot` seconds after
+    the robot before them on the same track.
+    """
+    now = now or timezone.now()
+    waiting = defaultdict(int)
+    for order in orders:
+        if order.project_id in finished_ids:
+            order.eta = None
+            continue
+        order.eta = now + timedelta(seconds=waiting[order.track] * slot)
+        waiting[order.track] += 1
+    return orders
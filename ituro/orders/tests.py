@@ -1,3 +1,153 @@
+from datetime import timedelta
 from django.test import TestCase
+from django.utils import timezone
+from accounts.models import CustomUser
+from projects.models import Project
+from orders.models import RaceOrder, LineFollowerStage, LineFollowerRaceOrder
+from orders.notifications import notify_upcoming_robots
+from orders.progression import generate_stage_orders
+from orders.scheduling import split_tracks, assign_tracks, race_statistics, \
+    track_map
+from results.models import MazeResult, LineFollowerResult
+from base.models import OutgoingEmail
 
-# Create your tests here.
+
+class RaceOrderTestCase(TestCase):
+    def setUp(self):
+        self.orders = []
+        for i in range(1, 6):
+            user = CustomUser.objects.create(
+                email="user{}@example.com".format(i),
+                name="User {}".format(i),
+                phone="0541476027{}".format(i),
+                school="ITU",
+                date_joined=timezone.now()
+                )
+            project = Project.objects.create(
+                manager=user, category="maze", name="Maze {}".format(i),
+                is_confirmed=True)
+            self.orders.append(
+                RaceOrder.objects.create(project=project, order=i))
+
+    def test_assign_tracks(self):
+        "Testing race orders are split across tracks by projected time"
+
+        durations = dict(
+            (order.project_id, seconds)
+            for order, seconds in zip(self.orders, [100, 10, 10, 10]))
+        self.assertEqual(
+            [split_tracks(self.orders, 2, durations)[order.pk]
+             for order in self.orders], [1, 2, 2, 2, 2])
+
+        orders = RaceOrder.objects.all()
+        self.assertEqual(assign_tracks(orders, 2, {}), {1: 3, 2: 2})
+        self.assertEqual(
+            list(orders.values_list("track", flat=True)), [1, 2, 1, 2, 1])
+
+    def test_parallel_turnaround(self):
+        "Testing turnaround is measured on each track"
+
+        start = timezone.now()
+        for index, order in enumerate(self.orders[:2]):
+            order.track = index + 1
+            order.save()
+            for attempt in range(2):
+                result = MazeResult.objects.create(
+                    project=order.project, minutes=1, seconds=0,
+                    milliseconds=0)
+                MazeResult.objects.filter(pk=result.pk).update(
+                    created_at=start + timedelta(
+                        seconds=index * 60 + attempt * 120))
+
+        statistics = race_statistics(
+            MazeResult, tracks=track_map(self.orders))
+        self.assertEqual(statistics["turnaround"], 60)
+
+    def test_expected_start_times(self):
+        "Testing race order pages show expected start times"
+
+        MazeResult.objects.create(
+            project=self.orders[0].project, minutes=1, seconds=30,
+            milliseconds=0)
+        MazeResult.objects.create(
+            project=self.orders[0].project, minutes=0, seconds=30,
+            milliseconds=0)
+        statistics = race_statistics(MazeResult)
+        self.assertEqual(statistics["duration"], 60)
+        self.assertEqual(statistics["attempts"], 2)
+        self.assertEqual(statistics["turnaround"], 0)
+        self.assertEqual(statistics["slot"], 120)
+
+        MazeResult.objects.create(
+            project=self.orders[1].project, minutes=1, seconds=0,
+            milliseconds=0)
+        self.assertEqual(race_statistics(MazeResult)["attempts"], 1.5)
+
+        response = self.client.get("/orders/maze/")
+        self.assertEqual(response.status_code, 200)
+        orders = list(response.context["object_list"])
+        self.assertEqual([order.eta for order in orders[:2]], [None, None])
+        self.assertEqual(
+            (orders[3].eta - orders[2].eta).total_seconds(), 90)
+
+    def test_notify_upcoming_robots(self):
+        "Testing managers near their turn are notified once"
+
+        MazeResult.objects.create(
+            project=self.orders[0].project, minutes=1, seconds=0,
+            milliseconds=0)
+
+        self.assertEqual(notify_upcoming_robots(2), 3)
+        self.assertEqual(
+            sorted(OutgoingEmail.objects.values_list("to", flat=True)),
+            ["user2@example.com", "user3@example.com", "user4@example.com"])
+        self.assertEqual(notify_upcoming_robots(2), 0)
+
+        MazeResult.objects.create(
+            project=self.orders[1].project, minutes=1, seconds=0,
+            milliseconds=0)
+        self.assertEqual(notify_upcoming_robots(2), 1)
+        self.assertTrue(OutgoingEmail.objects.filter(
+            to="user5@example.com").exists())
+
+
+class LineFollowerProgressionTestCase(TestCase):
+    def setUp(self):
+        self.projects = []
+        for i in range(1, 6):
+            user = CustomUser.objects.create(
+                email="user{}@example.com".format(i),
+                name="User {}".format(i),
+                phone="0541476027{}".format(i),
+                school="ITU",
+                date_joined=timezone.now()
+                )
+            self.projects.append(Project.objects.create(
+                manager=user, category="line_follower",
+                name="Line Follower {}".format(i), is_confirmed=True))
+        self.stage1 = LineFollowerStage.objects.create(order=1, cut_ratio=0.5)
+        self.stage2 = LineFollowerStage.objects.create(order=2)
+
+    def test_generate_stage_orders(self):
+        "Testing the best robots of a stage qualify for the next one"
+
+        self.assertEqual(generate_stage_orders(self.stage1), 5)
+        self.assertEqual(sorted(LineFollowerRaceOrder.objects.filter(
+            stage=self.stage1).values_list("order", flat=True)), range(1, 6))
+
+        for project, seconds in zip(self.projects, [30, 10, 20, 40]):
+            LineFollowerResult.objects.create(
+                project=project, stage=self.stage1, minutes=0,
+                seconds=seconds, milliseconds=0)
+        LineFollowerResult.objects.create(
+            project=self.projects[4], stage=self.stage1, minutes=0,
+            seconds=5, milliseconds=0, disqualification=True)
+        LineFollowerResult.objects.create(
+            project=self.projects[3], stage=self.stage1, minutes=0,
+            seconds=15, milliseconds=0)
+
+        self.assertEqual(generate_stage_orders(self.stage2), 2)
+        self.assertEqual(
+            set(LineFollowerRaceOrder.objects.filter(
+                stage=self.stage2).values_list("project", flat=True)),
+            set([self.projects[1].pk, self.projects[3].pk]))
@@ -20,6 +20,9 @@ urlpatterns = patterns(
     url(r'^micro_sumo/groups/(?P<pk>\d+)/$',
         SumoOrderGroupDetailView.as_view(),
         name='sumo_order_group_detail'),
+    url(r'^micro_sumo/timetable/$',
+        SumoOrderTimetableView.as_view(),
+        name='sumo_order_timetable'),
     url(r'^micro_sumo/stages/$',
         SumoOrderStageListView.as_view(),
         name='sumo_order_stage_list'),
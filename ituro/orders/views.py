@@ -9,7 +9,14 @@ from django.core.urlresolvers import reverse, reverse_lazy
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 from orders.models import RaceOrder, LineFollowerStage, LineFollowerRaceOrder
+from orders.scheduling import race_statistics, estimate_start_times, \
+    track_map
+from results.models import BaseResult
+from results.views import RESULTS_DICT
 from sumo.models import *
+from sumo.overview import group_overview
+from sumo.timetable import timetable
+from base.state import competition_state
 
 
 class LineFollowerStageOrderListView(ListView):
@@ -17,9 +24,10 @@ class LineFollowerStageOrderListView(ListView):
     template_name = 'orders/line_follower_stage_list.html'
 
     def dispatch(self, *args, **kwargs):
-        if not settings.PROJECT_ORDERS or \
-           not "line_follower" in dict(settings.ORDER_CATEGORIES).keys() or \
-           not LineFollowerStage.objects.filter(orders_available=True).exists():
+        state = competition_state()
+        if not state.PROJECT_ORDERS or \
+           not "line_follower" in dict(state.ORDER_CATEGORIES).keys() or \
+           not state.ORDER_STAGES:
             raise PermissionDenied
         return super(LineFollowerStageOrderListView, self).dispatch(
             *args, **kwargs)
@@ -33,10 +41,9 @@ class LineFollowerRaceOrderListView(ListView):
     template_name = 'orders/race_order_list.html'
 
     def dispatch(self, *args, **kwargs):
-        order = self.kwargs.get("order")
-        if not LineFollowerStage.objects.filter(
-                order=order, orders_available=True).exists():
-            return PermissionDenied
+        order = int(self.kwargs.get("order"))
+        if not order in competition_state().ORDER_STAGES:
+            raise PermissionDenied
         return super(LineFollowerRaceOrderListView, self).dispatch(
             *args, **kwargs)
 
@@ -44,13 +51,20 @@ class LineFollowerRaceOrderListView(ListView):
         context = super(LineFollowerRaceOrderListView, self).get_context_data(
             **kwargs)
         context['category'] = dict(settings.ALL_CATEGORIES)["line_follower"]
-        context['stage'] = LineFollowerStage.objects.filter(
+        context['stage'] = stage = LineFollowerStage.objects.filter(
             order=self.kwargs.get("order"))[0]
+        result_model = RESULTS_DICT["line_follower"]
+        estimate_start_times(
+            context['object_list'],
+            set(result_model.objects.filter(stage=stage).values_list(
+                'project', flat=True)),
+            race_statistics(result_model, stage.pk, track_map(
+                context['object_list']))["slot"])
         return context
 
     def get_queryset(self):
         return LineFollowerRaceOrder.objects.filter(
-            stage__order=self.kwargs.get("order"))
+            stage__order=self.kwargs.get("order")).select_related('project')
 
 
 class RaceOrderListView(ListView):
@@ -61,8 +75,9 @@ class RaceOrderListView(ListView):
         category = self.kwargs.get('slug')
         if not category in dict(settings.ALL_CATEGORIES).keys():
             raise Http404
-        if not settings.PROJECT_ORDERS or \
-           not category in dict(settings.ORDER_CATEGORIES).keys():
+        state = competition_state()
+        if not state.PROJECT_ORDERS or \
+           not category in dict(state.ORDER_CATEGORIES).keys():
             raise PermissionDenied
 
         if category == 'line_follower':
@@ -77,26 +92,37 @@ class RaceOrderListView(ListView):
         context = super(RaceOrderListView, self).get_context_data(**kwargs)
         context['category'] = dict(
             settings.ALL_CATEGORIES)[self.kwargs.get('slug')]
+        result_model = RESULTS_DICT[self.kwargs.get('slug')]
+        if not issubclass(result_model, BaseResult):
+            return context
+        estimate_start_times(
+            context['object_list'],
+            set(result_model.objects.values_list('project', flat=True)),
+            race_statistics(result_model, tracks=track_map(
+                context['object_list']))["slot"])
         return context
 
     def get_queryset(self):
         return RaceOrder.objects.filter(
-            project__category=self.kwargs.get('slug'))
+            project__category=self.kwargs.get('slug')).select_related(
+                'project')
 
 
 class SumoOrderHomeView(TemplateView):
     template_name = "orders/sumo_home.html"
 
     def dispatch(self, *args, **kwargs):
-        if not "micro_sumo" in dict(settings.ORDER_CATEGORIES).keys():
+        if not "micro_sumo" in dict(
+                competition_state().ORDER_CATEGORIES).keys():
             raise PermissionDenied
         return super(SumoOrderHomeView, self).dispatch(*args, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super(SumoOrderHomeView, self).get_context_data(**kwargs)
-        context["groups"] = settings.SUMO_GROUP_ORDERS
-        context["stages"] = settings.SUMO_STAGE_ORDERS
-        context["final"] = settings.SUMO_FINAL_ORDERS
+        state = competition_state()
+        context["groups"] = state.SUMO_GROUP_ORDERS
+        context["stages"] = state.SUMO_STAGE_ORDERS
+        context["final"] = state.SUMO_FINAL_ORDERS
         return context
 
 class SumoOrderGroupListView(ListView):
@@ -104,12 +130,12 @@ class SumoOrderGroupListView(ListView):
     template_name = 'orders/sumo_group_list.html'
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_GROUP_ORDERS:
+        if not competition_state().SUMO_GROUP_ORDERS:
             raise PermissionDenied
         return super(SumoOrderGroupListView, self).dispatch(*args, **kwargs)
 
     def get_queryset(self):
-        return SumoGroup.objects.filter(is_final=False)
+        return group_overview()
 
 
 class SumoOrderGroupDetailView(DetailView):
@@ -117,16 +143,33 @@ class SumoOrderGroupDetailView(DetailView):
     template_name = "orders/sumo_group_detail.html"
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_GROUP_ORDERS:
+        if not competition_state().SUMO_GROUP_ORDERS:
             raise PermissionDenied
         return super(SumoOrderGroupDetailView, self).dispatch(*args, **kwargs)
 
+    def get_queryset(self):
+        return group_overview()
+
     def get_context_data(self, **kwargs):
-        group = self.get_object()
         context = super(SumoOrderGroupDetailView, self).get_context_data(
             **kwargs)
-        context["matches"] = SumoGroupMatch.objects.filter(group=group)
-        context["teams"] = SumoGroupTeam.objects.filter(group=group)
+        context["matches"] = self.object.matches
+        context["teams"] = self.object.teams
+        return context
+
+
+class SumoOrderTimetableView(TemplateView):
+    template_name = "orders/sumo_timetable.html"
+
+    def dispatch(self, *args, **kwargs):
+        if not competition_state().SUMO_GROUP_ORDERS:
+            raise PermissionDenied
+        return super(SumoOrderTimetableView, self).dispatch(*args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super(SumoOrderTimetableView, self).get_context_data(
+            **kwargs)
+        context["rings"], context["slots"] = timetable()
         return context
 
 
@@ -135,7 +178,7 @@ class SumoOrderStageListView(ListView):
     template_name = "orders/sumo_stage_list.html"
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_STAGE_ORDERS:
+        if not competition_state().SUMO_STAGE_ORDERS:
             raise PermissionDenied
         return super(SumoOrderStageListView, self).dispatch(*args, **kwargs)
 
@@ -145,7 +188,7 @@ class SumoOrderStageDetailView(ListView):
     template_name = "orders/sumo_stage_detail.html"
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_STAGE_ORDERS:
+        if not competition_state().SUMO_STAGE_ORDERS:
             raise PermissionDenied
         return super(SumoOrderStageDetailView, self).dispatch(*args, **kwargs)
 
@@ -163,7 +206,7 @@ class SumoOrderFinalDetailView(TemplateView):
     template_name = "orders/sumo_final.html"
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_FINAL_ORDERS:
+        if not competition_state().SUMO_FINAL_ORDERS:
             raise PermissionDenied
         return super(SumoOrderFinalDetailView, self).dispatch(*args, **kwargs)
 
@@ -1,12 +1,14 @@
 from django.contrib import admin
 from django import forms
 from django.core.urlresolvers import reverse
-from projects.models import Project
+from base.paginator import EstimatedCountMixin
+from projects.models import Project, ProjectSummary
 
 
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = ('name', 'category', 'manager', 'qrcode')
     list_filter = ('category',)
+    list_select_related = ('manager',)
     default_filters = ('is_active=True',)
     search_fields = ('name',)
 
@@ -26,4 +28,13 @@ class ProjectAdmin(admin.ModelAdmin):
                 form.save()
 
 
+class ProjectSummaryAdmin(admin.ModelAdmin):
+    list_display = (
+        "project", "race_order", "track", "attempt_count", "best_score",
+        "next_rival", "next_slot", "updated_at")
+    list_select_related = ("project",)
+    raw_id_fields = ("project",)
+
+
 admin.site.register(Project, ProjectAdmin)
+admin.site.register(ProjectSummary, ProjectSummaryAdmin)
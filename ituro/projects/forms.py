@@ -7,6 +7,7 @@ from django.conf import settings
 from captcha.fields import CaptchaField
 from accounts.models import CustomUser
 from projects.models import Project
+from base.state import competition_state
 
 
 class ProjectCreateForm(forms.ModelForm):
@@ -20,6 +21,11 @@ class ProjectCreateForm(forms.ModelForm):
         model = Project
         exclude = ('manager', 'is_confirmed', 'is_active')
 
+    def __init__(self, *args, **kwargs):
+        super(ProjectCreateForm, self).__init__(*args, **kwargs)
+        self.fields['category'].choices = \
+            competition_state().UPDATE_CATEGORIES
+
     def clean_presentation(self):
         presentation = self.cleaned_data.get('presentation')
         category = self.cleaned_data.get('category')
@@ -90,6 +96,11 @@ class ProjectConfirmForm(forms.Form):
         choices=settings.CONFIRM_CATEGORIES)
     email = forms.EmailField(label=_("Project Manager Email"), required=True)
 
+    def __init__(self, *args, **kwargs):
+        super(ProjectConfirmForm, self).__init__(*args, **kwargs)
+        self.fields['category'].choices = \
+            competition_state().CONFIRM_CATEGORIES
+
     def clean(self):
         cleaned_data = super(ProjectConfirmForm, self).clean()
         name = cleaned_data.get("name")
@@ -110,3 +121,7 @@ class ProjectConfirmForm(forms.Form):
                 "Error! Please correct the errors below."))
 
         return cleaned_data
+
+
+class ProjectImportForm(forms.Form):
+    csv_file = forms.FileField(label=_("CSV File"), required=True)
@@ -0,0 +1,143 @@
+import csv
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from django.utils.translation import ugettext as _
+from accounts.models import CustomUser
+from base.state import competition_state
+from projects.models import Project
+
+
+class ProjectImporter(object):
+    """
+    Validates a CSV of project managers and their projects, then creates
+    the missing users and projects and confirms all of them at once.
+
+    Expected columns: email, name, phone, school, category, project.
+    Imported users get an unusable password; they can set one via
+    password reset.
+    """
+    columns = ("email", "name", "phone", "school", "category", "project")
+    lengths = {
+        "name": CustomUser._meta.get_field("name").max_length,
+        "phone": CustomUser._meta.get_field("phone").max_length,
+        "school": CustomUser._meta.get_field("school").max_length,
+        "project": Project._meta.get_field("name").max_length,
+    }
+
+    def __init__(self, csv_file):
+        reader = csv.DictReader(csv_file)
+        missing = set(self.columns) - set(reader.fieldnames or [])
+        self.errors = []
+        self.rows = []
+        self.users = {}
+        self.new_projects = []
+        self.confirm_ids = set()
+        if missing:
+            self.errors.append((1, _("Missing columns: {}").format(
+                ", ".join(sorted(missing)))))
+            return
+
+        for line, row in enumerate(reader, start=2):
+            self.rows.append((line, dict(
+                (column, (row.get(column) or "").decode("utf-8").strip())
+                for column in self.columns)))
+
+    def is_valid(self):
+        if not self.errors:
+            self.validate()
+        return not self.errors
+
+    def validate(self):
+        categories = dict(competition_state().CONFIRM_CATEGORIES)
+        emails = set()
+        for line, row in self.rows:
+            row["email"] = CustomUser.objects.normalize_email(row["email"])
+            emails.add(row["email"])
+
+        existing_users = dict(
+            (user.email, user)
+            for user in CustomUser.objects.filter(email__in=emails))
+        existing_projects = dict(
+            ((project.category, project.name), project)
+            for project in Project.objects.select_related("manager").filter(
+                name__in=set(row["project"] for line, row in self.rows)))
+        managed = set(Project.objects.filter(
+            manager__email__in=emails).values_list(
+                "manager__email", "category"))
+
+        seen_projects = set()
+        seen_managers = set()
+        for line, row in self.rows:
+            error = self.validate_row(row, categories)
+            key = (row["category"], row["project"])
+            project = existing_projects.get(key)
+
+            if error is None and key in seen_projects:
+                error = _("Project appears more than once.")
+            elif error is None and \
+                    (row["email"], row["category"]) in seen_managers:
+                error = _("Only 1 project per category is allowed.")
+            elif error is None and project is not None and \
+                    project.manager.email != row["email"]:
+                error = _("Project name is being used.")
+            elif error is None and project is None and \
+                    (row["email"], row["category"]) in managed:
+                error = _("User already has a project in this category.")
+
+            if error is not None:
+                self.errors.append((line, error))
+                continue
+
+            seen_projects.add(key)
+            seen_managers.add((row["email"], row["category"]))
+            if project is not None:
+                self.confirm_ids.add(project.pk)
+                continue
+
+            if not row["email"] in self.users:
+                self.users[row["email"]] = existing_users.get(
+                    row["email"]) or CustomUser(
+                        email=row["email"], name=row["name"],
+                        phone=row["phone"], school=row["school"],
+                        password=make_password(None),
+                        date_joined=timezone.now())
+            self.new_projects.append(row)
+
+    def validate_row(self, row, categories):
+        for column in self.columns:
+            if not row[column]:
+                return _("{} is required.").format(column.capitalize())
+        try:
+            validate_email(row["email"])
+        except ValidationError:
+            return _("Email is not valid.")
+        if not row["category"] in categories:
+            return _("Category {} does not exist.").format(row["category"])
+        for column, length in self.lengths.items():
+            if len(row[column]) > length:
+                return _("{} is longer than {} characters.").format(
+                    column.capitalize(), length)
+
+    @transaction.atomic
+    def save(self):
+        new_users = [user for user in self.users.values() if user.pk is None]
+        CustomUser.objects.bulk_create(new_users)
+        managers = dict(CustomUser.objects.filter(
+            email__in=self.users.keys()).values_list("email", "id"))
+
+        Project.objects.bulk_create([
+            Project(manager_id=managers[row["email"]],
+                    category=row["category"], name=row["project"],
+                    is_confirmed=True)
+            for row in self.new_projects])
+        Project.objects.filter(pk__in=self.confirm_ids).update(
+            is_confirmed=True)
+
+        return {
+            "users": len(new_users),
+            "projects": len(self.new_projects),
+            "confirmed": len(self.new_projects) + len(self.confirm_ids),
+        }
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from projects.importers import ProjectImporter
+
+
+class Command(BaseCommand):
+    args = '<csv file>'
+    help = 'Imports and confirms users and projects from a CSV file.'
+
+    def handle(self, *args, **options):
+        try:
+            path = args[0]
+        except IndexError:
+            raise CommandError('Please specify a CSV file to import.')
+
+        try:
+            with open(path, 'rb') as csv_file:
+                importer = ProjectImporter(csv_file)
+        except IOError as e:
+            raise CommandError('Could not read %s: %s' % (path, e))
+
+        if not importer.is_valid():
+            for line, error in importer.errors:
+                self.stderr.write(u"Line {}: {}".format(line, error))
+            raise CommandError('Nothing imported, %d rows have errors.' %
+                               len(importer.errors))
+
+        summary = importer.save()
+        self.stdout.write(
+            '{users} users and {projects} projects created, '
+            '{confirmed} projects confirmed.'.format(**summary))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from orders.models import RaceOrder, LineFollowerRaceOrder
+from projects.models import Project
+from projects.summary import refresh_orders
+from results.models import RESULT_MODELS, refresh_summaries
+from sumo.models import refresh_next_matches
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the project summaries of the dashboard.'
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        for category in sorted(RESULT_MODELS):
+            count = refresh_summaries(category)
+            self.stdout.write('{}: {} summaries updated'.format(
+                category, count))
+
+        refresh_orders(RaceOrder.objects.all())
+        # the latest stage wins for line follower robots
+        refresh_orders(LineFollowerRaceOrder.objects.order_by("stage__order"))
+
+        robots = list(Project.objects.filter(
+            category="micro_sumo").values_list("pk", flat=True))
+        refresh_next_matches(robots)
+        self.stdout.write('micro_sumo: {} summaries updated'.format(
+            len(robots)))
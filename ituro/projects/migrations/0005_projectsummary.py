@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_remove_project_design'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSummary',
+            fields=[
+                ('project', models.OneToOneField(related_name='summary', primary_key=True, serialize=False, to='projects.Project')),
+                ('race_order', models.PositiveSmallIntegerField(null=True, verbose_name='Race Order', blank=True)),
+                ('track', models.PositiveSmallIntegerField(null=True, verbose_name='Track', blank=True)),
+                ('attempt_count', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('best_score', models.FloatField(null=True, verbose_name='Best Score', blank=True)),
+                ('last_attempt', models.DateTimeField(null=True, verbose_name='Last Attempt', blank=True)),
+                ('is_stale', models.BooleanField(default=False, verbose_name='Are attempts stale?')),
+                ('next_rival', models.CharField(max_length=50, verbose_name='Next Rival', blank=True)),
+                ('next_slot', models.PositiveSmallIntegerField(null=True, verbose_name='Next Time Slot', blank=True)),
+                ('next_ring', models.PositiveSmallIntegerField(null=True, verbose_name='Next Ring', blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Project Summary',
+                'verbose_name_plural': 'Project Summaries',
+            },
+            bases=(models.Model,),
+        ),
+    ]
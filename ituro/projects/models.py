@@ -55,12 +55,48 @@ class Project(models.Model):
     @property
     def qrcode(self):
         return "{}-{}-{}-{}".format(
-                self.manager.id,self.created_at.year,self.category,self.id)
+                self.manager_id,self.created_at.year,self.category,self.id)
 
     def get_results_count(self):
         return self.results.count()
 
 
+class ProjectSummary(models.Model):
+    """
+    Race order, attempts and next sumo match of a project, kept up to
+    date by order, result and match writes for the project dashboard.
+    The rank is read from the leaderboard itself, so a result does not
+    move the summaries of the projects it passed. A result only marks
+    the attempts of its project stale, they are counted again when the
+    dashboard is opened.
+    """
+    project = models.OneToOneField(
+        Project, primary_key=True, related_name="summary")
+    race_order = models.PositiveSmallIntegerField(
+        verbose_name=_("Race Order"), null=True, blank=True)
+    track = models.PositiveSmallIntegerField(
+        verbose_name=_("Track"), null=True, blank=True)
+    attempt_count = models.PositiveSmallIntegerField(
+        verbose_name=_("Attempts"), default=0)
+    best_score = models.FloatField(
+        verbose_name=_("Best Score"), null=True, blank=True)
+    last_attempt = models.DateTimeField(
+        verbose_name=_("Last Attempt"), null=True, blank=True)
+    is_stale = models.BooleanField(
+        verbose_name=_("Are attempts stale?"), default=False)
+    next_rival = models.CharField(
+        verbose_name=_("Next Rival"), max_length=50, blank=True)
+    next_slot = models.PositiveSmallIntegerField(
+        verbose_name=_("Next Time Slot"), null=True, blank=True)
+    next_ring = models.PositiveSmallIntegerField(
+        verbose_name=_("Next Ring"), null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Project Summary")
+        verbose_name_plural = _("Project Summaries")
+
+
 
 @receiver(models.signals.pre_delete, sender=Project)
 def project_delete_handler(sender, **kwargs):
@@ -0,0 +1,83 @@
+from django.utils import timezone
+from orders.scheduling import attempt_statistics
+from projects.models import ProjectSummary
+
+
+RESULT_FIELDS = ("attempt_count", "best_score", "last_attempt")
+
+
+def update_summaries(values, create=True, existing=None):
+    """
+    Writes {project id: {field: value}} to the project summaries with
+    one update per project. Missing summaries are created in one insert
+    unless create is False, as when the project may be being deleted.
+    Pass the ids of the existing summaries if they are already known.
+    """
+    if not values:
+        return
+    now = timezone.now()
+    if existing is None:
+        existing = set(ProjectSummary.objects.filter(
+            pk__in=values.keys()).values_list("pk", flat=True))
+    for project_id, fields in values.items():
+        if project_id in existing:
+            ProjectSummary.objects.filter(pk=project_id).update(
+                updated_at=now, **fields)
+    if create:
+        ProjectSummary.objects.bulk_create([
+            ProjectSummary(project_id=project_id, **fields)
+            for project_id, fields in values.items()
+            if not project_id in existing])
+
+
+def result_fields(row):
+    return (row.get("attempt_count", 0), row.get("best_score"),
+            row.get("last_attempt"))
+
+
+def refresh_project(result_model, project_id, create=True, existing=None,
+                    **filters):
+    """Attempt statistics of one project from one grouped query."""
+    row = attempt_statistics(
+        result_model, project=project_id, **filters).get(project_id, {})
+    update_summaries(
+        {project_id: dict(zip(RESULT_FIELDS, result_fields(row)))},
+        create, existing)
+
+
+def mark_stale(project_id, create=True):
+    """
+    Marks the attempt statistics of the summary of the project out of
+    date with a single update, creating the summary if it is missing.
+    """
+    updated = ProjectSummary.objects.filter(pk=project_id).update(
+        is_stale=True)
+    if not updated and create:
+        ProjectSummary.objects.create(project_id=project_id, is_stale=True)
+
+
+def refresh_results(result_model, category, create=True, **filters):
+    """
+    Attempt statistics of every project of the category from one grouped
+    query. Only the summaries which changed or are stale are written.
+    """
+    fields = RESULT_FIELDS + ("is_stale",)
+    statistics = attempt_statistics(result_model, **filters)
+    current = dict(
+        (row[0], row[1:]) for row in ProjectSummary.objects.filter(
+            project__category=category).values_list("pk", *fields))
+    values = {}
+    for project_id in set(current) | set(statistics):
+        summary = result_fields(statistics.get(project_id, {})) + (False,)
+        if current.get(project_id) != summary:
+            values[project_id] = dict(zip(fields, summary))
+    update_summaries(values, create, existing=current)
+    return len(values)
+
+
+def refresh_orders(orders):
+    """Copies the race order and track of the orders to the summaries."""
+    update_summaries(dict(
+        (project_id, dict(race_order=order, track=track))
+        for project_id, order, track in orders.values_list(
+            "project", "order", "track")))
@@ -1,3 +1,159 @@
+# -*- coding: utf-8 -*-
+
+from StringIO import StringIO
 from django.test import TestCase
+from django.utils import timezone
+from django.core.urlresolvers import reverse
+from accounts.models import CustomUser
+from orders.models import RaceOrder, LineFollowerStage
+from projects.models import Project, ProjectSummary
+from projects.importers import ProjectImporter
+from results.models import MazeResult, LineFollowerResult, current_rank, \
+    refresh_stale_summaries
+
+
+HEADER = "email,name,phone,school,category,project\n"
+
+
+class ProjectImporterTestCase(TestCase):
+    def test_import_valid_rows(self):
+        "Testing a batch with new and already registered projects"
+
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        project = Project.objects.create(
+            manager=user, category="maze", name="Labirent")
+
+        importer = ProjectImporter(StringIO(
+            HEADER +
+            "kesen.alper@gmail.com,Alper Kesen,0541,ITU,maze,Labirent\n"
+            "kesen.alper@gmail.com,Alper Kesen,0541,ITU,basketball,Basket\n"
+            "ilker@example.com,İlker Kesen,0542,ITU,maze,Yılan\n"
+            "ilker@example.com,İlker Kesen,0542,ITU,scenario,Senaryo\n"))
+
+        self.assertTrue(importer.is_valid())
+        self.assertEqual(importer.save(), {
+            "users": 1, "projects": 3, "confirmed": 4})
+
+        self.assertEqual(CustomUser.objects.count(), 2)
+        self.assertEqual(Project.objects.filter(is_confirmed=True).count(), 4)
+        self.assertFalse(CustomUser.objects.get(
+            email="ilker@example.com").has_usable_password())
+        self.assertEqual(Project.objects.get(
+            category="maze", name=u"Yılan").manager.name, u"İlker Kesen")
+
+    def test_import_invalid_rows(self):
+        "Testing a batch with errors imports nothing"
+
+        importer = ProjectImporter(StringIO(
+            HEADER +
+            "kesen.alper@gmail.com,Alper Kesen,0541,ITU,maze,Labirent\n"
+            "kesen.alper@gmail.com,Alper Kesen,0541,ITU,maze,Labirent 2\n"
+            "ilker@example.com,İlker Kesen,0542,ITU,maze,Labirent\n"
+            "not-an-email,Tolga,0543,ITU,maze,Tolga\n"
+            "tolga@example.com,Tolga,0543,ITU,unknown,Tolga\n"
+            "tolga@example.com,,0543,ITU,maze,Tolga\n"))
+
+        self.assertFalse(importer.is_valid())
+        self.assertEqual(
+            [line for line, error in importer.errors], [3, 4, 5, 6, 7])
+        self.assertFalse(CustomUser.objects.exists())
+
+    def test_import_missing_columns(self):
+        "Testing a file without the required columns"
+
+        importer = ProjectImporter(StringIO("email,name\n"))
+        self.assertFalse(importer.is_valid())
+        self.assertEqual(importer.errors[0][0], 1)
+
+
+class ProjectSummaryTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="kesen.alper@gmail.com", password="alper",
+            name="Alper Kesen", phone="05414760273", school="ITU")
+        self.projects = [Project.objects.create(
+            manager=self.user, category="maze", name=name, is_confirmed=True)
+            for name in ("Labirent", "Yilan")]
+
+    def add_result(self, project, seconds):
+        return MazeResult.objects.create(
+            project=project, minutes=1, seconds=seconds, milliseconds=0)
+
+    def test_summary_writes(self):
+        "Testing summaries kept up to date by order and result writes"
+
+        first, second = self.projects
+        RaceOrder.objects.create(project=first, order=1, track=2)
+        self.add_result(first, 30)
+        self.add_result(first, 20)
+        self.add_result(second, 10)
+
+        summary = ProjectSummary.objects.get(project=first)
+        self.assertEqual(
+            (summary.race_order, summary.track, summary.is_stale),
+            (1, 2, True))
+        refresh_stale_summaries(self.projects)
+        summary = ProjectSummary.objects.get(project=first)
+        self.assertEqual(
+            (summary.attempt_count, summary.best_score, summary.is_stale),
+            (2, 80.0, False))
+        self.assertEqual(
+            [current_rank("maze", project.pk) for project in self.projects],
+            [2, 1])
+
+        MazeResult.objects.filter(project=second).get().delete()
+        RaceOrder.objects.get().delete()
+        summary = ProjectSummary.objects.get(project=first)
+        self.assertIsNone(summary.race_order)
+        self.assertEqual(current_rank("maze", first.pk), 1)
+
+    def test_current_stage(self):
+        "Testing line follower summaries show the current stage"
+
+        first, second = [Project.objects.create(
+            manager=self.user, category="line_follower", name=name)
+            for name in ("Cizgi", "Serit")]
+        stage = LineFollowerStage.objects.create(order=1, is_current=True)
+        LineFollowerResult.objects.create(
+            project=first, stage=stage, minutes=1, seconds=10, milliseconds=0)
+        next_stage = LineFollowerStage.objects.create(order=2)
+        LineFollowerResult.objects.create(
+            project=second, stage=next_stage, minutes=1, seconds=5,
+            milliseconds=0)
+
+        refresh_stale_summaries([first, second])
+        summary = ProjectSummary.objects.get(project=first)
+        self.assertEqual(summary.attempt_count, 1)
+        self.assertEqual(current_rank("line_follower", first.pk), 1)
+        self.assertFalse(ProjectSummary.objects.filter(project=second))
+
+        stage.is_current = False
+        stage.save()
+        next_stage.is_current = True
+        next_stage.save()
+        summary = ProjectSummary.objects.get(project=first)
+        self.assertEqual(summary.attempt_count, 0)
+        self.assertIsNone(current_rank("line_follower", first.pk))
+        summary = ProjectSummary.objects.get(project=second)
+        self.assertEqual(summary.attempt_count, 1)
+        self.assertEqual(current_rank("line_follower", second.pk), 1)
+
+    def test_dashboard(self):
+        "Testing the dashboard is served from the summaries"
+
+        self.add_result(self.projects[0], 30)
+        self.client.login(email="kesen.alper@gmail.com", password="alper")
+        response = self.client.get(reverse("project_list"))
+        self.assertContains(response, "Attempts: 1")
 
-# Create your tests here.
+        # one rank lookup per project and a count for each ranked one
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse("project_list"))
+        self.assertContains(response, "Attempts: 1")
+        self.assertContains(response, "Rank: 1")
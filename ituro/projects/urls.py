@@ -2,7 +2,7 @@ from django.conf.urls import patterns, include, url
 from django.conf import settings
 from projects.views import ProjectCreateView, ProjectDeleteView, \
     ProjectUpdateView, ProjectDetailView, ProjectListView, \
-    ProjectConfirmView, QRCodeDetailView
+    ProjectConfirmView, ProjectImportView, QRCodeDetailView
 
 urlpatterns = patterns(
     '',
@@ -15,6 +15,7 @@ urlpatterns = patterns(
     url(r'^(?P<pk>\d+)/$', ProjectDetailView.as_view(),
         name='project_detail'),
     url(r'^confirm/$', ProjectConfirmView.as_view(), name='project_confirm'),
+    url(r'^import/$', ProjectImportView.as_view(), name='project_import'),
     url(r'^confirm/(?P<pk>\d+)/qrcode/$', QRCodeDetailView.as_view(),
         name="qrcode_detail")
     )
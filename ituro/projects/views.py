@@ -9,11 +9,15 @@ from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.utils.translation import ugettext_lazy as _
-from django.conf import settings
 from accounts.models import CustomUser
 from projects.models import Project
 from projects.forms import ProjectCreateForm, ProjectUpdateForm, \
-    ProjectConfirmForm
+    ProjectConfirmForm, ProjectImportForm
+from projects.importers import ProjectImporter
+from base.state import competition_state
+from results.models import RESULT_MODELS, current_rank, \
+    refresh_stale_summaries
+from sumo.models import SumoGroupTeam
 
 
 class ProjectListView(TemplateView):
@@ -25,11 +29,25 @@ class ProjectListView(TemplateView):
         return super(ProjectListView, self).dispatch(*args, **kwargs)
 
     def get_context_data(self, **kwargs):
-        projects = Project.objects.filter(manager=self.request.user)
+        refresh_stale_summaries(Project.objects.filter(
+            manager=self.request.user))
+        projects = list(Project.objects.filter(
+            manager=self.request.user).select_related("summary"))
+        for project in projects:
+            project.rank = self.get_rank(project)
         context = super(ProjectListView, self).get_context_data(**kwargs)
         context['projects'] = projects
         return context
 
+    def get_rank(self, project):
+        if project.category == "micro_sumo":
+            return SumoGroupTeam.objects.filter(
+                robot=project, group__is_final=False).values_list(
+                    "rank", flat=True).first()
+        elif project.category in RESULT_MODELS:
+            return current_rank(project.category, project.pk)
+        return None
+
 
 class ProjectCreateView(CreateView):
     model = Project
@@ -39,7 +57,7 @@ class ProjectCreateView(CreateView):
 
     @method_decorator(login_required)
     def dispatch(self, *args, **kwargs):
-        if not settings.PROJECT_CREATE:
+        if not competition_state().PROJECT_CREATE:
             raise PermissionDenied
         return super(ProjectCreateView, self).dispatch(*args, **kwargs)
 
@@ -68,8 +86,9 @@ class ProjectUpdateView(UpdateView):
     @method_decorator(login_required)
     def dispatch(self, *args, **kwargs):
         project = self.get_object()
-        if not project.category in dict(settings.UPDATE_CATEGORIES).keys() or \
-           not settings.PROJECT_UPDATE or project.is_confirmed or \
+        state = competition_state()
+        if not project.category in dict(state.UPDATE_CATEGORIES).keys() or \
+           not state.PROJECT_UPDATE or project.is_confirmed or \
            not project.manager==self.request.user:
             raise PermissionDenied
         return super(ProjectUpdateView, self).dispatch(*args, **kwargs)
@@ -90,8 +109,9 @@ class ProjectDeleteView(DeleteView):
     @method_decorator(login_required)
     def dispatch(self, *args, **kwargs):
         project = self.get_object()
-        if not project.category in dict(settings.UPDATE_CATEGORIES).keys() or \
-           not settings.PROJECT_UPDATE or \
+        state = competition_state()
+        if not project.category in dict(state.UPDATE_CATEGORIES).keys() or \
+           not state.PROJECT_UPDATE or \
            not project.manager==self.request.user:
             raise PermissionDenied
         return super(ProjectDeleteView, self).dispatch(*args, **kwargs)
@@ -113,8 +133,9 @@ class ProjectDetailView(DetailView):
 
     def get_context_data(self, **kwargs):
         project = self.get_object()
-        update = settings.PROJECT_UPDATE and project.category in \
-                 dict(settings.UPDATE_CATEGORIES).keys()
+        state = competition_state()
+        update = state.PROJECT_UPDATE and project.category in \
+                 dict(state.UPDATE_CATEGORIES).keys()
         context = super(ProjectDetailView, self).get_context_data(**kwargs)
         context['UPDATE_PERMISSION'] = update
         return context
@@ -143,6 +164,32 @@ class ProjectConfirmView(FormView):
                 reverse("qrcode_detail", args=(project.id,)))
 
 
+class ProjectImportView(FormView):
+    template_name = "projects/project_import.html"
+    form_class = ProjectImportForm
+    success_url = reverse_lazy("project_import")
+
+    @method_decorator(login_required)
+    def dispatch(self, *args, **kwargs):
+        if not self.request.user.is_staff:
+            raise PermissionDenied
+        return super(ProjectImportView, self).dispatch(*args, **kwargs)
+
+    def form_valid(self, form):
+        importer = ProjectImporter(form.cleaned_data.get("csv_file"))
+        if not importer.is_valid():
+            messages.error(self.request, _(
+                "Nothing imported. Please correct the errors below."))
+            return self.render_to_response(self.get_context_data(
+                form=form, import_errors=importer.errors))
+
+        summary = importer.save()
+        messages.success(self.request, _(
+            "{users} users and {projects} projects created, "
+            "{confirmed} projects confirmed.").format(**summary))
+        return super(ProjectImportView, self).form_valid(form)
+
+
 class QRCodeDetailView(DetailView):
     model=Project
     template_name="projects/qrcode_detail.html"
@@ -1,3 +1,140 @@
 from django.test import TestCase
+from django.utils import timezone
+from django.core.urlresolvers import reverse
+from accounts.models import CustomUser
+from projects.models import Project, ProjectSummary
+from orders.models import RaceOrder
+from results.models import MazeResult, ResultBoard
 
-# Create your tests here.
+
+class RefereeResultTestCase(TestCase):
+    def setUp(self):
+        CustomUser.objects.create_superuser(
+            email="hakem@ituro.org", password="hakem", name="Hakem",
+            phone="05414760273", school="ITU")
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        self.project = Project.objects.create(
+            manager=user, category="maze", name="Labirent",
+            is_confirmed=True)
+        RaceOrder.objects.create(project=self.project, order=1, track=2)
+        self.client.login(email="hakem@ituro.org", password="hakem")
+
+    def test_create_result(self):
+        "Testing result entry with the race order resolved once"
+
+        ResultBoard.objects.create(key="maze:")
+        url = reverse("maze_result_create", args=[self.project.pk])
+        with self.assertNumQueries(12):
+            response = self.client.post(url, {
+                "minutes": 1, "seconds": 2, "milliseconds": 3,
+                "is_best": True})
+
+        self.assertRedirects(response, "{}?track=2#robot-{}".format(
+            reverse("category_robot_list", args=["maze"]), self.project.pk),
+            fetch_redirect_response=False)
+        result = MazeResult.objects.get()
+        self.assertEqual(result.project, self.project)
+        self.assertEqual(result.duration_ms, 62030)
+        # attempts are counted by the dashboard, not the referee
+        self.assertTrue(ProjectSummary.objects.get(
+            project=self.project).is_stale)
+
+    def test_create_result_without_order(self):
+        "Testing result entry for a robot without a race order"
+
+        RaceOrder.objects.all().delete()
+        response = self.client.get(
+            reverse("maze_result_create", args=[self.project.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_robot_list_attempts(self):
+        "Testing attempt counts and the attempt limit filter"
+
+        other = Project.objects.create(
+            manager=self.project.manager, category="maze", name="Minotor",
+            is_confirmed=True)
+        RaceOrder.objects.create(project=other, order=2, track=2)
+        for seconds in (30, 20, 40):
+            MazeResult.objects.create(
+                project=self.project, minutes=0, seconds=seconds,
+                milliseconds=0)
+        MazeResult.objects.create(
+            project=self.project, minutes=0, seconds=10, milliseconds=0,
+            disqualification=True)
+
+        url = reverse("category_robot_list", args=["maze"])
+        response = self.client.get(url)
+        orders = list(response.context["object_list"])
+        self.assertEqual([order.attempt_count for order in orders], [4, 0])
+        self.assertEqual(orders[0].best_score, 20)
+        self.assertIsNone(orders[1].best_score)
+
+        response = self.client.get(url, {"full": "hide"})
+        self.assertEqual(
+            [order.project for order in response.context["object_list"]],
+            [other])
+        response = self.client.get(url)
+        self.assertEqual(len(response.context["object_list"]), 1)
+
+    def test_update_conflict(self):
+        "Testing a result update based on an old version"
+
+        result = MazeResult.objects.create(
+            project=self.project, minutes=1, seconds=0, milliseconds=0)
+        url = reverse("maze_result_update", args=[self.project.pk, result.pk])
+        data = {"minutes": 0, "seconds": 50, "milliseconds": 0,
+                "is_best": True, "version": result.version}
+
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(MazeResult.objects.get().version, 1)
+
+        data["seconds"] = 45
+        response = self.client.post(url, data)
+        self.assertTemplateUsed(response, "referee/result_conflict.html")
+        self.assertEqual(len(response.context["changes"]), 1)
+        self.assertEqual(MazeResult.objects.get().score, 50)
+
+        data["version"] = 1
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        result = MazeResult.objects.get()
+        self.assertEqual((result.score, result.version), (45, 2))
+
+        result.save()
+        data["version"] = 2
+        response = self.client.post(url, data)
+        self.assertTemplateUsed(response, "referee/result_conflict.html")
+
+    def test_update_deleted(self):
+        "Testing a result update after the result was deleted"
+
+        result = MazeResult.objects.create(
+            project=self.project, minutes=1, seconds=0, milliseconds=0)
+        MazeResult.objects.filter(pk=result.pk).delete()
+        with self.assertRaises(MazeResult.DoesNotExist):
+            result.save_versioned(result.version)
+
+    def test_track_per_list(self):
+        "Testing the track filter is kept per list and checked"
+
+        other = Project.objects.create(
+            manager=self.project.manager, category="basketball",
+            name="Basket", is_confirmed=True)
+        RaceOrder.objects.create(project=other, order=1, track=1)
+
+        response = self.client.get(
+            reverse("category_robot_list", args=["maze"]), {"track": 2})
+        self.assertEqual(response.context["track"], 2)
+        response = self.client.get(
+            reverse("category_robot_list", args=["basketball"]))
+        self.assertIsNone(response.context["track"])
+        self.assertEqual(
+            [order.project for order in response.context["object_list"]],
+            [other])
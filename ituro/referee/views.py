@@ -11,16 +11,20 @@ from django.core.urlresolvers import reverse, reverse_lazy, NoReverseMatch
 from django.contrib import messages
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from base.state import competition_state
+from base.views import VersionedUpdateMixin
 from projects.models import Project
 from accounts.models import CustomUser
 from sumo.models import SumoStage, SumoStageMatch, SumoGroup, SumoGroupMatch
+from sumo.standings import commit_group_match, commit_stage_match
 from orders.models import LineFollowerStage, LineFollowerRaceOrder, RaceOrder
+from orders.scheduling import attempt_statistics, full_projects
 from referee.forms import QRCodeCheckForm, MicroSumoQRCodeCheckForm
 from results.models import LineFollowerResult, FireFighterResult, \
     BasketballResult, StairClimbingResult, MazeResult, ColorSelectingResult, \
     SelfBalancingResult, ScenarioResult, InnovativeJuryResult, InnovativeJury, \
-    InnovativeTotalResult
+    InnovativeTotalResult, RESULT_MODELS
 
 
 
@@ -70,7 +74,133 @@ __all__ = [
 ]
 
 
-class BaseResultCreateView(CreateView):
+def list_session_key(request, name):
+    """Session key of a list setting, separate for every category/stage."""
+    return "{}:{}".format(name, request.path)
+
+
+class TrackMixin(object):
+    """
+    Narrows a race order list to the track of the referee. The track is
+    picked with the track GET parameter and kept in the session for the
+    list, so a referee tablet keeps showing its own track's queue. A
+    stored track which the list does not have is ignored.
+    """
+    def get_tracks(self):
+        if not hasattr(self, "tracks"):
+            self.tracks = list(self.model.objects.filter(
+                **self.get_track_filters()).values_list(
+                    "track", flat=True).distinct().order_by("track"))
+        return self.tracks
+
+    def get_track(self):
+        key = list_session_key(self.request, "referee_track")
+        track = self.request.GET.get("track")
+        if track is not None:
+            self.request.session[key] = \
+                int(track) if track.isdigit() else None
+        track = self.request.session.get(key)
+        return track if track in self.get_tracks() else None
+
+    def get_queryset(self):
+        queryset = super(TrackMixin, self).get_queryset()
+        track = self.get_track()
+        if track is not None:
+            queryset = queryset.filter(track=track)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super(TrackMixin, self).get_context_data(**kwargs)
+        context["track"] = self.get_track()
+        context["tracks"] = self.get_tracks()
+        return context
+
+    def get_track_filters(self):
+        raise NotImplementedError()
+
+
+class AttemptMixin(object):
+    """
+    Adds attempt count, best score and last attempt time of every robot
+    to a race order list with one grouped query. Robots which used all
+    of their attempts can be hidden with the full GET parameter, which
+    is kept in the session like the track.
+    """
+    def get_result_model(self):
+        raise NotImplementedError()
+
+    def get_result_filters(self):
+        return {}
+
+    def hide_full(self):
+        key = list_session_key(self.request, "referee_hide_full")
+        full = self.request.GET.get("full")
+        if full is not None:
+            self.request.session[key] = full == "hide"
+        return self.request.session.get(key, False)
+
+    def get_queryset(self):
+        queryset = super(AttemptMixin, self).get_queryset().select_related(
+            "project")
+        result_model = self.get_result_model()
+        if result_model is not None and self.hide_full():
+            queryset = queryset.exclude(project__in=full_projects(
+                result_model, getattr(settings, "RACE_ATTEMPT_LIMIT", 3),
+                **self.get_result_filters()))
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super(AttemptMixin, self).get_context_data(**kwargs)
+        result_model = self.get_result_model()
+        statistics = {}
+        if result_model is not None:
+            statistics = attempt_statistics(
+                result_model, **self.get_result_filters())
+        for order in context["object_list"]:
+            row = statistics.get(order.project_id, {})
+            order.attempt_count = row.get("attempt_count", 0)
+            order.best_score = row.get("best_score")
+            order.last_attempt = row.get("last_attempt")
+        context["hide_full"] = self.hide_full()
+        context["attempt_limit"] = getattr(settings, "RACE_ATTEMPT_LIMIT", 3)
+        return context
+
+
+class RaceOrderMixin(object):
+    """
+    Resolves the race order of the robot in the url, together with its
+    project (and stage), with a single query per request. The result
+    views read the project from it instead of looking it up again.
+    """
+    order_model = RaceOrder
+    order_related = ["project"]
+
+    def get_order_filters(self):
+        return {"project__category": self.category,
+                "project__pk": self.kwargs.get("pid")}
+
+    def get_race_order(self):
+        if not hasattr(self, "race_order"):
+            self.race_order = self.order_model.objects.select_related(
+                *self.order_related).filter(
+                    **self.get_order_filters()).first()
+            if self.race_order is None:
+                raise Http404
+        return self.race_order
+
+
+def robot_list_url(url, race_order=None, project_id=None):
+    """
+    Appends the track of the order and an anchor of the robot, so that
+    the referee lands on the same track and row of the robot list.
+    """
+    if race_order is not None:
+        return "{}?track={}#robot-{}".format(
+            url, race_order.track, race_order.project_id)
+    return "{}#robot-{}".format(url, project_id)
+
+
+class BaseResultCreateView(RaceOrderMixin, CreateView):
     category = None
     fields = [
         "minutes", "seconds", "milliseconds", "disqualification", "is_best"]
@@ -82,31 +212,31 @@ class BaseResultCreateView(CreateView):
            not self.request.user.has_group("referee"):
             raise PermissionDenied
 
-        if not RaceOrder.objects.filter(
-                project__category=self.category,
-                project__pk=self.kwargs.get("pid")).exists():
-            raise Http404
-
+        self.get_race_order()
         return super(BaseResultCreateView, self).dispatch(*args, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super(BaseResultCreateView, self).get_context_data(**kwargs)
-        context["project"] = Project.objects.get(pk=self.kwargs.get("pid"))
+        context["project"] = self.race_order.project
         return context
 
     def form_valid(self, form):
         result = form.save(commit=False)
-        result.project = Project.objects.get(pk=self.kwargs.get("pid"))
-        result.save()
+        result.project = self.race_order.project
+        # the result and the rows its receivers write commit together
+        with transaction.atomic():
+            result.save()
+        self.object = result
         messages.success(self.request, _("Result entry created."))
 
-        return super(BaseResultCreateView, self).form_valid(form)
+        return HttpResponseRedirect(self.get_success_url())
 
     def get_success_url(self):
-        return reverse("category_robot_list", args=[self.category])
+        return robot_list_url(reverse(
+            "category_robot_list", args=[self.category]), self.race_order)
 
 
-class BaseResultUpdateView(UpdateView):
+class BaseResultUpdateView(VersionedUpdateMixin, UpdateView):
     category = None
     fields = [
         "minutes", "seconds", "milliseconds", "disqualification", "is_best"]
@@ -124,7 +254,8 @@ class BaseResultUpdateView(UpdateView):
         queryset = self.get_queryset()
         project_pk = self.kwargs.get("pid")
         result_pk = self.kwargs.get("rid")
-        queryset = queryset.filter(project__pk=project_pk, pk=result_pk)
+        queryset = queryset.select_related("project").filter(
+            project__pk=project_pk, pk=result_pk)
 
         try:
             obj = queryset.get()
@@ -133,14 +264,10 @@ class BaseResultUpdateView(UpdateView):
 
         return obj
 
-    def form_valid(self, form):
-        result = form.save(commit=True)
-        messages.success(self.request, _("Result updated."))
-
-        return super(BaseResultUpdateView, self).form_valid(form)
-
     def get_success_url(self):
-        return reverse("category_robot_list", args=[self.category])
+        return robot_list_url(reverse(
+            "category_robot_list", args=[self.category]),
+            project_id=self.object.project_id)
 
 
 class BaseResultDeleteView(DeleteView):
@@ -159,7 +286,8 @@ class BaseResultDeleteView(DeleteView):
         queryset = self.get_queryset()
         project_pk = self.kwargs.get("pid")
         result_pk = self.kwargs.get("rid")
-        queryset = queryset.filter(project__pk=project_pk, pk=result_pk)
+        queryset = queryset.select_related("project").filter(
+            project__pk=project_pk, pk=result_pk)
 
         try:
             obj = queryset.get()
@@ -170,11 +298,14 @@ class BaseResultDeleteView(DeleteView):
 
     def delete(self, request, *args, **kwargs):
         messages.info(request, _("Result entry deleted."))
-        return super(
-            BaseResultDeleteView, self).delete(request, *args, **kwargs)
+        with transaction.atomic():
+            return super(
+                BaseResultDeleteView, self).delete(request, *args, **kwargs)
 
     def get_success_url(self):
-        return reverse("category_robot_list", args=[self.category])
+        return robot_list_url(reverse(
+            "category_robot_list", args=[self.category]),
+            project_id=self.object.project_id)
 
 
 class RefereeHomeView(TemplateView):
@@ -188,7 +319,7 @@ class RefereeHomeView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super(RefereeHomeView, self).get_context_data(**kwargs)
-        context["categories"] = settings.ORDER_CATEGORIES
+        context["categories"] = competition_state().ORDER_CATEGORIES
         return context
 
 
@@ -205,7 +336,7 @@ class RefereeLineFollowerStageListView(ListView):
             *args, **kwargs)
 
 
-class LineFollowerRobotListView(ListView):
+class LineFollowerRobotListView(AttemptMixin, TrackMixin, ListView):
     model = LineFollowerRaceOrder
     template_name = "referee/line_follower_order_list.html"
 
@@ -222,15 +353,26 @@ class LineFollowerRobotListView(ListView):
         return super(LineFollowerRobotListView, self).dispatch(*args, **kwargs)
 
     def get_queryset(self):
-        return LineFollowerRaceOrder.objects.filter(
-            stage__order=self.kwargs.get("order"))
+        return super(LineFollowerRobotListView, self).get_queryset().filter(
+            stage__order=self.kwargs.get("order")).select_related("stage")
+
+    def get_track_filters(self):
+        return {"stage__order": self.kwargs.get("order")}
 
+    def get_result_model(self):
+        return LineFollowerResult
 
-class LineFollowerResultCreateView(CreateView):
+    def get_result_filters(self):
+        return {"stage__order": self.kwargs.get("order")}
+
+
+class LineFollowerResultCreateView(RaceOrderMixin, CreateView):
     model = LineFollowerResult
     category = "line_follower"
     template_name = "referee/line_follower_result_create.html"
     fields = BaseResultCreateView.fields + ["runway_out"]
+    order_model = LineFollowerRaceOrder
+    order_related = ["project", "stage"]
 
     @method_decorator(login_required)
     def dispatch(self, *args, **kwargs):
@@ -238,37 +380,39 @@ class LineFollowerResultCreateView(CreateView):
            not self.request.user.has_group("referee"):
             raise PermissionDenied
 
-        if not LineFollowerRaceOrder.objects.filter(
-                stage__order=self.kwargs.get("order"),
-                project__pk=self.kwargs.get("pid")).exists():
-            raise Http404
-
+        self.get_race_order()
         return super(LineFollowerResultCreateView, self).dispatch(
             *args, **kwargs)
 
+    def get_order_filters(self):
+        return {"stage__order": self.kwargs.get("order"),
+                "project__pk": self.kwargs.get("pid")}
+
     def get_context_data(self, **kwargs):
         context = super(LineFollowerResultCreateView, self).get_context_data(
             **kwargs)
-        context["project"] = Project.objects.get(pk=self.kwargs.get("pid"))
-        context["stage"] = LineFollowerStage.objects.filter(
-            order=self.kwargs.get("order")).first()
+        context["project"] = self.race_order.project
+        context["stage"] = self.race_order.stage
         return context
 
     def form_valid(self, form):
         result = form.save(commit=False)
-        result.project = Project.objects.get(pk=self.kwargs.get("pid"))
-        result.stage = LineFollowerStage.objects.get(order=self.kwargs["order"])
-        result.save()
+        result.project = self.race_order.project
+        result.stage = self.race_order.stage
+        with transaction.atomic():
+            result.save()
+        self.object = result
 
         messages.success(self.request, _("Result entry generated."))
-        return super(LineFollowerResultCreateView, self).form_valid(form)
+        return HttpResponseRedirect(self.get_success_url())
 
     def get_success_url(self):
-        return reverse(
-            "line_follower_robot_list", args=[self.kwargs.get("order")])
+        return robot_list_url(reverse(
+            "line_follower_robot_list", args=[self.kwargs.get("order")]),
+            self.race_order)
 
 
-class LineFollowerResultUpdateView(UpdateView):
+class LineFollowerResultUpdateView(VersionedUpdateMixin, UpdateView):
     model = LineFollowerResult
     category = "line_follower"
     template_name = "referee/line_follower_result_update.html"
@@ -287,7 +431,8 @@ class LineFollowerResultUpdateView(UpdateView):
         pid = self.kwargs.get("pid")
         rid = self.kwargs.get("rid")
         sid = self.kwargs.get("order")
-        queryset = queryset.filter(stage__order=sid, project__pk=pid, pk=rid)
+        queryset = queryset.select_related("project", "stage").filter(
+            stage__order=sid, project__pk=pid, pk=rid)
 
         try:
             obj = queryset.get()
@@ -296,16 +441,13 @@ class LineFollowerResultUpdateView(UpdateView):
 
         return obj
 
-    def form_valid(self, form):
-        result = form.save(commit=True)
-        messages.success(self.request, _(
-            "Result entry for {} #{} updated.".format(
-                result.project.name, result.stage.order)))
-        return super(LineFollowerResultUpdateView, self).form_valid(form)
+    def get_success_message(self):
+        return _("Result entry for {} #{} updated.".format(
+            self.object.project.name, self.object.stage.order))
 
     def get_success_url(self):
-        return reverse("line_follower_robot_list", args=[
-            self.kwargs.get("order")])
+        return robot_list_url(reverse("line_follower_robot_list", args=[
+            self.kwargs.get("order")]), project_id=self.object.project_id)
 
 
 class LineFollowerResultDeleteView(DeleteView):
@@ -326,7 +468,8 @@ class LineFollowerResultDeleteView(DeleteView):
         pid = self.kwargs.get("pid")
         rid = self.kwargs.get("rid")
         sid = self.kwargs.get("order")
-        queryset = queryset.filter(stage__order=sid, project__pk=pid, pk=rid)
+        queryset = queryset.select_related("project", "stage").filter(
+            stage__order=sid, project__pk=pid, pk=rid)
 
         try:
             obj = queryset.get()
@@ -337,15 +480,16 @@ class LineFollowerResultDeleteView(DeleteView):
 
     def delete(self, request, *args, **kwargs):
         messages.info(request, _("Result entry deleted."))
-        return super(LineFollowerResultDeleteView,
-                     self).delete(request, *args, **kwargs)
+        with transaction.atomic():
+            return super(LineFollowerResultDeleteView,
+                         self).delete(request, *args, **kwargs)
 
     def get_success_url(self):
-        return reverse("line_follower_robot_list", args=[
-            self.kwargs.get("order")])
+        return robot_list_url(reverse("line_follower_robot_list", args=[
+            self.kwargs.get("order")]), project_id=self.object.project_id)
 
 
-class CategoryRobotListView(ListView):
+class CategoryRobotListView(AttemptMixin, TrackMixin, ListView):
     model = RaceOrder
     template_name = "referee/order_list.html"
 
@@ -363,9 +507,15 @@ class CategoryRobotListView(ListView):
         return super(CategoryRobotListView, self).dispatch(*args, **kwargs)
 
     def get_queryset(self):
-        return RaceOrder.objects.filter(
+        return super(CategoryRobotListView, self).get_queryset().filter(
             project__category=self.kwargs.get("category"))
 
+    def get_track_filters(self):
+        return {"project__category": self.kwargs.get("category")}
+
+    def get_result_model(self):
+        return RESULT_MODELS.get(self.kwargs.get("category"))
+
     def get_context_data(self, **kwargs):
         context = super(CategoryRobotListView, self).get_context_data(**kwargs)
         context["category"] = self.kwargs.get("category")
@@ -553,7 +703,7 @@ class SelfBalancingResultUpdateView(BaseResultUpdateView):
 
 class SelfBalancingResultDeleteView(BaseResultDeleteView):
     model = SelfBalancingResult
-    cateogry = "self_balancing"
+    category = "self_balancing"
 
 
 class ScenarioResultCreateView(BaseResultCreateView):
@@ -651,7 +801,8 @@ class InnovativeResultUpdateView(UpdateView):
         queryset = self.get_queryset()
         project_pk = self.kwargs.get("pid")
         result_pk = self.kwargs.get("rid")
-        queryset = queryset.filter(project__pk=project_pk, pk=result_pk)
+        queryset = queryset.select_related("project").filter(
+            project__pk=project_pk, pk=result_pk)
 
         try:
             obj = queryset.get()
@@ -691,7 +842,8 @@ class InnovativeResultDeleteView(DeleteView):
         queryset = self.get_queryset()
         project_pk = self.kwargs.get("pid")
         result_pk = self.kwargs.get("rid")
-        queryset = queryset.filter(project__pk=project_pk, pk=result_pk)
+        queryset = queryset.select_related("project").filter(
+            project__pk=project_pk, pk=result_pk)
 
         try:
             obj = queryset.get()
@@ -774,7 +926,8 @@ class MicroSumoOrdersRefereeListView(ListView):
         keyword = self.kwargs.get("type")
         order = self.kwargs.get("order")
         if keyword == "groups":
-            queryset = SumoGroupMatch.objects.filter(group=order)
+            queryset = SumoGroupMatch.objects.filter(
+                group=order, is_forfeit=False)
         elif keyword == "stages":
             queryset = SumoStageMatch.objects.filter(stage=order)
         else:
@@ -782,7 +935,7 @@ class MicroSumoOrdersRefereeListView(ListView):
         return queryset
 
 
-class MicroSumoGroupResultUpdateView(UpdateView):
+class MicroSumoGroupResultUpdateView(VersionedUpdateMixin, UpdateView):
     model = SumoGroupMatch
     fields = ["home_score","away_score","is_played"]
     template_name = "referee/micro_sumo_result_update.html"
@@ -808,18 +961,15 @@ class MicroSumoGroupResultUpdateView(UpdateView):
 
         return obj
 
-    def form_valid(self, form):
-        result = form.save(commit=True)
-        messages.success(self.request, _("Result updated."))
-
-        return super(MicroSumoGroupResultUpdateView, self).form_valid(form)
+    def save_object(self, obj, version):
+        return commit_group_match(obj, version)
 
     def get_success_url(self):
         group = self.kwargs.get("order")
         return reverse("micro_sumo_orders", args=["groups",group])
 
 
-class MicroSumoStageResultUpdateView(UpdateView):
+class MicroSumoStageResultUpdateView(VersionedUpdateMixin, UpdateView):
     model = SumoStageMatch
     fields = ["home_score","away_score","is_played"]
     template_name = "referee/micro_sumo_result_update.html"
@@ -845,11 +995,8 @@ class MicroSumoStageResultUpdateView(UpdateView):
 
         return obj
 
-    def form_valid(self, form):
-        result = form.save(commit=True)
-        messages.success(self.request, _("Result updated."))
-
-        return super(MicroSumoStageResultUpdateView, self).form_valid(form)
+    def save_object(self, obj, version):
+        return commit_stage_match(obj, version)
 
     def get_success_url(self):
         stage = self.kwargs.get("order")
@@ -2,21 +2,37 @@
 
 from django.contrib import admin
 from django.utils.translation import ugettext_lazy as _
+from base.paginator import EstimatedCountMixin
 from results.models import LineFollowerResult, FireFighterResult, \
     BasketballResult, StairClimbingResult, MazeResult, ColorSelectingResult, \
     SelfBalancingResult, ScenarioResult, InnovativeJuryResult, InnovativeJury, \
-    InnovativeTotalResult
+    InnovativeTotalResult, ResultEvent, ResultRank
 
 
-class BaseResultAdmin(admin.ModelAdmin):
+class BaseResultAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = (
         "project", "score", "minutes", "seconds", "milliseconds",
         "disqualification", "is_best")
     list_filter = ("disqualification", "is_best")
+    list_select_related = ("project",)
+
 
 class InnovativeJuryResultAdmin(admin.ModelAdmin):
     list_display = ("project", "jury", "design", "innovative", "technical",
                     "presentation", "opinion","jury_score")
+    list_select_related = ("project", "jury")
+
+
+class ResultEventAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    list_display = ("category", "result_id", "action", "created_at")
+    list_filter = ("category", "action")
+
+
+class ResultRankAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    list_display = (
+        "category", "stage", "project", "score", "disqualification")
+    list_filter = ("category", "stage")
+    list_select_related = ("stage", "project")
 
 
 admin.site.register(LineFollowerResult, BaseResultAdmin)
@@ -30,3 +46,5 @@ admin.site.register(ScenarioResult, BaseResultAdmin)
 admin.site.register(InnovativeJuryResult, InnovativeJuryResultAdmin)
 admin.site.register(InnovativeJury)
 admin.site.register(InnovativeTotalResult)
+admin.site.register(ResultEvent, ResultEventAdmin)
+admin.site.register(ResultRank, ResultRankAdmin)
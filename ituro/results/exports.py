@@ -0,0 +1,90 @@
+import csv
+from django.conf import settings
+from django.utils.encoding import force_text
+from results.models import BaseResult
+
+
+EXPORT_COLUMNS = [
+    "category", "result", "stage", "project", "manager", "email", "school",
+    "score", "duration", "disqualification", "is_best", "created_at",
+]
+
+BASE_FIELDS = set(f.name for f in BaseResult._meta.fields)
+SKIPPED_FIELDS = BASE_FIELDS | set(["id", "project", "stage"])
+
+
+class Echo(object):
+    """File-like object which hands back whatever is written to it."""
+
+    def write(self, value):
+        return value
+
+
+def breakdown_fields(model):
+    return [f.name for f in model._meta.fields
+            if f.name not in SKIPPED_FIELDS]
+
+
+def export_header(categories):
+    if len(categories) == 1:
+        return EXPORT_COLUMNS + breakdown_fields(categories[0][1])
+    return EXPORT_COLUMNS + ["details"]
+
+
+def export_rows(categories):
+    """
+    Yields one row per result of the given (category, model) pairs.
+
+    Results are read with iterator() so that the queryset cache is never
+    filled, the whole export keeps a constant memory footprint.
+    """
+    single = len(categories) == 1
+    for category, model in categories:
+        fields = breakdown_fields(model)
+        related = ["project__manager"] + [
+            f.name for f in model._meta.fields
+            if f.name in fields and f.rel is not None]
+        if hasattr(model, "stage"):
+            related.append("stage")
+        queryset = model.objects.select_related(*related).order_by("pk")
+
+        for result in queryset.iterator():
+            project = result.project
+            manager = project.manager
+            stage = getattr(result, "stage", None)
+            row = [
+                category, result.pk, stage.order if stage else "",
+                project.name, manager.name, manager.email, manager.school,
+                getattr(result, "score", getattr(result, "jury_score", "")),
+                getattr(result, "duration", ""),
+                getattr(result, "disqualification", ""),
+                getattr(result, "is_best", ""),
+                result.created_at.isoformat(),
+            ]
+            details = [(name, getattr(result, name)) for name in fields]
+            if single:
+                row.extend(value for name, value in details)
+            else:
+                row.append(u"; ".join(
+                    u"{}={}".format(name, value) for name, value in details))
+            yield row
+
+
+def encode_row(row):
+    return [force_text(value).encode("utf-8") for value in row]
+
+
+def iter_csv(categories):
+    """Streams the export as CSV lines, one line per result row."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(encode_row(export_header(categories)))
+    for row in export_rows(categories):
+        yield writer.writerow(encode_row(row))
+
+
+def export_categories(results_dict, category=None):
+    if category is not None:
+        return [(category, results_dict[category])]
+    return [(slug, results_dict[slug])
+            for slug, display in settings.ALL_CATEGORIES
+            if slug in results_dict]
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from results.views import RESULTS_DICT
+from results.exports import iter_csv, export_categories
+
+
+class Command(BaseCommand):
+    args = '[category]'
+    help = 'Exports results of all or the specified category as CSV.'
+
+    def handle(self, *args, **options):
+        category = args[0] if args else None
+        if category is not None and not category in RESULTS_DICT:
+            raise CommandError('Category %s has no results.' % category)
+
+        for line in iter_csv(export_categories(RESULTS_DICT, category)):
+            self.stdout.write(line, ending='')
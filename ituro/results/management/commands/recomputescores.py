@@ -0,0 +1,32 @@
+from optparse import make_option
+from django.core.management.base import BaseCommand, CommandError
+from results.models import RESULT_MODELS
+from results.recompute import recompute_scores
+
+
+class Command(BaseCommand):
+    args = '<category>'
+    help = ('Recalculates scores of a category from its result log and '
+            'reports the results which differ from it.')
+    option_list = BaseCommand.option_list + (
+        make_option('--dry-run',
+                    action='store_true',
+                    dest='dry_run',
+                    default=False,
+                    help='Report the changes without saving them.'),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1 or not args[0] in RESULT_MODELS:
+            raise CommandError('Give one of: %s' % ', '.join(
+                sorted(RESULT_MODELS)))
+
+        updated, diff, stale = recompute_scores(
+            args[0], options['dry_run'])
+        for result_id in stale:
+            self.stdout.write('Result %d differs from its log.' % result_id)
+        for key, before, after in diff:
+            self.stdout.write('%s: %s -> %s' % (
+                ' '.join(str(value) for value in key), before, after))
+        self.stdout.write('%d scores %s.' % (
+            updated, 'would be updated' if options['dry_run'] else 'updated'))
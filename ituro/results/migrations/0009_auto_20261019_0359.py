@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0008_merge'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultEvent',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('category', models.CharField(max_length=30, verbose_name='Category', choices=[(b'line_follower', 'Line Follower'), (b'micro_sumo', 'Micro Sumo'), (b'fire_fighter', 'Fire Fighter'), (b'basketball', 'Basketball'), (b'stair_climbing', 'Stair Climbing'), (b'maze', 'Maze'), (b'color_selecting', 'Color Selecting'), (b'self_balancing', 'Self Balancing'), (b'scenario', 'Scenario'), (b'innovative', 'Innovative')])),
+                ('result_id', models.PositiveIntegerField(verbose_name='Result')),
+                ('action', models.CharField(max_length=10, verbose_name='Action', choices=[(b'create', 'Create'), (b'update', 'Update'), (b'delete', 'Delete')])),
+                ('data', models.TextField(verbose_name='Data', blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['pk'],
+                'verbose_name': 'Result Event',
+                'verbose_name_plural': 'Result Events',
+            },
+            bases=(models.Model,),
+        ),
+        migrations.AlterIndexTogether(
+            name='resultevent',
+            index_together=set([('category', 'result_id')]),
+        ),
+    ]
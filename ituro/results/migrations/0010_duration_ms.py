@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+RESULT_MODELS = (
+    "LineFollowerResult", "FireFighterResult", "BasketballResult",
+    "StairClimbingResult", "MazeResult", "ColorSelectingResult",
+    "SelfBalancingResult", "ScenarioResult",
+)
+
+
+def fill_duration_ms(apps, schema_editor):
+    for name in RESULT_MODELS:
+        apps.get_model("results", name).objects.update(
+            duration_ms=models.F("minutes") * 60000 +
+            models.F("seconds") * 1000 + models.F("milliseconds") * 10)
+    apps.get_model("results", "SelfBalancingResult").objects.update(
+        stage3_duration_ms=models.F("stage3_minutes") * 60000 +
+        models.F("stage3_seconds") * 1000 +
+        models.F("stage3_milliseconds") * 10)
+
+
+def keep_duration_ms(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0009_auto_20261019_0359'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='basketballresult',
+            options={'ordering': ['disqualification', '-score', 'duration_ms'], 'verbose_name': 'Basketball Result', 'verbose_name_plural': 'Basketball Results'},
+        ),
+        migrations.AlterModelOptions(
+            name='colorselectingresult',
+            options={'ordering': ['disqualification', '-score', 'duration_ms'], 'verbose_name': 'Color Selecting Result', 'verbose_name_plural': 'Color Selecting Results'},
+        ),
+        migrations.AlterModelOptions(
+            name='firefighterresult',
+            options={'ordering': ['disqualification', '-score', 'duration_ms'], 'verbose_name': 'Fire Fighter Result', 'verbose_name_plural': 'Fire Fighter Results'},
+        ),
+        migrations.AlterModelOptions(
+            name='selfbalancingresult',
+            options={'ordering': ['disqualification', '-score', '-duration_ms', '-headway_amount', 'stage3_duration_ms'], 'verbose_name': 'Self Balancing Result', 'verbose_name_plural': 'Self Balancing Results'},
+        ),
+        migrations.AlterModelOptions(
+            name='stairclimbingresult',
+            options={'ordering': ['disqualification', '-score', 'duration_ms'], 'verbose_name': 'Stair Climbing Result', 'verbose_name_plural': 'Stair Climbing Results'},
+        ),
+        migrations.AddField(
+            model_name='basketballresult',
+            name='duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='colorselectingresult',
+            name='duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='firefighterresult',
+            name='duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='linefollowerresult',
+            name='duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='mazeresult',
+            name='duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='scenarioresult',
+            name='duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='selfbalancingresult',
+            name='duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='selfbalancingresult',
+            name='stage3_duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Stage3 Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='stairclimbingresult',
+            name='duration_ms',
+            field=models.PositiveIntegerField(default=0, verbose_name='Duration (ms)', editable=False),
+            preserve_default=True,
+        ),
+        migrations.RunPython(fill_duration_ms, keep_duration_ms),
+    ]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0010_duration_ms'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='basketballresult',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='colorselectingresult',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='firefighterresult',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='linefollowerresult',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='mazeresult',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='scenarioresult',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='selfbalancingresult',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='stairclimbingresult',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+    ]
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+RESULT_MODELS = {
+    "line_follower": "LineFollowerResult",
+    "fire_fighter": "FireFighterResult",
+    "basketball": "BasketballResult",
+    "stair_climbing": "StairClimbingResult",
+    "maze": "MazeResult",
+    "color_selecting": "ColorSelectingResult",
+    "self_balancing": "SelfBalancingResult",
+    "scenario": "ScenarioResult",
+}
+
+
+def encode(value, descending=False):
+    if isinstance(value, float):
+        value = int(round(value * 1000))
+    value = int(value) + 10 ** 12
+    if descending:
+        value = 10 ** 13 - 1 - value
+    return "%013d" % value
+
+
+def fill_ranks(apps, schema_editor):
+    rank_model = apps.get_model("results", "ResultRank")
+    for category, name in RESULT_MODELS.items():
+        result_model = apps.get_model("results", name)
+        ordering = result_model._meta.ordering
+        best = {}
+        for result in result_model.objects.filter(is_best=True).iterator():
+            key = ".".join([
+                encode(getattr(result, field.lstrip("-")),
+                       field.startswith("-")) for field in ordering] +
+                [encode(result.project_id)])
+            project = (result.project_id, getattr(result, "stage_id", None))
+            if not project in best or key < best[project][0]:
+                best[project] = (key, result)
+        rank_model.objects.bulk_create([rank_model(
+            category=category, stage_id=getattr(result, "stage_id", None),
+            project_id=result.project_id, result_id=result.pk,
+            score=result.score, disqualification=result.disqualification,
+            sort_key=key) for key, result in best.values()])
+
+
+def keep_ranks(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_projectsummary'),
+        ('orders', '0004_auto_20261019_0356'),
+        ('results', '0011_auto_20261019_0404'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultRank',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('category', models.CharField(max_length=30, verbose_name='Category', choices=[(b'line_follower', 'Line Follower'), (b'micro_sumo', 'Micro Sumo'), (b'fire_fighter', 'Fire Fighter'), (b'basketball', 'Basketball'), (b'stair_climbing', 'Stair Climbing'), (b'maze', 'Maze'), (b'color_selecting', 'Color Selecting'), (b'self_balancing', 'Self Balancing'), (b'scenario', 'Scenario'), (b'innovative', 'Innovative')])),
+                ('result_id', models.PositiveIntegerField(verbose_name='Result')),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('disqualification', models.BooleanField(default=False, verbose_name='Disqualification')),
+                ('sort_key', models.CharField(max_length=100)),
+                ('project', models.ForeignKey(verbose_name='Project', to='projects.Project')),
+                ('stage', models.ForeignKey(verbose_name='Line Follower Stage', blank=True, to='orders.LineFollowerStage', null=True)),
+            ],
+            options={
+                'ordering': ['sort_key'],
+                'verbose_name': 'Result Rank',
+                'verbose_name_plural': 'Result Ranks',
+            },
+            bases=(models.Model,),
+        ),
+        migrations.AlterUniqueTogether(
+            name='resultrank',
+            unique_together=set([('category', 'stage', 'project')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='resultrank',
+            index_together=set([('category', 'stage', 'sort_key')]),
+        ),
+        migrations.RunPython(fill_ranks, keep_ranks),
+    ]
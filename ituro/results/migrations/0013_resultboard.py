@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0012_resultrank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultBoard',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('key', models.CharField(unique=True, max_length=100)),
+            ],
+            options={
+            },
+            bases=(models.Model,),
+        ),
+    ]
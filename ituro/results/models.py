@@ -1,14 +1,37 @@
-from django.db import models
+import json
+from django.db import models, transaction
+from django.db.models import F
 from django.dispatch import receiver
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils.encoding import python_2_unicode_compatible
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 from django.core.validators import MaxValueValidator, MinValueValidator
-from projects.models import Project
+from base.models import VersionedModel
+from projects.models import Project, ProjectSummary
 from orders.models import LineFollowerStage
+from orders.scheduling import invalidate_race_statistics
+from projects.summary import mark_stale, refresh_project, refresh_results
+from results.scoring import SCORING_RULES, to_milliseconds
+from results.ranking import sort_key, build_ranks, number
 
 
-class BaseResult(models.Model):
+class ResultQuerySet(models.QuerySet):
+    """
+    Queryset updates skip post_save, so they bump the version and append
+    the new values of the updated rows to the result log themselves.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault("version", F("version") + 1)
+        with transaction.atomic():
+            pks = list(self.values_list("pk", flat=True))
+            count = super(ResultQuerySet, self).update(**kwargs)
+            log_updates(self.model, pks)
+        return count
+
+
+class BaseResult(VersionedModel):
     score = models.FloatField(verbose_name=_('Score'), blank=True)
     minutes = models.PositiveSmallIntegerField(verbose_name=_("Minutes"))
     seconds = models.PositiveSmallIntegerField(verbose_name=_("Seconds"))
@@ -18,14 +41,23 @@ class BaseResult(models.Model):
         verbose_name=_('Disqualification'), default=False)
     is_best = models.BooleanField(
         verbose_name=_("Is best result?"), default=True)
+    duration_ms = models.PositiveIntegerField(
+        verbose_name=_("Duration (ms)"), default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ResultQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        self.duration_ms = to_milliseconds(
+            self.minutes, self.seconds, self.milliseconds)
+        super(BaseResult, self).save(*args, **kwargs)
+
     @property
     def duration(self):
-        return self.minutes * 60 + self.seconds + self.milliseconds * 0.01
+        return self.duration_ms / 1000.0
 
     @property
     def duration_pretty(self):
@@ -33,6 +65,13 @@ class BaseResult(models.Model):
             self.minutes, self.seconds, self.milliseconds)
 
 
+@receiver([models.signals.post_save, models.signals.post_delete])
+def result_invalidate_race_statistics(sender, instance, *args, **kwargs):
+    if issubclass(sender, BaseResult):
+        invalidate_race_statistics(
+            sender, getattr(instance, "stage_id", None))
+
+
 @python_2_unicode_compatible
 class LineFollowerResult(BaseResult):
     project = models.ForeignKey(
@@ -51,11 +90,6 @@ class LineFollowerResult(BaseResult):
         return self.project.name
 
 
-@receiver(models.signals.pre_save, sender=LineFollowerResult)
-def line_follower_result_calculate_score(sender, instance, *args, **kwargs):
-    instance.score = instance.duration * (1 + 0.2 * instance.runway_out)
-
-
 @python_2_unicode_compatible
 class FireFighterResult(BaseResult):
     project = models.ForeignKey(
@@ -79,24 +113,12 @@ class FireFighterResult(BaseResult):
     class Meta:
         verbose_name = _("Fire Fighter Result")
         verbose_name_plural = _("Fire Fighter Results")
-        ordering = [
-            "disqualification", "-score", "minutes", "seconds", "milliseconds"]
+        ordering = ["disqualification", "-score", "duration_ms"]
 
     def __str__(self):
         return self.project.name
 
 
-@receiver(models.signals.pre_save, sender=FireFighterResult)
-def fire_fighter_result_calculate_score(sender, instance, *args, **kwargs):
-    instance.score = sum((
-        instance.extinguish_success * 150,
-        instance.extinguish_failure * 50,
-        instance.wall_hit * (-10),
-        instance.touching_candles * (-100),
-        instance.pre_extinguish * (-50),
-        instance.interfering_robot * (-30),
-        int(instance.is_complete) * ((300 - instance.duration) / 4)))
-
 @python_2_unicode_compatible
 class BasketballResult(BaseResult):
     project = models.ForeignKey(
@@ -110,23 +132,12 @@ class BasketballResult(BaseResult):
     class Meta:
         verbose_name = _("Basketball Result")
         verbose_name_plural = _("Basketball Results")
-        ordering = [
-            "disqualification", "-score", "minutes", "seconds", "milliseconds"]
+        ordering = ["disqualification", "-score", "duration_ms"]
 
     def __str__(self):
         return self.project.name
 
 
-@receiver(models.signals.pre_save, sender=BasketballResult)
-def basketball_result_calculate_score(sender, instance, *args, **kwargs):
-    instance.score = sum((
-        sum(range(6, 6 - instance.basket1, -1)),
-        sum(range(6, 6 - instance.basket2, -1)),
-        sum(range(6, 6 - instance.basket3, -1)),
-        sum(range(6, 6 - instance.basket4, -1)),
-        sum(range(6, 6 - instance.basket5, -1)))) * 10
-
-
 @python_2_unicode_compatible
 class StairClimbingResult(BaseResult):
     project = models.ForeignKey(
@@ -150,28 +161,12 @@ class StairClimbingResult(BaseResult):
     class Meta:
         verbose_name = _("Stair Climbing Result")
         verbose_name_plural = _("Stair Climbing Results")
-        ordering = [
-            "disqualification", "-score", "minutes", "seconds", "milliseconds"]
+        ordering = ["disqualification", "-score", "duration_ms"]
 
     def __str__(self):
         return self.project.name
 
 
-@receiver(models.signals.pre_save, sender=StairClimbingResult)
-def stair_climbing_result_calculate_score(sender, instance, *args, **kwargs):
-    instance.score = sum((
-        (int(instance.stair1) + int(instance.stair2) + int(instance.stair3)) * 10,
-        (int(instance.stair4)) * 40,
-        (int(instance.stair5))* 80,
-        (int(instance.stair6))* 100,
-        (int(instance.stair7))* 120,
-        (int(instance.down6) + int(instance.down5) + int(instance.down4)) * 20,
-        (int(instance.down1) + int(instance.down2) + int(instance.down3)) * 10,
-        (int(instance.is_complete)) * 40,
-        instance.duration * (-5)
-        ))
-
-
 @python_2_unicode_compatible
 class MazeResult(BaseResult):
     project = models.ForeignKey(
@@ -186,14 +181,6 @@ class MazeResult(BaseResult):
         return self.project.name
 
 
-@receiver(models.signals.pre_save, sender=MazeResult)
-def maze_result_calculate_score(sender, instance, *args, **kwargs):
-    instance.score = sum((
-        instance.minutes * 60,
-        instance.seconds,
-        instance.milliseconds * 0.01))
-
-
 @python_2_unicode_compatible
 class ColorSelectingResult(BaseResult):
     project = models.ForeignKey(
@@ -208,21 +195,12 @@ class ColorSelectingResult(BaseResult):
     class Meta:
         verbose_name = _("Color Selecting Result")
         verbose_name_plural = _("Color Selecting Results")
-        ordering = [
-            "disqualification", "-score", "minutes", "seconds", "milliseconds"]
+        ordering = ["disqualification", "-score", "duration_ms"]
 
     def __str__(self):
         return self.project.name
 
 
-@receiver(models.signals.pre_save, sender=ColorSelectingResult)
-def color_selecting_result_calculate_score(sender, instance, *args, **kwargs):
-    instance.score = sum((
-        instance.obtain * 100,
-        instance.place_success * 200,
-        instance.place_failure * (-50)))
-
-
 @python_2_unicode_compatible
 class SelfBalancingResult(BaseResult):
     project = models.ForeignKey(
@@ -235,25 +213,24 @@ class SelfBalancingResult(BaseResult):
         verbose_name=_("Stage3 Seconds"))
     stage3_milliseconds = models.PositiveSmallIntegerField(
         verbose_name=_("Stage3 Milliseconds"))
+    stage3_duration_ms = models.PositiveIntegerField(
+        verbose_name=_("Stage3 Duration (ms)"), default=0, editable=False)
 
     class Meta:
         verbose_name = _("Self Balancing Result")
         verbose_name_plural = _("Self Balancing Results")
         ordering = [
-            "disqualification", "-score", "-seconds", "-milliseconds",
-            "-headway_amount", "stage3_minutes", "stage3_seconds",
-            "stage3_milliseconds"]
+            "disqualification", "-score", "-duration_ms", "-headway_amount",
+            "stage3_duration_ms"]
 
     def __str__(self):
         return self.project.name
 
-
-@receiver(models.signals.pre_save, sender=SelfBalancingResult)
-def self_balancing_result_calculate_score(sender, instance, *args, **kwargs):
-    instance.score = sum((
-        instance.duration, instance.headway_amount * 0.25,
-        (instance.stage3_minutes * 60 + instance.stage3_seconds +
-        instance.stage3_milliseconds * 0.01) * 2))
+    def save(self, *args, **kwargs):
+        self.stage3_duration_ms = to_milliseconds(
+            self.stage3_minutes, self.stage3_seconds,
+            self.stage3_milliseconds)
+        super(SelfBalancingResult, self).save(*args, **kwargs)
 
 
 @python_2_unicode_compatible
@@ -340,3 +317,297 @@ def innovative_jury_result_calculate_score(sender, instance, *args, **kwargs):
         instance.technical * 0.25,
         instance.presentation * 0.1,
         instance.opinion * 0.05))
+
+
+RESULT_MODELS = {
+    "line_follower": LineFollowerResult,
+    "fire_fighter": FireFighterResult,
+    "basketball": BasketballResult,
+    "stair_climbing": StairClimbingResult,
+    "maze": MazeResult,
+    "color_selecting": ColorSelectingResult,
+    "self_balancing": SelfBalancingResult,
+    "scenario": ScenarioResult,
+}
+
+
+@python_2_unicode_compatible
+class ResultEvent(models.Model):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    ACTION_CHOICES = (
+        (CREATE, _("Create")),
+        (UPDATE, _("Update")),
+        (DELETE, _("Delete")),
+    )
+
+    category = models.CharField(
+        verbose_name=_("Category"), max_length=30,
+        choices=settings.ALL_CATEGORIES)
+    result_id = models.PositiveIntegerField(verbose_name=_("Result"))
+    action = models.CharField(
+        verbose_name=_("Action"), max_length=10, choices=ACTION_CHOICES)
+    data = models.TextField(verbose_name=_("Data"), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Result Event")
+        verbose_name_plural = _("Result Events")
+        ordering = ["pk"]
+        index_together = (("category", "result_id"),)
+
+    def __str__(self):
+        return u"{} {} #{}".format(self.action, self.category, self.result_id)
+
+    @classmethod
+    def serialize(cls, result):
+        return json.dumps(dict(
+            (field.attname, field.value_from_object(result))
+            for field in result._meta.concrete_fields if not field.primary_key),
+            cls=DjangoJSONEncoder)
+
+
+RESULT_CATEGORY_LOOKUP = dict(
+    (model, category) for category, model in RESULT_MODELS.items())
+
+LOG_BATCH_SIZE = 300
+
+
+def log_updates(model, pks):
+    """
+    Appends the current values of the given results to the log, for
+    writes which skip post_save.
+    """
+    category = RESULT_CATEGORY_LOOKUP.get(model)
+    if category is None:
+        return
+    pks = list(pks)
+    for start in range(0, len(pks), LOG_BATCH_SIZE):
+        ResultEvent.objects.bulk_create([
+            ResultEvent(category=category, result_id=result.pk,
+                        action=ResultEvent.UPDATE,
+                        data=ResultEvent.serialize(result))
+            for result in model._base_manager.filter(
+                pk__in=pks[start:start + LOG_BATCH_SIZE])])
+
+
+class ResultBoardManager(models.Manager):
+    def board_key(self, category, stage=None):
+        return "{}:{}".format(category, stage or "")
+
+    def lock(self, category, stage=None):
+        """
+        Locks the leaderboard of the category (and stage) until the end
+        of the transaction, so its ranks are moved by one writer at a
+        time.
+        """
+        key = self.board_key(category, stage)
+        board = self.select_for_update().filter(key=key).first()
+        if board is None:
+            self.get_or_create(key=key)
+            board = self.select_for_update().get(key=key)
+        return board
+
+    def lock_category(self, category):
+        return list(self.select_for_update().filter(
+            key__startswith=self.board_key(category)))
+
+
+@python_2_unicode_compatible
+class ResultBoard(models.Model):
+    """Lock row of a leaderboard of the rank index."""
+    key = models.CharField(max_length=100, unique=True)
+
+    objects = ResultBoardManager()
+
+    def __str__(self):
+        return self.key
+
+
+class ResultRankManager(models.Manager):
+    def board(self, category, stage=None):
+        return self.filter(category=category, stage=stage)
+
+    def top(self, category, stage=None, count=5):
+        """The first `count` entries of the leaderboard, ranked."""
+        return number(None, list(self.board(category, stage).select_related(
+            "project")[:count]), 1)
+
+    def rank_of(self, category, project, stage=None):
+        """The ranked entry of the project, None if it is not ranked."""
+        board = self.board(category, stage)
+        entry = board.filter(project=project).first()
+        if entry is not None:
+            number(board, [entry])
+        return entry
+
+    def around(self, category, project, count=2, stage=None):
+        """The entry of the project and `count` entries on both sides."""
+        board = self.board(category, stage).select_related("project")
+        entry = board.filter(project=project).first()
+        if entry is None:
+            return []
+        before = list(board.filter(sort_key__lt=entry.sort_key).order_by(
+            "-sort_key")[:count])[::-1]
+        after = list(board.filter(sort_key__gt=entry.sort_key)[:count])
+        return number(board, before + [entry] + after)
+
+    def update_project(self, category, project, stage=None):
+        """
+        Moves the project to the place of its best result. Only its own
+        entry is written, the ranks are counted when they are read.
+        """
+        model = RESULT_MODELS[category]
+        filters = dict(project=project, is_best=True)
+        if stage is not None:
+            filters["stage"] = stage
+
+        board = self.board(category, stage)
+        with transaction.atomic(savepoint=False):
+            ResultBoard.objects.lock(category, stage)
+            key, result = min(
+                [(sort_key(model._meta.ordering, result), result)
+                 for result in model.objects.filter(**filters)] or
+                [(None, None)], key=lambda entry: entry[0])
+            entry = board.select_for_update().filter(project=project).first()
+            if key is None:
+                if entry is not None:
+                    entry.delete()
+                return None
+            if entry is None:
+                entry = self.model(
+                    category=category, stage_id=stage, project_id=project)
+            entry.result_id = result.pk
+            entry.score = result.score
+            entry.disqualification = result.disqualification
+            entry.sort_key = key
+            entry.save()
+        return entry
+
+    @transaction.atomic
+    def rebuild(self, category):
+        ResultBoard.objects.lock_category(category)
+        return build_ranks(self.model, RESULT_MODELS[category], category)
+
+
+@python_2_unicode_compatible
+class ResultRank(models.Model):
+    """
+    Best result of every project on the leaderboard of a category (and
+    stage for line follower) with its sort key, so the rank of a project
+    is counted from an index instead of sorting the whole leaderboard,
+    and a result only writes the entry of its own project.
+    """
+    category = models.CharField(
+        verbose_name=_("Category"), max_length=30,
+        choices=settings.ALL_CATEGORIES)
+    stage = models.ForeignKey(
+        LineFollowerStage, verbose_name=_("Line Follower Stage"), null=True,
+        blank=True)
+    project = models.ForeignKey(Project, verbose_name=_("Project"))
+    result_id = models.PositiveIntegerField(verbose_name=_("Result"))
+    score = models.FloatField(verbose_name=_("Score"))
+    disqualification = models.BooleanField(
+        verbose_name=_("Disqualification"), default=False)
+    sort_key = models.CharField(max_length=100)
+
+    objects = ResultRankManager()
+
+    class Meta:
+        verbose_name = _("Result Rank")
+        verbose_name_plural = _("Result Ranks")
+        ordering = ["sort_key"]
+        unique_together = (("category", "stage", "project"),)
+        index_together = (("category", "stage", "sort_key"),)
+
+    def __str__(self):
+        return u"{}: {}".format(self.category, self.project)
+
+
+@receiver(models.signals.pre_save)
+def result_calculate_score(sender, instance, *args, **kwargs):
+    rule = SCORING_RULES.get(RESULT_CATEGORY_LOOKUP.get(sender))
+    if rule is not None:
+        instance.score = rule.score(instance)
+
+
+@receiver(models.signals.post_save)
+def result_event_save(sender, instance, created, *args, **kwargs):
+    if sender in RESULT_CATEGORY_LOOKUP:
+        ResultEvent.objects.create(
+            category=RESULT_CATEGORY_LOOKUP[sender], result_id=instance.pk,
+            action=ResultEvent.CREATE if created else ResultEvent.UPDATE,
+            data=ResultEvent.serialize(instance))
+
+
+@receiver(models.signals.post_delete)
+def result_event_delete(sender, instance, *args, **kwargs):
+    if sender in RESULT_CATEGORY_LOOKUP:
+        ResultEvent.objects.create(
+            category=RESULT_CATEGORY_LOOKUP[sender], result_id=instance.pk,
+            action=ResultEvent.DELETE)
+
+
+@receiver([models.signals.post_save, models.signals.post_delete])
+def result_update_rank(sender, instance, raw=False, *args, **kwargs):
+    if sender in RESULT_CATEGORY_LOOKUP and not raw:
+        ResultRank.objects.update_project(
+            RESULT_CATEGORY_LOOKUP[sender], instance.project_id,
+            getattr(instance, "stage_id", None))
+
+
+def summary_filters(result_model):
+    """Line follower summaries show the attempts of the current stage."""
+    if not "stage" in [field.name for field in result_model._meta.fields]:
+        return {}
+    return dict(stage=LineFollowerStage.objects.filter(
+        is_current=True).values_list("pk", flat=True).first())
+
+
+def refresh_summaries(category, create=True):
+    """Rebuilds the result fields of the summaries of the category."""
+    model = RESULT_MODELS[category]
+    return refresh_results(
+        model, category, create, **summary_filters(model))
+
+
+def current_rank(category, project):
+    """Rank of the project on the leaderboard the dashboard shows."""
+    stage = summary_filters(RESULT_MODELS[category]).get("stage")
+    entry = ResultRank.objects.rank_of(category, project, stage)
+    return entry.rank if entry is not None else None
+
+
+def refresh_stale_summaries(projects):
+    """
+    Counts the attempts of the stale summaries of the projects again.
+    The flag is cleared first, so a result written meanwhile marks the
+    summary stale again instead of being lost.
+    """
+    stale = ProjectSummary.objects.filter(project__in=projects, is_stale=True)
+    for project, category in stale.values_list("pk", "project__category"):
+        model = RESULT_MODELS.get(category)
+        ProjectSummary.objects.filter(pk=project).update(is_stale=False)
+        if model is not None:
+            refresh_project(model, project, create=False,
+                            existing=set([project]), **summary_filters(model))
+
+
+@receiver([models.signals.post_save, models.signals.post_delete])
+def result_mark_summary(sender, instance, raw=False, *args, **kwargs):
+    """
+    Marks the summary of the project of the result stale, so the referee
+    request does not count the attempts of the project again.
+    """
+    if sender in RESULT_CATEGORY_LOOKUP and not raw:
+        if getattr(instance, "stage_id", None) != summary_filters(
+                sender).get("stage"):
+            return
+        mark_stale(instance.project_id, create="created" in kwargs)
+
+
+@receiver(models.signals.post_save, sender=LineFollowerStage)
+def stage_refresh_summaries(sender, instance, raw=False, *args, **kwargs):
+    if instance.is_current and not raw:
+        refresh_summaries("line_follower")
@@ -0,0 +1,98 @@
+KEY_OFFSET = 10 ** 12
+KEY_WIDTH = 13
+
+
+def encode(value, descending=False):
+    """Fixed width string of a value which sorts like the value."""
+    if isinstance(value, float):
+        value = int(round(value * 1000))
+    value = int(value) + KEY_OFFSET
+    if descending:
+        value = 10 ** KEY_WIDTH - 1 - value
+    return "%0*d" % (KEY_WIDTH, value)
+
+
+def sort_key(ordering, result):
+    """
+    Sortable string of a result in leaderboard order. The project is
+    the last part of the key, so equal results have a stable order.
+    """
+    parts = [encode(getattr(result, name.lstrip("-")), name.startswith("-"))
+             for name in ordering]
+    parts.append(encode(result.project_id))
+    return ".".join(parts)
+
+
+def build_ranks(rank_model, result_model, category):
+    """
+    Rebuilds the rank index of a category from the best result of every
+    project (per stage for line follower). Returns the number of ranked
+    projects.
+    """
+    ordering = result_model._meta.ordering
+    best = {}
+    for result in result_model.objects.filter(is_best=True).iterator():
+        key = (result.project_id, getattr(result, "stage_id", None))
+        entry = (sort_key(ordering, result), result)
+        if not key in best or entry[0] < best[key][0]:
+            best[key] = entry
+
+    ranks = [rank_model(
+        category=category, stage_id=getattr(result, "stage_id", None),
+        project_id=result.project_id, result_id=result.pk,
+        score=result.score, disqualification=result.disqualification,
+        sort_key=key) for key, result in best.values()]
+    rank_model.objects.filter(category=category).delete()
+    rank_model.objects.bulk_create(ranks)
+    return len(ranks)
+
+
+def number(board, entries, first=None):
+    """
+    Sets the rank of consecutive entries of a board. The rank of the
+    first one is counted from the sort key index unless it is given, so
+    ranks are never stored and a result never moves other rows.
+    """
+    if entries and first is None:
+        first = board.filter(sort_key__lt=entries[0].sort_key).count() + 1
+    for rank, entry in enumerate(entries, start=first or 1):
+        entry.rank = rank
+    return entries
+
+
+def keyset_page(board, size, after=None, before=None, start=None):
+    """
+    A page of rank entries in leaderboard order, after or before a sort
+    key cursor or from a start key on. Reads one extra row to know if
+    there is more, so the cost of a page does not depend on its place.
+    Returns the ranked entries with the previous and next page cursors,
+    None at either end of the board.
+    """
+    if before is not None:
+        entries = list(board.filter(
+            sort_key__lt=before).order_by("-sort_key")[:size + 1])
+        has_previous = len(entries) > size
+        entries = entries[:size][::-1]
+        has_next = True
+    else:
+        page = board
+        if after is not None:
+            page = board.filter(sort_key__gt=after)
+        elif start is not None:
+            page = board.filter(sort_key__gte=start)
+        entries = list(page.order_by("sort_key")[:size + 1])
+        has_next = len(entries) > size
+        entries = entries[:size]
+        has_previous = after is not None or start is not None
+    if not entries:
+        return entries, None, None
+    number(board, entries, None if has_previous else 1)
+    return (entries, entries[0].sort_key if has_previous else None,
+            entries[-1].sort_key if has_next else None)
+
+
+def window_start(board, entry, size):
+    """Start key of the page which shows the entry in its middle."""
+    keys = list(board.filter(sort_key__lt=entry.sort_key).order_by(
+        "-sort_key").values_list("sort_key", flat=True)[:size // 2])
+    return keys[-1] if keys else None
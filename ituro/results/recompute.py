@@ -0,0 +1,144 @@
+import json
+from django.db import connection, transaction
+from results.models import RESULT_MODELS, ResultEvent, ResultRank, \
+    log_updates, refresh_summaries
+from results.scoring import SCORING_RULES, DURATION_FIELDS, row_duration
+
+
+UPDATE_BATCH_SIZE = 300
+
+
+def replay(category):
+    """
+    Folds the event log of the category into the latest field values of
+    every result which is not deleted, keyed by result id.
+    """
+    states = {}
+    events = ResultEvent.objects.filter(category=category).values_list(
+        "result_id", "action", "data")
+    for result_id, action, data in events.iterator():
+        if action == ResultEvent.DELETE:
+            states.pop(result_id, None)
+        else:
+            states[result_id] = data
+    return dict(
+        (result_id, json.loads(data)) for result_id, data in states.items())
+
+
+def stale_results(category, model, states=None):
+    """
+    Ids of the results whose latest logged values differ from the row,
+    because the row was written around the ORM (raw SQL, a restored
+    dump). Results older than the event log are not counted.
+    """
+    rule = SCORING_RULES.get(category)
+    fields = rule.fields if rule is not None else ("score",)
+    if states is None:
+        states = replay(category)
+    return sorted(
+        row["pk"] for row in model.objects.values("pk", *fields).iterator()
+        if row["pk"] in states and any(
+            states[row["pk"]].get(name) != row[name] for name in fields))
+
+
+def ranking(model):
+    """
+    Rank of every project (per stage for line follower) according to the
+    leaderboard ordering of the model.
+    """
+    keys = ["project"]
+    if "stage" in [field.name for field in model._meta.fields]:
+        keys.append("stage")
+    ranks = {}
+    for key in model.objects.filter(is_best=True).values_list(*keys):
+        if not key in ranks:
+            ranks[key] = len(ranks) + 1
+    return ranks
+
+
+def bulk_update_scores(model, scores):
+    """
+    Writes {pk: score} with one UPDATE ... CASE statement per batch
+    instead of one query per row, bumping the version of every row and
+    appending the new values to the result log.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    pk = quote(model._meta.pk.column)
+    items = list(scores.items())
+    cursor = connection.cursor()
+    for start in range(0, len(items), UPDATE_BATCH_SIZE):
+        batch = items[start:start + UPDATE_BATCH_SIZE]
+        params = []
+        for result_id, score in batch:
+            params.extend([result_id, score])
+        params.extend(result_id for result_id, score in batch)
+        cursor.execute(
+            "UPDATE {table} SET {score} = CASE {pk} {whens} END, "
+            "{version} = {version} + 1 WHERE {pk} IN ({ids})".format(
+                table=table, pk=pk, score=quote("score"),
+                version=quote("version"),
+                whens=" ".join(["WHEN %s THEN %s"] * len(batch)),
+                ids=", ".join(["%s"] * len(batch))), params)
+    log_updates(model, scores)
+
+
+def recompute_scores(category, dry_run=False):
+    """
+    Replays the event log of the category, recalculates every score with
+    the current formulas and bulk updates the changed ones. Results
+    older than the event log are read from the table. Returns the
+    updated row count, the ranking changes as (key, old rank, new rank)
+    tuples and the ids of the results whose row differs from the log.
+    """
+    model = RESULT_MODELS[category]
+    rule = SCORING_RULES.get(category)
+    with transaction.atomic():
+        states = replay(category)
+        changed = {}
+        if rule is not None:
+            rows = model.objects.values("pk", "score", *rule.fields)
+            for row in rows.order_by().iterator():
+                score = rule(states.get(row["pk"], row))
+                if score != row["score"]:
+                    changed[row["pk"]] = score
+        stale = stale_results(category, model, states)
+
+        before = ranking(model)
+        bulk_update_scores(model, changed)
+        after = ranking(model)
+        if dry_run:
+            transaction.set_rollback(True)
+        else:
+            ResultRank.objects.rebuild(category)
+            refresh_summaries(category)
+
+    diff = sorted(
+        (key, before.get(key), rank) for key, rank in after.items()
+        if before.get(key) != rank)
+    return len(changed), diff, stale
+
+
+def rerank(category, rule=None, **filters):
+    """
+    Ranks the projects of the category by their best result as if the
+    scores were calculated with the given rule, without saving anything.
+    Rows are scored in one batch straight from values(), so alternative
+    rules can be compared over the whole category. Returns
+    (project id, score) pairs, the best first.
+    """
+    model = RESULT_MODELS[category]
+    rule = rule or SCORING_RULES[category]
+    descending = "-score" in model._meta.ordering
+    fields = set(rule.fields) | set(DURATION_FIELDS)
+    rows = list(model.objects.filter(**filters).values(
+        "project", "disqualification", *fields).order_by())
+
+    best = {}
+    for row, score in zip(rows, rule.score_rows(rows)):
+        key = (row["disqualification"], -score if descending else score,
+               row_duration(row))
+        if not row["project"] in best or key < best[row["project"]][0]:
+            best[row["project"]] = (key, score)
+    return [(project, score) for project, (key, score) in sorted(
+        best.items(), key=lambda item: item[1][0])]
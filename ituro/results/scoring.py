@@ -0,0 +1,126 @@
+SCORING_RULES = {}
+
+DURATION_FIELDS = ("minutes", "seconds", "milliseconds")
+
+
+class ScoringRule(object):
+    """
+    Score formula of a category. The formula reads the given fields from
+    a mapping, so the same rule scores a result being saved as well as
+    plain values() rows of a whole category.
+    """
+
+    def __init__(self, category, fields, formula):
+        self.category = category
+        self.fields = tuple(fields)
+        self.formula = formula
+
+    def __call__(self, row):
+        return self.formula(row)
+
+    def score(self, instance):
+        return self.formula(dict(
+            (name, getattr(instance, name)) for name in self.fields))
+
+    def score_rows(self, rows):
+        return [self.formula(row) for row in rows]
+
+    def score_queryset(self, queryset):
+        """Scores every result of the queryset as {pk: score}."""
+        rows = queryset.values("pk", *self.fields).order_by()
+        return dict((row["pk"], self.formula(row)) for row in rows.iterator())
+
+
+def register(category, fields):
+    def decorator(formula):
+        SCORING_RULES[category] = ScoringRule(category, fields, formula)
+        return formula
+    return decorator
+
+
+def duration(minutes, seconds, milliseconds):
+    return minutes * 60 + seconds + milliseconds * 0.01
+
+
+def to_milliseconds(minutes, seconds, milliseconds):
+    # the milliseconds input is entered in hundredths of a second
+    return (minutes * 60 + seconds) * 1000 + milliseconds * 10
+
+
+def row_duration(row):
+    return duration(row["minutes"], row["seconds"], row["milliseconds"])
+
+
+def basket_points(count):
+    # 6 + 5 + ... for every ball in the same basket
+    return count * (13 - count) // 2
+
+
+@register("line_follower", DURATION_FIELDS + ("runway_out",))
+def line_follower_score(row):
+    return row_duration(row) * (1 + 0.2 * row["runway_out"])
+
+
+@register("fire_fighter", DURATION_FIELDS + (
+    "extinguish_success", "extinguish_failure", "wall_hit",
+    "interfering_robot", "touching_candles", "pre_extinguish",
+    "is_complete"))
+def fire_fighter_score(row):
+    return sum((
+        row["extinguish_success"] * 150,
+        row["extinguish_failure"] * 50,
+        row["wall_hit"] * (-10),
+        row["touching_candles"] * (-100),
+        row["pre_extinguish"] * (-50),
+        row["interfering_robot"] * (-30),
+        int(row["is_complete"]) * ((300 - row_duration(row)) / 4)))
+
+
+@register("basketball", (
+    "basket1", "basket2", "basket3", "basket4", "basket5"))
+def basketball_score(row):
+    return sum((
+        basket_points(row["basket1"]),
+        basket_points(row["basket2"]),
+        basket_points(row["basket3"]),
+        basket_points(row["basket4"]),
+        basket_points(row["basket5"]))) * 10
+
+
+@register("stair_climbing", DURATION_FIELDS + (
+    "stair1", "stair2", "stair3", "stair4", "stair5", "stair6", "stair7",
+    "down6", "down5", "down4", "down3", "down2", "down1", "is_complete"))
+def stair_climbing_score(row):
+    return sum((
+        (int(row["stair1"]) + int(row["stair2"]) + int(row["stair3"])) * 10,
+        int(row["stair4"]) * 40,
+        int(row["stair5"]) * 80,
+        int(row["stair6"]) * 100,
+        int(row["stair7"]) * 120,
+        (int(row["down6"]) + int(row["down5"]) + int(row["down4"])) * 20,
+        (int(row["down1"]) + int(row["down2"]) + int(row["down3"])) * 10,
+        int(row["is_complete"]) * 40,
+        row_duration(row) * (-5)))
+
+
+@register("maze", DURATION_FIELDS)
+def maze_score(row):
+    return row_duration(row)
+
+
+@register("color_selecting", ("obtain", "place_success", "place_failure"))
+def color_selecting_score(row):
+    return sum((
+        row["obtain"] * 100,
+        row["place_success"] * 200,
+        row["place_failure"] * (-50)))
+
+
+@register("self_balancing", DURATION_FIELDS + (
+    "headway_amount", "stage3_minutes", "stage3_seconds",
+    "stage3_milliseconds"))
+def self_balancing_score(row):
+    return sum((
+        row_duration(row), row["headway_amount"] * 0.25,
+        duration(row["stage3_minutes"], row["stage3_seconds"],
+                 row["stage3_milliseconds"]) * 2))
@@ -1,14 +1,20 @@
 # -*- coding: utf-8 -*-
 
+import json
 from StringIO import StringIO
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.utils import timezone
+from django.core.urlresolvers import reverse
 from django.core.management import call_command
 from django.core.management.base import CommandError
 from results.models import InnovativeTotalResult, InnovativeJuryResult, \
-    InnovativeJury
+    InnovativeJury, MazeResult, ResultEvent, ColorSelectingResult, ResultRank
 from accounts.models import CustomUser, CustomUserManager
 from projects.models import Project
+from results.scoring import SCORING_RULES, ScoringRule, basket_points
+from results.recompute import rerank
 
 
 
@@ -318,3 +324,351 @@ class InnovativeJuryResultTestCase(TestCase):
         err = StringIO()
         call_command('addresults', stderr=err)
         self.assertEqual(err.getvalue(), "Total results could not be added. There are juries who didn't give a score.\n")
+
+
+class ResultExportTestCase(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        self.project = Project.objects.create(
+            manager=user,
+            category="maze",
+            name="Labirent",
+            is_confirmed=True
+            )
+
+    def test_export_category(self):
+        "Testing maze export with one row per attempt"
+
+        MazeResult.objects.create(
+            project=self.project, minutes=1, seconds=2, milliseconds=3)
+        MazeResult.objects.create(
+            project=self.project, minutes=0, seconds=50, milliseconds=0,
+            disqualification=True)
+
+        out = StringIO()
+        call_command('exportresults', 'maze', stdout=out)
+        lines = out.getvalue().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith("category,result,stage,project"))
+        self.assertTrue(lines[1].startswith("maze,"))
+        self.assertIn("Labirent,Alper Kesen,kesen.alper@gmail.com,ITU", lines[1])
+
+    def test_export_unknown_category(self):
+        "Testing export with a category without results"
+
+        with self.assertRaises(CommandError):
+            call_command('exportresults', 'micro_sumo', stdout=StringIO())
+
+
+class RecomputeScoresTestCase(TestCase):
+    def setUp(self):
+        user1 = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        user2 = CustomUser.objects.create(
+            email="alperkesen96@hotmail.com",
+            name="Ekrem Alper Kesen",
+            phone="05454760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        project1 = Project.objects.create(
+            manager=user1, category="maze", name="Labirent",
+            is_confirmed=True)
+        project2 = Project.objects.create(
+            manager=user2, category="maze", name="Minotor",
+            is_confirmed=True)
+        self.fast = MazeResult.objects.create(
+            project=project1, minutes=0, seconds=40, milliseconds=0)
+        self.slow = MazeResult.objects.create(
+            project=project2, minutes=1, seconds=0, milliseconds=0)
+        removed = MazeResult.objects.create(
+            project=project2, minutes=2, seconds=0, milliseconds=0)
+        removed.delete()
+
+    def test_result_events(self):
+        "Testing that every write is appended to the result log"
+
+        self.assertEqual(ResultEvent.objects.filter(
+            category="maze").count(), 4)
+        self.assertEqual(ResultEvent.objects.latest("pk").action,
+                         ResultEvent.DELETE)
+
+    def test_recompute_scores(self):
+        "Testing recompute with scores which are out of date"
+
+        MazeResult.objects.filter(pk=self.fast.pk).update(score=100)
+
+        out = StringIO()
+        call_command('recomputescores', 'maze', dry_run=True, stdout=out)
+        self.assertIn("1 scores would be updated.", out.getvalue())
+        self.assertEqual(MazeResult.objects.get(pk=self.fast.pk).score, 100)
+
+        out = StringIO()
+        call_command('recomputescores', 'maze', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[-1], "1 scores updated.")
+        self.assertIn("%d: 2 -> 1" % self.fast.project_id, lines)
+        self.assertEqual(MazeResult.objects.get(pk=self.fast.pk).score, 40)
+        self.assertEqual(MazeResult.objects.get(pk=self.slow.pk).score, 60)
+
+    def test_recompute_queryset_update(self):
+        "Testing recompute with a result updated by a queryset"
+
+        MazeResult.objects.filter(pk=self.slow.pk).update(minutes=0)
+        event = ResultEvent.objects.latest("pk")
+        self.assertEqual((event.result_id, event.action),
+                         (self.slow.pk, ResultEvent.UPDATE))
+        self.assertEqual(MazeResult.objects.get(pk=self.slow.pk).version, 1)
+
+        out = StringIO()
+        call_command('recomputescores', 'maze', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[-1], "1 scores updated.")
+        self.assertEqual(MazeResult.objects.get(pk=self.slow.pk).score, 0)
+
+        out = StringIO()
+        call_command('recomputescores', 'maze', stdout=out)
+        self.assertEqual(out.getvalue().splitlines(), ["0 scores updated."])
+
+    def test_recompute_without_log(self):
+        "Testing recompute with a result written around the log"
+
+        cursor = connection.cursor()
+        cursor.execute(
+            "UPDATE results_mazeresult SET minutes = 0 WHERE id = %s",
+            [self.slow.pk])
+
+        out = StringIO()
+        call_command('recomputescores', 'maze', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn("Result %d differs from its log." % self.slow.pk, lines)
+        self.assertEqual(lines[-1], "0 scores updated.")
+        self.assertEqual(MazeResult.objects.get(pk=self.slow.pk).score, 60)
+
+    def test_recompute_unknown_category(self):
+        "Testing recompute with a category without a score formula"
+
+        with self.assertRaises(CommandError):
+            call_command('recomputescores', 'innovative', stdout=StringIO())
+
+
+class ScoringRuleTestCase(TestCase):
+    def test_basket_points(self):
+        "Testing basket points against the summed ranges"
+
+        for count in range(10):
+            self.assertEqual(basket_points(count),
+                             sum(range(6, 6 - count, -1)))
+
+    def test_rule_modes(self):
+        "Testing that instance and row scoring agree"
+
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        project = Project.objects.create(
+            manager=user, category="maze", name="Labirent",
+            is_confirmed=True)
+        result = MazeResult.objects.create(
+            project=project, minutes=1, seconds=2, milliseconds=50)
+
+        rule = SCORING_RULES["maze"]
+        self.assertEqual(result.score, 62.5)
+        self.assertEqual(rule.score_queryset(MazeResult.objects.all()),
+                         {result.pk: 62.5})
+        self.assertEqual(rule.score_rows(
+            [{"minutes": 0, "seconds": 10, "milliseconds": 0}]), [10])
+
+    def test_rerank_with_alternative_rule(self):
+        "Testing what-if ranking without touching the scores"
+
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        careful = Project.objects.create(
+            manager=user, category="maze", name="Labirent",
+            is_confirmed=True)
+        hasty = Project.objects.create(
+            manager=user, category="maze", name="Minotor",
+            is_confirmed=True)
+        MazeResult.objects.create(
+            project=careful, minutes=1, seconds=0, milliseconds=0)
+        MazeResult.objects.create(
+            project=hasty, minutes=0, seconds=30, milliseconds=0,
+            disqualification=True)
+
+        self.assertEqual(rerank("maze"), [(careful.pk, 60), (hasty.pk, 30)])
+
+        lenient = ScoringRule("maze", ("seconds",), lambda row: row["seconds"])
+        self.assertEqual([project for project, score in rerank(
+            "maze", lenient, disqualification=False)], [careful.pk])
+
+
+class ResultDurationTestCase(TestCase):
+    def test_duration_ms(self):
+        "Testing duration column and tiebreak ordering"
+
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        project = Project.objects.create(
+            manager=user, category="color_selecting", name="Renkli",
+            is_confirmed=True)
+        slow = ColorSelectingResult.objects.create(
+            project=project, minutes=1, seconds=5, milliseconds=20,
+            obtain=1, place_success=1, place_failure=0)
+        fast = ColorSelectingResult.objects.create(
+            project=project, minutes=0, seconds=59, milliseconds=99,
+            obtain=1, place_success=1, place_failure=0)
+
+        self.assertEqual(slow.duration_ms, 65200)
+        self.assertEqual(fast.duration_ms, 59990)
+        self.assertEqual(slow.duration, 65.2)
+        self.assertEqual(list(ColorSelectingResult.objects.all()),
+                         [fast, slow])
+
+
+class ResultRankTestCase(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        self.projects = [Project.objects.create(
+            manager=user, category="maze", name="Labirent {}".format(number),
+            is_confirmed=True) for number in range(5)]
+        self.results = [MazeResult.objects.create(
+            project=project, minutes=1, seconds=10 * number, milliseconds=0)
+            for number, project in enumerate(self.projects)]
+
+    def board(self):
+        return [(entry.project_id, entry.rank) for entry in
+                ResultRank.objects.top("maze", count=len(self.projects))]
+
+    def expected(self, *order):
+        return [(self.projects[index].pk, rank)
+                for rank, index in enumerate(order, start=1)]
+
+    def test_incremental_ranks(self):
+        "Testing rank index updates on result writes"
+
+        self.assertEqual(self.board(), self.expected(0, 1, 2, 3, 4))
+
+        MazeResult.objects.create(
+            project=self.projects[3], minutes=0, seconds=50, milliseconds=0)
+        self.assertEqual(self.board(), self.expected(3, 0, 1, 2, 4))
+
+        result = self.results[0]
+        result.seconds = 45
+        result.save()
+        self.assertEqual(self.board(), self.expected(3, 1, 2, 4, 0))
+
+        result.is_best = False
+        result.save()
+        self.assertEqual(self.board(), self.expected(3, 1, 2, 4))
+
+        self.results[4].delete()
+        self.assertEqual(self.board(), self.expected(3, 1, 2))
+
+        ranks = self.board()
+        ResultRank.objects.rebuild("maze")
+        self.assertEqual(self.board(), ranks)
+
+    def test_rank_lookup(self):
+        "Testing rank of a project and its neighbours"
+
+        project = self.projects[2]
+        self.assertEqual(ResultRank.objects.rank_of("maze", project).rank, 3)
+        self.assertEqual(
+            [entry.rank for entry in ResultRank.objects.around(
+                "maze", project, 1)], [2, 3, 4])
+
+        response = self.client.get(reverse("result_rank", args=["maze"]), {
+            "project": project.pk, "around": 1})
+        data = json.loads(response.content)
+        self.assertEqual(data["rank"], 3)
+        self.assertEqual([row["name"] for row in data["results"]], [
+            "Labirent 1", "Labirent 2", "Labirent 3"])
+
+        response = self.client.get(reverse("result_rank", args=["maze"]), {
+            "project": 0})
+        self.assertEqual(len(json.loads(response.content)["results"]), 5)
+
+    @override_settings(RESULT_PAGE_SIZE=2)
+    def test_keyset_pages(self):
+        "Testing result list pages cut by sort key cursors"
+
+        url = reverse("result_list", args=["maze"])
+        response = self.client.get(url)
+        first = response.context["object_list"]
+        self.assertEqual([entry.rank for entry in first], [1, 2])
+        self.assertIsNone(response.context["previous_cursor"])
+
+        after = response.context["next_cursor"]
+        MazeResult.objects.create(
+            project=self.projects[4], minutes=0, seconds=10, milliseconds=0)
+        response = self.client.get(url, {"after": after})
+        self.assertEqual(
+            [entry.project for entry in response.context["object_list"]],
+            self.projects[2:4])
+
+        response = self.client.get(
+            url, {"before": response.context["previous_cursor"]})
+        self.assertEqual(
+            [entry.project for entry in response.context["object_list"]],
+            [self.projects[0], self.projects[1]])
+
+        response = self.client.get(url, {"project": self.projects[3].pk})
+        self.assertEqual(
+            [entry.rank for entry in response.context["object_list"]], [4, 5])
+        self.assertIsNone(response.context["next_cursor"])
+
+    @override_settings(RESULT_PAGE_SIZE=2)
+    def test_find_my_robot(self):
+        "Testing the robot of the user is offered only when it is ranked"
+
+        user = CustomUser.objects.create_user(
+            email="ilker@example.com", password="ilker", name="Ilker",
+            phone="05424760273", school="ITU")
+        waiting, ranked = [Project.objects.create(
+            manager=user, category="maze", name=name, is_confirmed=True)
+            for name in ("Bekleyen", "Yarisan")]
+        MazeResult.objects.create(
+            project=ranked, minutes=3, seconds=0, milliseconds=0)
+        self.client.login(email="ilker@example.com", password="ilker")
+
+        url = reverse("result_list", args=["maze"])
+        response = self.client.get(url)
+        self.assertEqual(response.context["project_id"], ranked.pk)
+        response = self.client.get(url, {"project": waiting.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["project_id"], ranked.pk)
+        self.assertEqual(
+            [entry.rank for entry in response.context["object_list"]], [1, 2])
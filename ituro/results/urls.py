@@ -5,6 +5,11 @@ from results.views import *
 
 urlpatterns = patterns(
     '',
+    # Export
+    url(r'^export/$',
+        ResultExportView.as_view(),
+        name='result_export'),
+
     # Line Follower
     url(r'^line_follower/$',
         LineFollowerStageResultListView.as_view(),
@@ -38,6 +43,9 @@ urlpatterns = patterns(
         InnovativeResultView.as_view(),
         name='innovative_result'),
 
+    url(r'^(?P<slug>[-_\w]+)/ranks/$',
+        ResultRankView.as_view(),
+        name='result_rank'),
     url(r'^(?P<slug>[-_\w]+)/$',
         ResultListView.as_view(),
         name='result_list'),
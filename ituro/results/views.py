@@ -1,10 +1,12 @@
 from django.views.generic.list import ListView
 from django.views.generic.base import TemplateView
 from django.views.generic.detail import DetailView
+from django.views.generic.base import View
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect, JsonResponse, \
+    StreamingHttpResponse
 from django.core.urlresolvers import reverse, reverse_lazy
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
@@ -12,8 +14,12 @@ from orders.models import LineFollowerStage
 from results.models import LineFollowerResult, FireFighterResult, \
     BasketballResult, StairClimbingResult, MazeResult, ColorSelectingResult, \
     SelfBalancingResult, ScenarioResult, InnovativeJuryResult, InnovativeJury, \
-    InnovativeTotalResult
+    InnovativeTotalResult, ResultRank, RESULT_MODELS
+from results.exports import iter_csv, export_categories
+from results.ranking import keyset_page, window_start
+from base.state import competition_state
 from sumo.models import *
+from sumo.overview import group_overview
 
 
 RESULTS_DICT = {
@@ -29,15 +35,67 @@ RESULTS_DICT = {
 }
 
 
-class ResultListView(ListView):
+class RankPageMixin(object):
+    """
+    Lists the rank index of a category page by page. Pages are cut with
+    the sort key of the first or last entry instead of an offset, so a
+    cursor keeps pointing at the same place while results come in.
+    `project` opens the page around a robot on the board, and the best
+    placed robot of the user is offered for it.
+    """
+    category = None
+
+    def get_stage(self):
+        return None
+
+    def get_queryset(self):
+        self.stage = self.get_stage()
+        board = ResultRank.objects.board(
+            self.category, self.stage).select_related("project")
+        size = getattr(settings, "RESULT_PAGE_SIZE", 50)
+        after = self.request.GET.get("after")
+        before = self.request.GET.get("before")
+        start = None
+
+        self.project_id = None
+        if self.request.user.is_authenticated():
+            self.project_id = board.filter(
+                project__manager=self.request.user).values_list(
+                    "project", flat=True).first()
+        if self.request.GET.get("project"):
+            try:
+                project = int(self.request.GET.get("project"))
+            except ValueError:
+                raise Http404
+            entry = ResultRank.objects.rank_of(
+                self.category, project, self.stage)
+            if entry is not None:
+                self.project_id = project
+                after = before = None
+                start = window_start(board, entry, size)
+
+        entries, self.previous_cursor, self.next_cursor = keyset_page(
+            board, size, after=after, before=before, start=start)
+        return entries
+
+    def get_context_data(self, **kwargs):
+        context = super(RankPageMixin, self).get_context_data(**kwargs)
+        context['previous_cursor'] = self.previous_cursor
+        context['next_cursor'] = self.next_cursor
+        context['project_id'] = self.project_id
+        return context
+
+
+class ResultListView(RankPageMixin, ListView):
     template_name = 'results/result_list.html'
 
     def dispatch(self, *args, **kwargs):
         category = self.kwargs.get('slug')
         if not category in dict(settings.ALL_CATEGORIES).keys():
             raise Http404
-        if not settings.PROJECT_RESULTS or \
-           not category in dict(settings.RESULT_CATEGORIES).keys():
+        state = competition_state()
+        if not state.PROJECT_RESULTS or \
+           not category in dict(state.RESULT_CATEGORIES).keys():
             raise PermissionDenied
         if category == 'line_follower':
             return HttpResponseRedirect(
@@ -47,12 +105,9 @@ class ResultListView(ListView):
         elif category == 'innovative':
             return HttpResponseRedirect(reverse('innovative_referee'))
 
+        self.category = category
         return super(ResultListView, self).dispatch(*args, **kwargs)
 
-    def get_queryset(self):
-        result_model = RESULTS_DICT[self.kwargs.get('slug')]
-        return result_model.objects.filter(is_best=True)
-
     def get_context_data(self, **kwargs):
         context = super(ResultListView, self).get_context_data(**kwargs)
         context['category'] = dict(
@@ -61,14 +116,92 @@ class ResultListView(ListView):
         return context
 
 
+class ResultRankView(View):
+    """
+    Rank of a project and the projects around it as JSON, or the top of
+    the leaderboard when no project is given. Line follower ranks are
+    per stage, given with the stage order.
+    """
+    def dispatch(self, *args, **kwargs):
+        category = self.kwargs.get('slug')
+        if not category in RESULT_MODELS:
+            raise Http404
+        state = competition_state()
+        if not state.PROJECT_RESULTS or \
+           not category in dict(state.RESULT_CATEGORIES).keys():
+            raise PermissionDenied
+        return super(ResultRankView, self).dispatch(*args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        category = self.kwargs.get('slug')
+        try:
+            count = max(min(int(request.GET.get("around", 2)),
+                            getattr(settings, "RESULT_RANK_WINDOW", 10)), 0)
+            project = int(request.GET.get("project") or 0) or None
+            stage = None
+            if category == "line_follower":
+                stage = LineFollowerStage.objects.get(
+                    order=int(request.GET.get("stage")),
+                    results_available=True)
+        except (TypeError, ValueError, LineFollowerStage.DoesNotExist):
+            raise Http404
+
+        entry = None
+        if project is None:
+            entries = ResultRank.objects.top(category, stage, count * 2 + 1)
+        else:
+            entries = ResultRank.objects.around(
+                category, project, count, stage)
+            entry = next((rank for rank in entries
+                          if rank.project_id == project), None)
+            if entry is None:
+                raise Http404
+
+        return JsonResponse({
+            "category": category,
+            "stage": stage and stage.order,
+            "rank": entry and entry.rank,
+            "results": [self.serialize(rank) for rank in entries],
+        })
+
+    def serialize(self, entry):
+        return {
+            "rank": entry.rank,
+            "project": entry.project_id,
+            "name": entry.project.name,
+            "score": None if entry.disqualification else entry.score,
+        }
+
+
+class ResultExportView(View):
+    @method_decorator(login_required)
+    def dispatch(self, *args, **kwargs):
+        if not self.request.user.is_staff:
+            raise PermissionDenied
+        return super(ResultExportView, self).dispatch(*args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        category = request.GET.get("category") or None
+        if category is not None and not category in RESULTS_DICT:
+            raise Http404
+
+        response = StreamingHttpResponse(
+            iter_csv(export_categories(RESULTS_DICT, category)),
+            content_type="text/csv")
+        response["Content-Disposition"] = \
+            'attachment; filename="{}_results.csv"'.format(category or "all")
+        return response
+
+
 class LineFollowerStageResultListView(ListView):
     model = LineFollowerStage
     template_name = 'results/line_follower_stage_list.html'
 
     def dispatch(self, *args, **kwargs):
-        if not settings.PROJECT_ORDERS or \
-           not "line_follower" in dict(settings.RESULT_CATEGORIES).keys() or \
-           not LineFollowerStage.objects.filter(results_available=True).exists():
+        state = competition_state()
+        if not state.PROJECT_ORDERS or \
+           not "line_follower" in dict(state.RESULT_CATEGORIES).keys() or \
+           not state.RESULT_STAGES:
             raise PermissionDenied
         return super(LineFollowerStageResultListView, self).dispatch(
             *args, **kwargs)
@@ -77,43 +210,44 @@ class LineFollowerStageResultListView(ListView):
         return LineFollowerStage.objects.filter(results_available=True)
 
 
-class LineFollowerResultListView(ListView):
+class LineFollowerResultListView(RankPageMixin, ListView):
     model = LineFollowerResult
     template_name = 'results/result_list.html'
+    category = "line_follower"
 
     def dispatch(self, *args, **kwargs):
-        order = self.kwargs.get("order")
-        if not LineFollowerStage.objects.filter(
-                order=order, results_available=True).exists():
-            return PermissionDenied
+        order = int(self.kwargs.get("order"))
+        if not order in competition_state().RESULT_STAGES:
+            raise PermissionDenied
         return super(LineFollowerResultListView, self).dispatch(*args, **kwargs)
 
+    def get_stage(self):
+        return LineFollowerStage.objects.filter(
+            order=self.kwargs.get("order"))[0]
+
     def get_context_data(self, **kwargs):
         context = super(LineFollowerResultListView, self).get_context_data(
             **kwargs)
         context['category'] = dict(settings.ALL_CATEGORIES)["line_follower"]
-        context['stage'] = LineFollowerStage.objects.filter(
-            order=self.kwargs.get("order"))[0]
+        context['stage'] = self.stage
         return context
 
-    def get_queryset(self):
-        return LineFollowerResult.objects.filter(
-            stage__order=self.kwargs.get("order"))
-
 
 class SumoResultHomeView(TemplateView):
     template_name = "results/sumo_home.html"
 
     def dispatch(self, *args, **kwargs):
-        if not "micro_sumo" in dict(settings.RESULT_CATEGORIES).keys():
+        if not "micro_sumo" in dict(
+                competition_state().RESULT_CATEGORIES).keys():
             raise PermissionDenied
         return super(SumoResultHomeView, self).dispatch(*args, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super(SumoResultHomeView, self).get_context_data(**kwargs)
-        context["groups"] = settings.SUMO_GROUP_RESULTS
-        context["stages"] = settings.SUMO_STAGE_RESULTS
-        context["final"] = settings.SUMO_FINAL_RESULTS
+        state = competition_state()
+        context["groups"] = state.SUMO_GROUP_RESULTS
+        context["stages"] = state.SUMO_STAGE_RESULTS
+        context["final"] = state.SUMO_FINAL_RESULTS
         return context
 
 
@@ -122,12 +256,12 @@ class SumoResultGroupListView(ListView):
     template_name = 'results/sumo_group_list.html'
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_GROUP_RESULTS:
+        if not competition_state().SUMO_GROUP_RESULTS:
             raise PermissionDenied
         return super(SumoResultGroupListView, self).dispatch(*args, **kwargs)
 
     def get_queryset(self):
-        return SumoGroup.objects.filter(is_final=False)
+        return group_overview()
 
 
 class SumoResultGroupDetailView(DetailView):
@@ -135,16 +269,18 @@ class SumoResultGroupDetailView(DetailView):
     template_name = "results/sumo_group_detail.html"
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_GROUP_RESULTS:
+        if not competition_state().SUMO_GROUP_RESULTS:
             raise PermissionDenied
         return super(SumoResultGroupDetailView, self).dispatch(*args, **kwargs)
 
+    def get_queryset(self):
+        return group_overview()
+
     def get_context_data(self, **kwargs):
-        group = self.get_object()
         context = super(SumoResultGroupDetailView, self).get_context_data(
             **kwargs)
-        context["matches"] = SumoGroupMatch.objects.filter(group=group)
-        context["teams"] = SumoGroupTeam.objects.filter(group=group)
+        context["matches"] = self.object.matches
+        context["teams"] = self.object.teams
         return context
 
 
@@ -153,7 +289,7 @@ class SumoResultStageListView(ListView):
     template_name = "results/sumo_stage_list.html"
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_STAGE_RESULTS:
+        if not competition_state().SUMO_STAGE_RESULTS:
             raise PermissionDenied
         return super(SumoResultStageListView, self).dispatch(*args, **kwargs)
 
@@ -163,7 +299,7 @@ class SumoResultStageDetailView(ListView):
     template_name = "results/sumo_stage_detail.html"
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_STAGE_RESULTS:
+        if not competition_state().SUMO_STAGE_RESULTS:
             raise PermissionDenied
         return super(SumoResultStageDetailview, self).dispatch(*args, **kwargs)
 
@@ -175,7 +311,7 @@ class SumoResultFinalDetailView(TemplateView):
     template_name = "results/sumo_final.html"
 
     def dispatch(self, *args, **kwargs):
-        if not settings.SUMO_FINAL_RESULTS:
+        if not competition_state().SUMO_FINAL_RESULTS:
             raise PermissionDenied
         return super(SumoResultFinalDetailView, self).dispatch(*args, **kwargs)
 
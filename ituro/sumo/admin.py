@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.utils.translation import ugettext_lazy as _
 from sumo.models import *
+from sumo.standings import forfeit_absent
 
 
 class SumoGroupAdmin(admin.ModelAdmin):
@@ -8,7 +10,9 @@ class SumoGroupAdmin(admin.ModelAdmin):
 
 class SumoGroupMatchAdmin(admin.ModelAdmin):
     list_display = (
-        "order", "home", "home_score", "away", "away_score", "group")
+        "order", "home", "home_score", "away", "away_score", "group",
+        "slot", "ring", "is_forfeit")
+    list_select_related = ("home", "away", "group")
 
 
 class SumoStageAdmin(admin.ModelAdmin):
@@ -17,11 +21,21 @@ class SumoStageAdmin(admin.ModelAdmin):
 
 class SumoStageMatchAdmin(admin.ModelAdmin):
     list_display = ("home", "home_score", "away", "away_score", "stage")
+    list_select_related = ("home", "away", "stage")
 
 
 class SumoGroupTeamAdmin(admin.ModelAdmin):
     list_display = (
-        "group", "robot", "point", "order", "average", "is_attended")
+        "group", "robot", "point", "average", "order", "rank", "is_attended")
+    list_select_related = ("group", "robot")
+    actions = ["mark_absent"]
+
+    def mark_absent(self, request, queryset):
+        count = forfeit_absent(queryset)
+        self.message_user(request, _(
+            "{} matches are forfeited.").format(count))
+    mark_absent.short_description = _(
+        "Mark as absent and forfeit their matches")
 
 
 admin.site.register(SumoGroup, SumoGroupAdmin)
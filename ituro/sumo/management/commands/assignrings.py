@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from optparse import make_option
+from sumo.timetable import assign_rings
+
+
+class Command(BaseCommand):
+    args = '[ring count]'
+    help = 'Schedules unplayed micro sumo group matches on parallel rings.'
+    option_list = BaseCommand.option_list + (
+        make_option('--rest',
+                    type='int',
+                    dest='rest',
+                    default=None,
+                    help='Time slots a robot sits out between matches.'),
+    )
+
+    def handle(self, *args, **options):
+        try:
+            ring_count = int(args[0]) if args else None
+        except ValueError:
+            raise CommandError('Please specify a valid ring count.')
+        if ring_count is not None and ring_count < 1:
+            raise CommandError('Ring count must be positive.')
+
+        slot_count = assign_rings(ring_count, options['rest'])
+        self.stdout.write('Group matches scheduled in {} slots.'.format(
+            slot_count))
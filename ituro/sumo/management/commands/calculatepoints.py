@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from optparse import make_option
 from sumo.models import *
+from sumo.standings import rank_group
 from random import shuffle
 
 
@@ -72,4 +73,6 @@ class Command(BaseCommand):
                     away.point += 3
                     away.average += match.away_score - match.home_score
                     away.save()
+        for group in SumoGroup.objects.all():
+            rank_group(group)
         self.stdout.write("Points calculated.")
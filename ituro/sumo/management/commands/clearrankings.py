@@ -7,4 +7,4 @@ class Command(BaseCommand):
     help = 'Fix rankings.'
 
     def handle(self, *args, **options):
-        SumoGroupTeam.objects.all().update(order=0)
+        SumoGroupTeam.objects.all().update(order=0, rank=0)
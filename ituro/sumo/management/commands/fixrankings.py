@@ -1,5 +1,9 @@
 from django.core.management.base import BaseCommand, CommandError
 from sumo.models import SumoGroupMatch, SumoGroupTeam, SumoGroup
+from sumo.standings import rank_group
+
+
+STANDING_ORDERING = SumoGroupTeam.STANDING_ORDERING
 
 
 class Command(BaseCommand):
@@ -8,7 +12,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         for group in SumoGroup.objects.all():
-            query = SumoGroupTeam.objects.filter(group=group)
+            query = SumoGroupTeam.objects.filter(group=group).order_by(*STANDING_ORDERING)
             order = 0
             for i in range(0, len(query)):
                 if query[i].order == 0:
@@ -24,7 +28,7 @@ class Command(BaseCommand):
                             rival = rivals.first()
                             context = check_double_average(query[i], rival, order)
                             order = context["order"]
-                            query = SumoGroupTeam.objects.filter(group=group)
+                            query = SumoGroupTeam.objects.filter(group=group).order_by(*STANDING_ORDERING)
                         elif rival_count == 2:
                             print "Triple average occured in group {}".format(group)
                         elif rival_count == 3:
@@ -34,9 +38,9 @@ class Command(BaseCommand):
                         robot = query[i]
                         robot.order = order
                         robot.save()
-                        query = SumoGroupTeam.objects.filter(group=group)
+                        query = SumoGroupTeam.objects.filter(group=group).order_by(*STANDING_ORDERING)
         for group in SumoGroup.objects.all():
-            for robot in SumoGroupTeam.objects.filter(group=group):
+            for robot in rank_group(group):
                 print "{} {} {} {}".format(robot.order,robot.robot,robot.point,
                                         robot.average)
 
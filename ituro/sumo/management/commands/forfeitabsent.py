@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand, CommandError
+from sumo.models import SumoGroupTeam
+from sumo.standings import forfeit_absent
+
+
+class Command(BaseCommand):
+    help = 'Forfeits unplayed group matches of robots which did not attend.'
+
+    def handle(self, *args, **options):
+        count = forfeit_absent(SumoGroupTeam.objects.filter(is_attended=False))
+        self.stdout.write("{} matches are forfeited.".format(count))
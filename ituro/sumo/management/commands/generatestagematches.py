@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
 from sumo.models import SumoStageMatch, SumoGroupTeam, SumoGroup, SumoStage
+from sumo.qualification import qualified_teams, seed_pairs
+from sumo.standings import create_stage
 from random import shuffle, randint
 
 
@@ -20,22 +22,10 @@ class Command(BaseCommand):
         if count > 4:
             raise CommandError("Finals")
         if stage_number == 1:
-            stage = SumoStage.objects.create(order=stage_number)
-            robots = list()
-            orders = [1, 2]
-            for group in SumoGroup.objects.all():
-                for order in orders:
-                    robot = SumoGroupTeam.objects.get(group=group, order=order)
-                    robots.append(robot)
-            for i in range(0,len(robots)/2):
-                if len(robots) == 2:
-                    robot1 = robots.pop()
-                    robot2 = robots.pop()
-                if i%2 == 0:
-                    robot1 = robots.pop(i)
-                    robot2 = robots.pop(i+3)
-                SumoStageMatch.objects.create(home=robot1.robot,away=robot2.robot,
-                                            stage=stage)
+            seeds = qualified_teams()
+            if len(seeds) < 2:
+                raise CommandError('Not enough qualified robots.')
+            create_stage(stage_number, seed_pairs(seeds))
         else:
             stage = SumoStage.objects.create(order=stage_number)
             previous_stage = SumoStage.objects.get(order=stage_number-1)
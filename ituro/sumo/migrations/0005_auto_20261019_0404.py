@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sumo', '0004_auto_20150410_0222'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sumogroupmatch',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='sumostagematch',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Version', editable=False),
+            preserve_default=True,
+        ),
+    ]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+def head_to_head(matches, robot, rival):
+    robot_score = rival_score = 0
+    for match in matches:
+        if match.home_id == robot and match.away_id == rival:
+            robot_score += match.home_score
+            rival_score += match.away_score
+        elif match.home_id == rival and match.away_id == robot:
+            robot_score += match.away_score
+            rival_score += match.home_score
+    return robot_score, rival_score
+
+
+def fill_ranks(apps, schema_editor):
+    # a copy of sumo.standings.rank_teams as of this migration: point,
+    # average, the match between two tied teams, then the manual order
+    # with unset orders last
+    SumoGroup = apps.get_model("sumo", "SumoGroup")
+    SumoGroupTeam = apps.get_model("sumo", "SumoGroupTeam")
+    SumoGroupMatch = apps.get_model("sumo", "SumoGroupMatch")
+    for group in SumoGroup.objects.all():
+        teams = list(SumoGroupTeam.objects.filter(group=group))
+        matches = list(SumoGroupMatch.objects.filter(group=group))
+        teams = sorted(teams, key=lambda team: (
+            -team.point, -team.average, team.order or len(teams)))
+        for index in range(len(teams) - 1):
+            team, rival = teams[index], teams[index + 1]
+            tied = [other for other in teams if (other.point, other.average)
+                    == (team.point, team.average)]
+            if len(tied) != 2 or rival not in tied:
+                continue
+            team_score, rival_score = head_to_head(
+                matches, team.robot_id, rival.robot_id)
+            if rival_score > team_score:
+                teams[index], teams[index + 1] = rival, team
+        for rank, team in enumerate(teams, start=1):
+            SumoGroupTeam.objects.filter(pk=team.pk).update(rank=rank)
+
+
+def keep_ranks(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sumo', '0005_auto_20261019_0404'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='sumogroupteam',
+            options={'ordering': ['rank'], 'verbose_name': 'Sumo Group Team', 'verbose_name_plural': 'Sumo Group Teams'},
+        ),
+        migrations.AddField(
+            model_name='sumogroupteam',
+            name='rank',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Rank'),
+            preserve_default=True,
+        ),
+        migrations.AlterIndexTogether(
+            name='sumogroupteam',
+            index_together=set([('group', 'rank')]),
+        ),
+        migrations.RunPython(fill_ranks, keep_ranks),
+    ]
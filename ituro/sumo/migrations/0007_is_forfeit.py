@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sumo', '0006_sumogroupteam_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sumogroupmatch',
+            name='is_forfeit',
+            field=models.BooleanField(default=False, verbose_name='Forfeit?'),
+            preserve_default=True,
+        ),
+    ]
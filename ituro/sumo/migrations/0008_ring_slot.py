@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sumo', '0007_is_forfeit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sumogroupmatch',
+            name='ring',
+            field=models.PositiveSmallIntegerField(null=True, verbose_name='Ring', blank=True),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='sumogroupmatch',
+            name='slot',
+            field=models.PositiveSmallIntegerField(null=True, verbose_name='Time Slot', blank=True),
+            preserve_default=True,
+        ),
+        migrations.AlterIndexTogether(
+            name='sumogroupmatch',
+            index_together=set([('slot', 'ring')]),
+        ),
+    ]
@@ -1,13 +1,16 @@
 from django.db import models
+from django.db.models import Q
 from django.dispatch import receiver
 from django.utils.encoding import python_2_unicode_compatible
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
+from base.models import VersionedModel
 from projects.models import Project
+from projects.summary import update_summaries
 
 
 @python_2_unicode_compatible
-class SumoMatch(models.Model):
+class SumoMatch(VersionedModel):
     is_played = models.BooleanField(
         verbose_name=_('Game played?'), default=False)
     home_score = models.PositiveSmallIntegerField(
@@ -19,7 +22,8 @@ class SumoMatch(models.Model):
         abstract = True
 
     def __str__(self):
-        return " vs. ".join([self.home.name, self.away.name])
+        return u" vs. ".join([
+            self.home.name, self.away.name if self.away_id else u"-"])
 
 
 @python_2_unicode_compatible
@@ -43,13 +47,18 @@ class SumoGroupTeam(models.Model):
     point = models.PositiveSmallIntegerField(verbose_name=_("Point"), default=0)
     order = models.PositiveSmallIntegerField(verbose_name=_("Order"), default=0)
     average = models.IntegerField(verbose_name=_("Average"), default=0)
+    rank = models.PositiveSmallIntegerField(verbose_name=_("Rank"), default=0)
     is_attended = models.BooleanField(
          verbose_name=_("Is attended?"), default=True)
 
+    # order is the manual tiebreak, rank is kept up to date on every match
+    STANDING_ORDERING = ("-point", "-average", "order")
+
     class Meta:
         verbose_name = _("Sumo Group Team")
         verbose_name_plural = _("Sumo Group Teams")
-        ordering = ["-point", "-average", "order"]
+        ordering = ["rank"]
+        index_together = (("group", "rank"),)
 
     def __str__(self):
         return u"Group {}: {}".format(self.group.order, self.robot.name)
@@ -61,11 +70,18 @@ class SumoGroupMatch(SumoMatch):
     group = models.ForeignKey(SumoGroup, verbose_name=_("Sumo Group"))
     order = models.PositiveSmallIntegerField(
         verbose_name=_("Order"), default=0)
+    ring = models.PositiveSmallIntegerField(
+        verbose_name=_("Ring"), null=True, blank=True)
+    slot = models.PositiveSmallIntegerField(
+        verbose_name=_("Time Slot"), null=True, blank=True)
+    is_forfeit = models.BooleanField(
+        verbose_name=_('Forfeit?'), default=False)
 
     class Meta:
         verbose_name = _("Sumo Group Match")
         verbose_name_plural = _("Sumo Group Matches")
         ordering = ["group__order", "order"]
+        index_together = (("slot", "ring"),)
 
 
 @python_2_unicode_compatible
@@ -94,3 +110,50 @@ class SumoStageMatch(SumoMatch):
         verbose_name = _("Sumo Stage Match")
         verbose_name_plural = _("Sumo Stage Matches")
         ordering = ["stage__order"]
+
+
+def refresh_next_matches(robot_ids, create=True):
+    """
+    Writes the rival, slot and ring of the next match of every robot to
+    the project summaries. Group matches come first in timetable order,
+    then the matches of the stages.
+    """
+    robot_ids = set(robot_ids) - set([None])
+    if not robot_ids:
+        return
+    values = dict(
+        (robot_id, dict(next_rival="", next_slot=None, next_ring=None))
+        for robot_id in robot_ids)
+    pending = Q(home__in=robot_ids) | Q(away__in=robot_ids)
+    group_matches = SumoGroupMatch.objects.filter(
+        pending, is_played=False, is_forfeit=False).select_related(
+            "home", "away")
+    stage_matches = SumoStageMatch.objects.filter(
+        pending, is_played=False).select_related(
+            "home", "away").order_by("-stage__order")
+    matches = list(stage_matches) + sorted(
+        group_matches, reverse=True,
+        key=lambda match: (match.slot is None, match.slot, match.order))
+    # the earliest match is written last
+    for match in matches:
+        for robot, rival in ((match.home, match.away),
+                             (match.away, match.home)):
+            if robot is not None and robot.pk in robot_ids:
+                values[robot.pk] = dict(
+                    next_rival=rival.name if rival else "",
+                    next_slot=getattr(match, "slot", None),
+                    next_ring=getattr(match, "ring", None))
+    update_summaries(values, create)
+
+
+@receiver(models.signals.post_save)
+def match_save_summary(sender, instance, raw=False, *args, **kwargs):
+    if sender in (SumoGroupMatch, SumoStageMatch) and not raw:
+        refresh_next_matches([instance.home_id, instance.away_id])
+
+
+@receiver(models.signals.post_delete)
+def match_delete_summary(sender, instance, *args, **kwargs):
+    if sender in (SumoGroupMatch, SumoStageMatch):
+        refresh_next_matches(
+            [instance.home_id, instance.away_id], create=False)
@@ -0,0 +1,16 @@
+from django.db.models import Prefetch
+from sumo.models import SumoGroup, SumoGroupTeam, SumoGroupMatch
+
+
+def group_overview():
+    """
+    Non-final groups with their ranked teams in group.teams and fixtures
+    in group.matches. Robots, their managers and the match sides are
+    fetched along, three queries in total however many groups there are.
+    """
+    teams = SumoGroupTeam.objects.select_related("robot__manager")
+    matches = SumoGroupMatch.objects.select_related(
+        "home", "away").order_by("order")
+    return SumoGroup.objects.filter(is_final=False).prefetch_related(
+        Prefetch("sumogroupteam_set", queryset=teams, to_attr="teams"),
+        Prefetch("sumogroupmatch_set", queryset=matches, to_attr="matches"))
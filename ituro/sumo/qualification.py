@@ -0,0 +1,50 @@
+from django.conf import settings
+from sumo.models import SumoGroupTeam
+
+
+def qualified_teams(per_group=None, best_position=None, best_count=None):
+    """
+    Seed list of the first stage. Attending teams of all groups are read
+    in one query ordered by (position, point, average); the first
+    per_group of every group qualify, then the best best_count teams
+    among the ones placed best_position. Defaults come from settings.
+    """
+    if per_group is None:
+        per_group = getattr(settings, "SUMO_QUALIFY_PER_GROUP", 2)
+    if best_position is None:
+        best_position = getattr(settings, "SUMO_QUALIFY_BEST_POSITION", 3)
+    if best_count is None:
+        best_count = getattr(settings, "SUMO_QUALIFY_BEST_COUNT", 0)
+
+    last_position = max(per_group, best_position if best_count else 0)
+    teams = SumoGroupTeam.objects.filter(
+        group__is_final=False, is_attended=True, rank__gte=1,
+        rank__lte=last_position).order_by("rank", "-point", "-average")
+
+    seeds = []
+    for team in teams:
+        if team.rank <= per_group:
+            seeds.append(team)
+        elif team.rank == best_position and best_count > 0:
+            seeds.append(team)
+            best_count -= 1
+    return seeds
+
+
+def seed_pairs(seeds):
+    """
+    Pairs the best seed with the lowest seed from another group, then
+    the next best, and so on. With an odd count the best seed gets a
+    bye. Returns (home robot id, away robot id) pairs.
+    """
+    seeds = list(seeds)
+    pairs = []
+    if len(seeds) % 2:
+        pairs.append((seeds.pop(0).robot_id, None))
+    while seeds:
+        home = seeds.pop(0)
+        away = next((team for team in reversed(seeds)
+                     if team.group_id != home.group_id), seeds[-1])
+        seeds.remove(away)
+        pairs.append((home.robot_id, away.robot_id))
+    return pairs
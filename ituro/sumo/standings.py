@@ -0,0 +1,238 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from sumo.models import SumoGroupTeam, SumoGroupMatch, SumoStage, \
+    SumoStageMatch, refresh_next_matches
+from sumo.qualification import qualified_teams, seed_pairs
+
+
+def match_points(match):
+    """
+    Point and average earned by the home and away robots in a match, as
+    (home point, home average, away point, away average). A match which
+    both robots forfeited earns nothing.
+    """
+    if not match.is_played:
+        return 0, 0, 0, 0
+    difference = match.home_score - match.away_score
+    if difference == 0 and getattr(match, "is_forfeit", False):
+        return 0, 0, 0, 0
+    elif difference == 0:
+        return 1, 0, 1, 0
+    elif difference > 0:
+        return 3, difference, 0, -difference
+    return 0, difference, 3, -difference
+
+
+def apply_match_delta(old, new):
+    """
+    Moves the points of the old state of a group match to its new state
+    with one relative update per robot.
+    """
+    old_points = match_points(old)
+    new_points = match_points(new)
+    sides = ((new.home_id, 0), (new.away_id, 2))
+    for robot_id, index in sides:
+        point = new_points[index] - old_points[index]
+        average = new_points[index + 1] - old_points[index + 1]
+        if robot_id is None or (point == 0 and average == 0):
+            continue
+        SumoGroupTeam.objects.filter(
+            group_id=new.group_id, robot_id=robot_id).update(
+                point=F("point") + point, average=F("average") + average)
+
+
+def head_to_head(matches, robot, rival):
+    """Scores of robot and rival in the matches between them."""
+    robot_score = rival_score = 0
+    for match in matches:
+        if match.home_id == robot and match.away_id == rival:
+            robot_score += match.home_score
+            rival_score += match.away_score
+        elif match.home_id == rival and match.away_id == robot:
+            robot_score += match.away_score
+            rival_score += match.home_score
+    return robot_score, rival_score
+
+
+def rank_teams(teams, matches):
+    """
+    Sorts teams by point and average. Two teams with the same point and
+    average are ordered by the scores of the match between them, any
+    other tie is decided by the manual order.
+    """
+    teams = sorted(teams, key=lambda team: (
+        -team.point, -team.average, team.order or len(teams)))
+    for index in range(len(teams) - 1):
+        team, rival = teams[index], teams[index + 1]
+        tied = [other for other in teams
+                if (other.point, other.average) == (team.point, team.average)]
+        if len(tied) != 2 or rival not in tied:
+            continue
+        team_score, rival_score = head_to_head(
+            matches, team.robot_id, rival.robot_id)
+        if rival_score > team_score:
+            teams[index], teams[index + 1] = rival, team
+    return teams
+
+
+@transaction.atomic
+def rank_group(group):
+    """
+    Re-ranks a group in memory and saves the rank of the teams whose
+    place changed. Returns the teams in their new order.
+    """
+    teams = list(SumoGroupTeam.objects.select_for_update().filter(
+        group=group))
+    matches = list(SumoGroupMatch.objects.filter(group=group))
+    ranked = rank_teams(teams, matches)
+    for rank, team in enumerate(ranked, start=1):
+        if team.rank != rank:
+            team.rank = rank
+            SumoGroupTeam.objects.filter(pk=team.pk).update(rank=rank)
+    return ranked
+
+
+@transaction.atomic
+def recalculate_group(group):
+    """
+    Recalculates points and averages of a group from its matches in
+    memory, saves the teams which changed and re-ranks the group.
+    """
+    teams = SumoGroupTeam.objects.select_for_update().filter(group=group)
+    totals = dict((team.robot_id, [0, 0]) for team in teams)
+    for match in SumoGroupMatch.objects.filter(group=group, is_played=True):
+        home_point, home_average, away_point, away_average = \
+            match_points(match)
+        for robot_id, point, average in (
+                (match.home_id, home_point, home_average),
+                (match.away_id, away_point, away_average)):
+            if robot_id in totals:
+                totals[robot_id][0] += point
+                totals[robot_id][1] += average
+    for team in teams:
+        point, average = totals[team.robot_id]
+        if (team.point, team.average) != (point, average):
+            SumoGroupTeam.objects.filter(pk=team.pk).update(
+                point=point, average=average)
+    return rank_group(group)
+
+
+@transaction.atomic
+def forfeit_absent(teams):
+    """
+    Marks the teams as absent and gives every unplayed group match of
+    them to the rival, with one update for home and one for away sides.
+    A match between two absent robots is forfeited by both, without a
+    winner. The standings of the groups are recalculated afterwards.
+    Returns the number of forfeited matches.
+    """
+    teams = list(teams)
+    if not teams:
+        return 0
+    score = getattr(settings, "SUMO_FORFEIT_SCORE", 2)
+    SumoGroupTeam.objects.filter(pk__in=[team.pk for team in teams]).update(
+        is_attended=False)
+
+    pending = SumoGroupMatch.objects.filter(is_played=False)
+    forfeit = dict(is_played=True, is_forfeit=True, version=F("version") + 1)
+    home = Q()
+    away = Q()
+    for team in teams:
+        home |= Q(group=team.group_id, home=team.robot_id)
+        away |= Q(group=team.group_id, away=team.robot_id)
+    count = pending.filter(home).filter(away).update(
+        home_score=0, away_score=0, **forfeit)
+    count += pending.filter(home).update(
+        home_score=0, away_score=score, **forfeit)
+    count += pending.filter(away).update(
+        home_score=score, away_score=0, **forfeit)
+
+    groups = set(team.group_id for team in teams)
+    for group in groups:
+        recalculate_group(group)
+    refresh_next_matches(SumoGroupTeam.objects.filter(
+        group__in=groups).values_list("robot", flat=True))
+    if SumoGroupTeam.objects.filter(
+            group__in=groups, group__is_final=False).exists():
+        advance_groups()
+    return count
+
+
+def stage_winner(match):
+    if match.away_id is None:
+        return match.home_id
+    if not match.is_played or match.home_score == match.away_score:
+        return None
+    if match.home_score > match.away_score:
+        return match.home_id
+    return match.away_id
+
+
+def create_stage(order, pairs):
+    """
+    Creates a stage with a match for each (home, away) pair. A robot
+    without a rival passes with a bye, a match with an empty away side.
+    """
+    stage = SumoStage.objects.create(order=order)
+    SumoStageMatch.objects.bulk_create([
+        SumoStageMatch(stage=stage, home_id=home, away_id=away,
+                       is_played=away is None)
+        for home, away in pairs])
+    refresh_next_matches(sum(map(list, pairs), []))
+    return stage
+
+
+def advance_groups():
+    """
+    Creates the first stage from the qualified robots once every group
+    match is played.
+    """
+    if SumoStage.objects.exists() or SumoGroupMatch.objects.filter(
+            group__is_final=False, is_played=False).exists():
+        return None
+
+    seeds = qualified_teams()
+    if len(seeds) < 2:
+        return None
+    return create_stage(1, seed_pairs(seeds))
+
+
+def advance_stage(stage):
+    """
+    Creates the next stage from the winners of the stage once all of its
+    matches have a winner, until a single robot is left.
+    """
+    if SumoStage.objects.filter(order=stage.order + 1).exists():
+        return None
+    winners = [stage_winner(match)
+               for match in SumoStageMatch.objects.filter(stage=stage)]
+    if len(winners) < 2 or None in winners:
+        return None
+    pairs = [(winners[index], winners[index + 1] if index + 1 < len(
+        winners) else None) for index in range(0, len(winners), 2)]
+    return create_stage(stage.order + 1, pairs)
+
+
+@transaction.atomic
+def commit_group_match(match, version):
+    """
+    Saves the score of a group match, moves the points of both robots,
+    re-ranks the group and creates the first stage when the last group
+    match is played, all in one transaction.
+    """
+    old = SumoGroupMatch.objects.select_for_update().get(pk=match.pk)
+    match.save_versioned(version)
+    apply_match_delta(old, match)
+    rank_group(match.group_id)
+    if not match.group.is_final:
+        advance_groups()
+    return match
+
+
+@transaction.atomic
+def commit_stage_match(match, version):
+    """Saves the score of a stage match and advances the bracket."""
+    match.save_versioned(version)
+    advance_stage(match.stage)
+    return match
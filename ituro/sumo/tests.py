@@ -1,3 +1,237 @@
 from django.test import TestCase
+from django.utils import timezone
+from accounts.models import CustomUser
+from projects.models import Project
+from sumo.models import SumoGroup, SumoGroupTeam, SumoGroupMatch, \
+    SumoStage, SumoStageMatch
+from sumo.standings import commit_group_match, commit_stage_match, \
+    forfeit_absent
+from sumo.overview import group_overview
+from sumo.qualification import qualified_teams, seed_pairs
+from sumo.timetable import assign_rings, timetable
 
-# Create your tests here.
+
+class SumoStandingsTestCase(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        self.robots = []
+        self.groups = []
+        for order in (1, 2):
+            group = SumoGroup.objects.create(order=order)
+            self.groups.append(group)
+            for number in (1, 2):
+                robot = Project.objects.create(
+                    manager=user, category="micro_sumo",
+                    name="Sumo {}-{}".format(order, number),
+                    is_confirmed=True)
+                SumoGroupTeam.objects.create(group=group, robot=robot)
+                self.robots.append(robot)
+            SumoGroupMatch.objects.create(
+                group=group, home=self.robots[-2], away=self.robots[-1])
+
+    def play(self, match, home_score, away_score):
+        match = SumoGroupMatch.objects.get(pk=match.pk)
+        match.home_score = home_score
+        match.away_score = away_score
+        match.is_played = True
+        return commit_group_match(match, match.version)
+
+    def test_group_match_commit(self):
+        "Testing standings and bracket after group matches"
+
+        first, second = SumoGroupMatch.objects.all()
+        self.play(first, 1, 2)
+        away = SumoGroupTeam.objects.get(robot=self.robots[1])
+        self.assertEqual((away.point, away.average, away.rank), (3, 1, 1))
+        self.assertFalse(SumoStage.objects.exists())
+
+        self.play(first, 1, 1)
+        home, away = SumoGroupTeam.objects.filter(group=self.groups[0])
+        self.assertEqual((home.point, home.average), (1, 0))
+        self.assertEqual((away.point, away.average), (1, 0))
+
+        self.play(first, 3, 0)
+        self.play(second, 0, 2)
+        self.assertEqual(
+            [team.robot for team in SumoGroupTeam.objects.filter(
+                group=self.groups[0])], self.robots[:2])
+
+        matches = SumoStageMatch.objects.filter(stage__order=1).order_by("pk")
+        self.assertEqual(
+            [(match.home, match.away) for match in matches],
+            [(self.robots[0], self.robots[2]), (self.robots[3], self.robots[1])])
+
+        for match, home_score, away_score in zip(matches, (2, 0), (1, 3)):
+            match.home_score, match.away_score = home_score, away_score
+            match.is_played = True
+            commit_stage_match(match, match.version)
+
+        final = SumoStageMatch.objects.get(stage__order=2)
+        self.assertEqual((final.home, final.away),
+                         (self.robots[0], self.robots[1]))
+
+    def test_manual_tiebreak(self):
+        "Testing re-ranking keeps the manual tiebreak order"
+
+        SumoGroupTeam.objects.filter(robot=self.robots[0]).update(order=1)
+        SumoGroupTeam.objects.filter(robot=self.robots[1]).update(order=2)
+        first = SumoGroupMatch.objects.filter(group=self.groups[0]).get()
+        self.play(first, 0, 2)
+        teams = SumoGroupTeam.objects.filter(group=self.groups[0])
+        self.assertEqual(
+            [(team.robot, team.rank, team.order) for team in teams],
+            [(self.robots[1], 1, 2), (self.robots[0], 2, 1)])
+
+        self.play(first, 1, 1)
+        teams = SumoGroupTeam.objects.filter(group=self.groups[0])
+        self.assertEqual(
+            [(team.robot, team.rank, team.order) for team in teams],
+            [(self.robots[0], 1, 1), (self.robots[1], 2, 2)])
+
+    def test_group_overview(self):
+        "Testing group overview query count"
+
+        with self.assertNumQueries(3):
+            rows = [
+                (group.order,
+                 [(team.robot.name, team.robot.manager.school)
+                  for team in group.teams],
+                 [str(match) for match in group.matches])
+                for group in group_overview()]
+
+        self.assertEqual(rows[0], (
+            1, [("Sumo 1-1", "ITU"), ("Sumo 1-2", "ITU")],
+            ["Sumo 1-1 vs. Sumo 1-2"]))
+        self.assertEqual(len(rows), 2)
+
+    def test_rank_index(self):
+        "Testing that group tables read the materialized rank"
+
+        first = SumoGroupMatch.objects.get(group=self.groups[0])
+        self.play(first, 0, 2)
+        self.assertEqual(
+            [(team.robot, team.rank) for team in SumoGroupTeam.objects.filter(
+                group=self.groups[0])],
+            [(self.robots[1], 1), (self.robots[0], 2)])
+
+    def test_forfeit_absent(self):
+        "Testing forfeit of matches of an absent robot"
+
+        team = SumoGroupTeam.objects.get(robot=self.robots[0])
+        self.assertEqual(forfeit_absent([team]), 1)
+
+        match = SumoGroupMatch.objects.get(group=self.groups[0])
+        self.assertEqual(
+            (match.home_score, match.away_score, match.is_played,
+             match.is_forfeit, match.version), (0, 2, True, True, 1))
+        home, away = SumoGroupTeam.objects.filter(
+            group=self.groups[0]).order_by("pk")
+        self.assertFalse(home.is_attended)
+        self.assertEqual((home.point, home.average, home.rank), (0, -2, 2))
+        self.assertEqual((away.point, away.average, away.rank), (3, 2, 1))
+        self.assertFalse(SumoStage.objects.exists())
+
+    def test_forfeit_both_absent(self):
+        "Testing a match between two absent robots has no winner"
+
+        teams = SumoGroupTeam.objects.filter(group=self.groups[1])
+        self.assertEqual(forfeit_absent(teams), 1)
+
+        match = SumoGroupMatch.objects.get(group=self.groups[1])
+        self.assertEqual(
+            (match.home_score, match.away_score, match.is_forfeit),
+            (0, 0, True))
+        self.assertEqual(list(SumoGroupTeam.objects.filter(
+            group=self.groups[1]).values_list("point", "average")),
+            [(0, 0), (0, 0)])
+
+
+class SumoQualificationTestCase(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        self.teams = {}
+        standings = (
+            (1, ((9, 5), (6, 2), (3, 1))),
+            (2, ((7, 4), (4, 0), (3, 2))),
+        )
+        for order, rows in standings:
+            group = SumoGroup.objects.create(order=order)
+            for position, (point, average) in enumerate(rows, start=1):
+                robot = Project.objects.create(
+                    manager=user, category="micro_sumo",
+                    name="Sumo {}-{}".format(order, position),
+                    is_confirmed=True)
+                self.teams[(order, position)] = SumoGroupTeam.objects.create(
+                    group=group, robot=robot, point=point, average=average,
+                    rank=position)
+
+    def test_best_third(self):
+        "Testing qualification with the best third placed robot"
+
+        with self.assertNumQueries(1):
+            seeds = qualified_teams(per_group=2, best_position=3, best_count=1)
+        self.assertEqual(seeds, [
+            self.teams[(1, 1)], self.teams[(2, 1)], self.teams[(1, 2)],
+            self.teams[(2, 2)], self.teams[(2, 3)]])
+
+        pairs = seed_pairs(seeds)
+        self.assertEqual(pairs[0], (self.teams[(1, 1)].robot_id, None))
+        self.assertEqual(pairs[1], (
+            self.teams[(2, 1)].robot_id, self.teams[(1, 2)].robot_id))
+
+    def test_absent_robot(self):
+        "Testing that absent robots do not qualify"
+
+        SumoGroupTeam.objects.filter(pk=self.teams[(2, 2)].pk).update(
+            is_attended=False)
+        self.assertNotIn(self.teams[(2, 2)], qualified_teams(2, 3, 0))
+
+
+class SumoTimetableTestCase(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create(
+            email="kesen.alper@gmail.com",
+            name="Alper Kesen",
+            phone="05414760273",
+            school="ITU",
+            date_joined=timezone.now()
+            )
+        for order in (1, 2):
+            group = SumoGroup.objects.create(order=order)
+            robots = [Project.objects.create(
+                manager=user, category="micro_sumo",
+                name="Sumo {}-{}".format(order, number), is_confirmed=True)
+                for number in range(4)]
+            pairs = [(home, away) for index, home in enumerate(robots)
+                     for away in robots[index + 1:]]
+            for number, (home, away) in enumerate(pairs, start=1):
+                SumoGroupMatch.objects.create(
+                    group=group, home=home, away=away, order=number)
+
+    def test_assign_rings(self):
+        "Testing parallel ring schedule of group matches"
+
+        self.assertEqual(assign_rings(2, 1), 6)
+        last_slot = {}
+        for match in SumoGroupMatch.objects.order_by("slot", "ring"):
+            self.assertIn(match.ring, (1, 2))
+            for robot in (match.home_id, match.away_id):
+                self.assertGreater(match.slot - last_slot.get(robot, -1), 1)
+                last_slot[robot] = match.slot
+
+        rings, slots = timetable()
+        self.assertEqual(rings, [1, 2])
+        self.assertEqual(len(slots), 6)
+        self.assertEqual(assign_rings(4, 0), 3)
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from sumo.models import SumoGroupMatch, refresh_next_matches
+
+
+def schedule_matches(matches, ring_count, rest):
+    """
+    Places matches on ring_count rings slot by slot. Every slot takes
+    the first waiting matches, in fixture order, whose robots are not
+    on another ring in the same slot and sat out at least `rest` slots
+    since their last match. Returns {match pk: (slot, ring)}.
+    """
+    waiting = list(matches)
+    last_slot = {}
+    schedule = {}
+    slot = 0
+    while waiting:
+        slot += 1
+        ring = 0
+        for match in list(waiting):
+            robots = [robot for robot in (match.home_id, match.away_id)
+                      if robot is not None]
+            if any(slot - last_slot.get(robot, -rest) <= rest
+                   for robot in robots):
+                continue
+            ring += 1
+            schedule[match.pk] = (slot, ring)
+            waiting.remove(match)
+            for robot in robots:
+                last_slot[robot] = slot
+            if ring == ring_count:
+                break
+    return schedule
+
+
+@transaction.atomic
+def assign_rings(ring_count=None, rest=None):
+    """
+    Schedules the unplayed matches of the groups on parallel rings. The
+    played matches are cleared from the timetable. Returns the number
+    of time slots.
+    """
+    if ring_count is None:
+        ring_count = getattr(settings, "SUMO_RING_COUNT", 1)
+    if rest is None:
+        rest = getattr(settings, "SUMO_REST_SLOTS", 0)
+
+    matches = SumoGroupMatch.objects.filter(group__is_final=False)
+    matches.filter(is_played=True).update(
+        slot=None, ring=None, version=F("version") + 1)
+    schedule = schedule_matches(
+        matches.filter(is_played=False).only("home", "away"),
+        ring_count, rest)
+    for pk, (slot, ring) in schedule.items():
+        SumoGroupMatch.objects.filter(pk=pk).update(
+            slot=slot, ring=ring, version=F("version") + 1)
+    refresh_next_matches(set(matches.values_list("home", flat=True)) |
+                         set(matches.values_list("away", flat=True)))
+    return max([slot for slot, ring in schedule.values()] or [0])
+
+
+def timetable():
+    """
+    The scheduled group matches as (ring numbers, rows) where each row
+    is (slot, [match or None for every ring]).
+    """
+    matches = SumoGroupMatch.objects.filter(
+        slot__isnull=False).select_related(
+            "home", "away", "group").order_by("slot", "ring")
+    slots = []
+    rings = set()
+    for match in matches:
+        if not slots or slots[-1][0] != match.slot:
+            slots.append((match.slot, {}))
+        slots[-1][1][match.ring] = match
+        rings.add(match.ring)
+    rings = sorted(rings)
+    return rings, [(slot, [row.get(ring) for ring in rings])
+                   for slot, row in slots]
@@ -2,3 +2,4 @@ command = "/web/envs/ituro/bin/gunicorn"
 pythonpath = "/web/apps/ituro/ituro"
 bind = "127.0.0.1:8000"
 timeout = 60
+raw_env = ["DJANGO_SETTINGS_MODULE=ituro.production_settings"]